@@ -1,13 +1,16 @@
 # app/appointments/models.py
 from datetime import datetime
-from sqlalchemy import DateTime, ForeignKey, String, Text
+from sqlalchemy import ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.core.models import Base, TimestampMixin
+from app.core.models import Base, TimestampMixin, UTCDateTime
 
 
 class Appointment(TimestampMixin, Base):
     __tablename__ = "appointments"
+    __table_args__ = (
+        Index("ix_appointments_senior_starts", "senior_id", "starts_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     senior_id: Mapped[int] = mapped_column(ForeignKey("seniors.id"), index=True, nullable=False)
@@ -17,8 +20,8 @@ class Appointment(TimestampMixin, Base):
     doctor_name: Mapped[str | None] = mapped_column(String(120), nullable=True)
     specialty: Mapped[str | None] = mapped_column(String(100), nullable=True)
 
-    starts_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True, nullable=False)
-    scheduled_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)  # Alias
+    starts_at: Mapped[datetime] = mapped_column(UTCDateTime(), index=True, nullable=False)
+    scheduled_at: Mapped[datetime | None] = mapped_column(UTCDateTime(), nullable=True)  # Alias
     location: Mapped[str | None] = mapped_column(String(200), nullable=True)
     reason: Mapped[str | None] = mapped_column(String(200), nullable=True)
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -4,11 +4,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from datetime import datetime, date
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 # from app.core.deps import get_current_user, require_senior_access, require_senior_edit
 from app.appointments.schemas import (
-    AppointmentCreate, AppointmentPublic, AppointmentNoteCreate, AppointmentNotePublic, AppointmentUpdate
+    AppointmentCreate, AppointmentPublic, AppointmentNoteCreate, AppointmentNotePublic, AppointmentUpdate,
+    serialize_appointment
 )
+from app.core.responses import trusted_json
+from app.core.cache import invalidate_on_commit, senior_tags
 from app.appointments.service import create_appointment, list_appointments, add_note
 
 router = APIRouter()
@@ -44,7 +47,7 @@ async def get_all_appointments_endpoint(
     from_date: Optional[date] = None,
     to_date: Optional[date] = None,
     status: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Listar todas las citas del sistema (para admin) con filtros opcionales"""
     from sqlalchemy import select
@@ -61,7 +64,7 @@ async def get_all_appointments_endpoint(
     
     query = query.order_by(Appointment.starts_at.desc())
     result = await db.execute(query)
-    return result.scalars().all()
+    return trusted_json([serialize_appointment(a) for a in result.scalars().all()])
 
 
 @router.get("/seniors/{senior_id}/appointments", response_model=list[AppointmentPublic])
@@ -71,11 +74,12 @@ async def list_appointments_endpoint(
     # _=Depends(require_senior_access),  # Autenticación deshabilitada temporalmente
 ):
     appointments = await list_appointments(db, senior_id)
+    items = [serialize_appointment(a) for a in appointments]
     # Asegurar que scheduled_at tenga valor (usar starts_at si es None)
-    for appt in appointments:
-        if not appt.scheduled_at:
-            appt.scheduled_at = appt.starts_at
-    return appointments
+    for item in items:
+        if not item["scheduled_at"]:
+            item["scheduled_at"] = item["starts_at"]
+    return trusted_json(items)
 
 
 @router.get("/appointments/{appointment_id}", response_model=AppointmentPublic)
@@ -112,6 +116,7 @@ async def update_appointment_endpoint(
     for key, value in payload.model_dump(exclude_unset=True).items():
         setattr(appointment, key, value)
     
+    invalidate_on_commit(db, *senior_tags(appointment.senior_id, "appointments"))
     await db.commit()
     await db.refresh(appointment)
     return appointment
@@ -132,6 +137,7 @@ async def delete_appointment_endpoint(
         raise HTTPException(status_code=404, detail="Appointment not found")
     
     await db.delete(appointment)
+    invalidate_on_commit(db, *senior_tags(appointment.senior_id, "appointments"))
     await db.commit()
     return {"message": "Appointment deleted successfully"}
 
@@ -84,4 +84,30 @@ class AppointmentUpdate(BaseModel):
     starts_at: Optional[datetime] = None
     location: Optional[str] = Field(default=None, max_length=200)
     reason: Optional[str] = Field(default=None, max_length=500)
-    status: Optional[str] = Field(default=None, max_length=20)
\ No newline at end of file
+    status: Optional[str] = Field(default=None, max_length=20)
+
+
+# Serializadores "confiables" (filas ORM -> dict de *Public sin validar con Pydantic)
+def serialize_appointment(a) -> dict:
+    return {
+        "id": a.id,
+        "senior_id": a.senior_id,
+        "doctor_user_id": a.doctor_user_id,
+        "doctor_name": a.doctor_name,
+        "specialty": a.specialty,
+        "starts_at": a.starts_at,
+        "scheduled_at": a.scheduled_at,
+        "location": a.location,
+        "reason": a.reason,
+        "notes": a.notes,
+        "status": a.status,
+    }
+
+
+def serialize_appointment_note(n) -> dict:
+    return {
+        "id": n.id,
+        "appointment_id": n.appointment_id,
+        "author_user_id": n.author_user_id,
+        "note": n.note,
+    }
@@ -4,12 +4,14 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.appointments.models import Appointment, AppointmentNote
+from app.core.cache import invalidate_on_commit, senior_tags
 
 
 async def create_appointment(db: AsyncSession, senior_id: int, data: dict) -> Appointment:
     appt = Appointment(senior_id=senior_id, **data)  # Aquí pasas correctamente `starts_at` desde el payload
     db.add(appt)
     await db.flush()
+    invalidate_on_commit(db, *senior_tags(senior_id, "appointments"))
     return appt
 
 
@@ -29,4 +31,5 @@ async def add_note(db: AsyncSession, appointment_id: int, author_user_id: int, n
     n = AppointmentNote(appointment_id=appointment_id, author_user_id=author_user_id, note=note)
     db.add(n)
     await db.flush()
+    invalidate_on_commit(db, *senior_tags(appt.senior_id, "appointments"))
     return n
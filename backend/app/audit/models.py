@@ -1,5 +1,5 @@
 # app/audit/models.py
-from sqlalchemy import ForeignKey, String, JSON
+from sqlalchemy import ForeignKey, Index, String, JSON
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.models import Base, TimestampMixin
@@ -7,6 +7,9 @@ from app.core.models import Base, TimestampMixin
 
 class AuditLog(TimestampMixin, Base):
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        Index("ix_audit_logs_actor_created", "actor_user_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     actor_user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"), nullable=True, index=True)
@@ -2,13 +2,19 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.deps import get_current_user
+from app.core.user_cache import user_cache
+from app.core.acl import care_team_acl
+from app.core.cache import invalidate_on_commit
+from app.core.versions import bump_version
 from app.auth.models import User
 from app.auth.schemas import (
     RegisterRequest, RegisterDoctorRequest, LoginRequest,
-    UserPublic, DoctorProfilePublic, TokenPair, RefreshRequest, LogoutRequest
+    UserPublic, DoctorProfilePublic, TokenPair, RefreshRequest, LogoutRequest,
+    serialize_user
 )
+from app.core.responses import trusted_json
 from app.auth.service import register_user, register_doctor, authenticate, refresh_tokens, logout_stateless, store_refresh_token, revoke_refresh_token
 from app.core.models import UserRole
 
@@ -92,19 +98,18 @@ async def get_current_user_endpoint(
 
 
 @router.get("/users", response_model=list[UserPublic])
-async def get_all_users(db: AsyncSession = Depends(get_db)):
+async def get_all_users(db: AsyncSession = Depends(get_read_db)):
     """Obtener todos los usuarios del sistema"""
     from sqlalchemy import select
     result = await db.execute(select(User).order_by(User.created_at.desc()))
-    users = result.scalars().all()
-    return users
+    return trusted_json([serialize_user(u) for u in result.scalars().all()])
 
 
 @router.get("/users/search", response_model=list[UserPublic])
 async def search_users(
     q: str,
     role: str | None = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Buscar usuarios por nombre o email"""
     from sqlalchemy import select, or_
@@ -174,7 +179,11 @@ async def update_user(user_id: int, payload: dict, db: AsyncSession = Depends(ge
     if "is_active" in payload:
         user.is_active = payload["is_active"]
     
+    # Nombre/email/rol aparecen en los listados de equipo de sus seniors
+    await bump_version(db, "team", *await care_team_acl.senior_ids(db, user_id))
+    invalidate_on_commit(db, "users")
     await db.commit()
+    user_cache.invalidate(user_id)
     await db.refresh(user)
     return user
 
@@ -188,6 +197,10 @@ async def delete_user(user_id: int, db: AsyncSession = Depends(get_db)):
     if not user:
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
     
+    await bump_version(db, "team", *await care_team_acl.senior_ids(db, user_id))
+    invalidate_on_commit(db, "users")
     await db.delete(user)
     await db.commit()
+    user_cache.invalidate(user_id)
+    care_team_acl.invalidate(user_id)
     return {"ok": True, "message": "Usuario eliminado correctamente"}
@@ -91,3 +91,15 @@ class RefreshRequest(BaseModel):
 
 class LogoutRequest(BaseModel):
     refresh_token: str | None = None
+
+
+# Serializador "confiable" (fila ORM -> dict de UserPublic sin validar con Pydantic)
+def serialize_user(u, senior_id: Optional[int] = None) -> dict:
+    return {
+        "id": u.id,
+        "full_name": u.full_name,
+        "email": u.email,
+        "role": u.role,
+        "is_active": u.is_active,
+        "senior_id": senior_id,
+    }
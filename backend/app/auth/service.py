@@ -1,12 +1,15 @@
 # app/auth/service.py
 from fastapi import HTTPException
-from sqlalchemy import select
+from sqlalchemy import select, delete, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.models import User
 from app.auth.doctor_models import DoctorProfile
 from app.core.models import UserRole
-from app.core.security import hash_password, verify_password, create_access_token, create_refresh_token, decode_token
+from app.core.security import create_access_token, create_refresh_token, decode_token, token_digest
+from app.core.hashing import password_hasher
+from app.core.versions import bump_version
+from app.core.cache import invalidate_on_commit
 
 
 
@@ -26,12 +29,14 @@ async def register_user(db: AsyncSession, full_name: str, email: str, password:
     user = User(
         full_name=full_name,
         email=email,
-        password_hash=hash_password(password),
+        password_hash=await password_hasher.hash(password),
         role=role,
         is_active=True,
     )
     db.add(user)
     await db.flush()  # obtiene user.id
+    # Totales de usuarios por rol en /stats/global-stats
+    invalidate_on_commit(db, "users")
     
     # Si es un SENIOR, crear automáticamente su perfil de senior
     if role == UserRole.SENIOR:
@@ -57,6 +62,8 @@ async def register_user(db: AsyncSession, full_name: str, email: str, password:
             can_edit=True
         )
         db.add(care_team)
+        await bump_version(db, "team", senior_profile.id)
+        invalidate_on_commit(db, "seniors")
     
     return user
 
@@ -79,7 +86,7 @@ async def authenticate(db: AsyncSession, email: str, password: str):
     user = res.scalar_one_or_none()
     if not user or not user.is_active:
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    if not verify_password(password, user.password_hash):
+    if not await password_hasher.verify(password, user.password_hash):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     access = create_access_token(subject=str(user.id), extra_claims={"role": user.role.value})
@@ -95,13 +102,13 @@ def utcnow():
 async def store_refresh_token(db: AsyncSession, user_id: int, token: str) -> RefreshToken:
     # exp viene del claim exp del JWT (pero lo calculamos igual)
     expires_at = utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    rt = RefreshToken(user_id=user_id, token=token, expires_at=expires_at)
+    rt = RefreshToken(user_id=user_id, token_hash=token_digest(token), expires_at=expires_at)
     db.add(rt)
     await db.flush()
     return rt
 
 async def revoke_refresh_token(db: AsyncSession, token: str):
-    res = await db.execute(select(RefreshToken).where(RefreshToken.token == token))
+    res = await db.execute(select(RefreshToken).where(RefreshToken.token_hash == token_digest(token)))
     rt = res.scalar_one_or_none()
     if not rt:
         return
@@ -124,7 +131,7 @@ async def refresh_tokens(db: AsyncSession, refresh_token: str):
         raise HTTPException(status_code=401, detail="Invalid token payload")
 
     # 2) valida que el refresh exista y no esté revocado
-    res = await db.execute(select(RefreshToken).where(RefreshToken.token == refresh_token))
+    res = await db.execute(select(RefreshToken).where(RefreshToken.token_hash == token_digest(refresh_token)))
     rt = res.scalar_one_or_none()
     if not rt or rt.revoked:
         raise HTTPException(status_code=401, detail="Refresh token revoked or not found")
@@ -133,8 +140,9 @@ async def refresh_tokens(db: AsyncSession, refresh_token: str):
     if rt.expires_at < utcnow():
         raise HTTPException(status_code=401, detail="Refresh token expired")
 
-    # 3) rota: revoca el refresh viejo y crea uno nuevo
-    await revoke_refresh_token(db, refresh_token)
+    # 3) rota: revoca el refresh viejo (ya cargado, sin volver a buscarlo) y crea uno nuevo
+    rt.revoked = True
+    rt.revoked_at = utcnow()
 
     ures = await db.execute(select(User).where(User.id == user_id))
     user = ures.scalar_one_or_none()
@@ -147,6 +155,19 @@ async def refresh_tokens(db: AsyncSession, refresh_token: str):
 
     return access, new_refresh
 
+async def purge_refresh_tokens(db: AsyncSession, batch_size: int) -> int:
+    """Borra un lote de refresh tokens vencidos o revocados. Devuelve cuántos borró."""
+    res = await db.execute(
+        select(RefreshToken.id)
+        .where(or_(RefreshToken.expires_at < utcnow(), RefreshToken.revoked.is_(True)))
+        .limit(batch_size)
+    )
+    ids = list(res.scalars().all())
+    if not ids:
+        return 0
+    await db.execute(delete(RefreshToken).where(RefreshToken.id.in_(ids)))
+    return len(ids)
+
 async def logout_stateless():
     # JWT stateless: el backend no puede invalidar tokens sin tabla/redis.
     # Esta función es un placeholder. El logout real revoca el refresh_token
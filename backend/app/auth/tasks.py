@@ -0,0 +1,34 @@
+# app/auth/tasks.py
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.auth.service import purge_refresh_tokens
+
+logger = logging.getLogger(__name__)
+
+
+async def purge_refresh_tokens_once() -> int:
+    """Borra refresh tokens vencidos/revocados en lotes hasta vaciar el backlog."""
+    total = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            deleted = await purge_refresh_tokens(db, settings.REFRESH_TOKEN_PURGE_BATCH_SIZE)
+            await db.commit()
+        total += deleted
+        if deleted < settings.REFRESH_TOKEN_PURGE_BATCH_SIZE:
+            return total
+        # Cede el loop entre lotes para no acaparar la base ni el event loop
+        await asyncio.sleep(0)
+
+
+async def refresh_token_purge_loop():
+    while True:
+        try:
+            await purge_refresh_tokens_once()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception("❌ Error purgando refresh tokens: %s", type(e).__name__)
+        await asyncio.sleep(settings.REFRESH_TOKEN_PURGE_INTERVAL_SECONDS)
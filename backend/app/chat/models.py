@@ -1,9 +1,9 @@
 # app/chat/models.py
 from datetime import datetime
-from sqlalchemy import DateTime, ForeignKey, String, Text, UniqueConstraint
+from sqlalchemy import ForeignKey, Index, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.core.models import Base, TimestampMixin
+from app.core.models import Base, TimestampMixin, UTCDateTime
 
 
 class Conversation(TimestampMixin, Base):
@@ -20,6 +20,9 @@ class Conversation(TimestampMixin, Base):
 
 class Message(TimestampMixin, Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        Index("ix_messages_conversation_sent", "conversation_id", "sent_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     conversation_id: Mapped[int] = mapped_column(ForeignKey("conversations.id"), index=True, nullable=False)
@@ -27,7 +30,8 @@ class Message(TimestampMixin, Base):
     sender_user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True, nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=False)
 
-    sent_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
-    read_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Con zona en la API (migración 0006): el front las convierte a la hora local con new Date()
+    sent_at: Mapped[datetime] = mapped_column(UTCDateTime(aware=True), nullable=False)
+    read_at: Mapped[datetime | None] = mapped_column(UTCDateTime(aware=True), nullable=True)
 
     conversation = relationship("Conversation", back_populates="messages")
@@ -1,23 +1,29 @@
 # app/chat/router.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.deps import get_current_user
 from app.auth.models import User
-from app.chat.schemas import ConversationCreate, ConversationPublic, MessagePublic, MessageCreate, ConversationWithLastMessage
-from app.chat.service import create_conversation, list_messages, send_message, get_user_conversations
+from app.chat.schemas import ConversationCreate, ConversationPublic, MessagePublic, MessageCreate, ConversationWithLastMessage, serialize_message
+from app.core.responses import trusted_json
+from app.core.versions import etag_headers, etag_matches, not_modified
+from app.chat.service import create_conversation, list_messages, send_message, get_user_conversations, conversations_etag
 
 router = APIRouter()
 
 
 @router.get("/conversations", response_model=list[ConversationWithLastMessage])
 async def list_user_conversations(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
     """Listar todas las conversaciones del usuario actual"""
-    return await get_user_conversations(db, user.id)
+    etag = await conversations_etag(db, user.id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return trusted_json(await get_user_conversations(db, user.id), headers=etag_headers(etag))
 
 
 @router.post("/conversations", response_model=ConversationPublic)
@@ -40,7 +46,8 @@ async def list_messages_endpoint(
     user: User = Depends(get_current_user),
 ):
     """Obtener mensajes de una conversación"""
-    return await list_messages(db, conversation_id)
+    messages = await list_messages(db, conversation_id)
+    return trusted_json([serialize_message(m) for m in messages])
 
 
 @router.post("/conversations/{conversation_id}/messages", response_model=MessagePublic)
@@ -58,3 +58,24 @@ class ConversationWithLastMessage(BaseModel):
     last_message: Optional[LastMessageInfo]
     created_at: str
     updated_at: str
+
+
+# Serializadores "confiables" (filas ORM -> dict de *Public sin validar con Pydantic)
+def serialize_conversation(c) -> dict:
+    return {
+        "id": c.id,
+        "senior_id": c.senior_id,
+        "doctor_user_id": c.doctor_user_id,
+        "status": c.status,
+    }
+
+
+def serialize_message(m) -> dict:
+    return {
+        "id": m.id,
+        "conversation_id": m.conversation_id,
+        "sender_user_id": m.sender_user_id,
+        "content": m.content,
+        "sent_at": m.sent_at,
+        "read_at": m.read_at,
+    }
@@ -5,7 +5,9 @@ from sqlalchemy import select, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.chat.models import Conversation, Message
-from app.seniors.models import CareTeam, SeniorProfile
+from app.seniors.models import SeniorProfile
+from app.core.acl import care_team_acl
+from app.core.versions import bump_version, versions_etag
 from app.auth.models import User
 
 # Zona horaria de Ecuador (ECT - UTC-5)
@@ -25,14 +27,10 @@ async def get_user_conversations(db: AsyncSession, user_id: int) -> list[dict]:
     conversations = list(res.scalars().all())
     
     # Buscar conversaciones donde es miembro del care team
-    care_res = await db.execute(
-        select(CareTeam).where(CareTeam.user_id == user_id)
-    )
-    care_teams = list(care_res.scalars().all())
-    
-    for ct in care_teams:
+    senior_ids = await care_team_acl.senior_ids(db, user_id)
+    if senior_ids:
         conv_res = await db.execute(
-            select(Conversation).where(Conversation.senior_id == ct.senior_id)
+            select(Conversation).where(Conversation.senior_id.in_(senior_ids))
         )
         for conv in conv_res.scalars().all():
             if conv not in conversations:
@@ -73,6 +71,19 @@ async def get_user_conversations(db: AsyncSession, user_id: int) -> list[dict]:
     return result
 
 
+async def conversations_etag(db: AsyncSession, user_id: int) -> str:
+    """ETag del listado de conversaciones: conversaciones como doctor + las de sus seniors."""
+    senior_ids = await care_team_acl.senior_ids(db, user_id)
+    keys = [("chat_user", user_id)] + [("chat_senior", senior_id) for senior_id in senior_ids]
+    return await versions_etag(db, keys)
+
+
+async def _bump_conversation(db: AsyncSession, conv: Conversation):
+    await bump_version(db, "chat_senior", conv.senior_id)
+    if conv.doctor_user_id:
+        await bump_version(db, "chat_user", conv.doctor_user_id)
+
+
 async def create_conversation(db: AsyncSession, senior_id: int, doctor_user_id: int | None = None) -> Conversation:
     # Verificar si ya existe una conversación para este senior
     res = await db.execute(
@@ -88,6 +99,7 @@ async def create_conversation(db: AsyncSession, senior_id: int, doctor_user_id:
     conv = Conversation(senior_id=senior_id, doctor_user_id=doctor_user_id, status="OPEN")
     db.add(conv)
     await db.flush()
+    await _bump_conversation(db, conv)
     return conv
 
 
@@ -111,4 +123,6 @@ async def send_message(db: AsyncSession, conversation_id: int, sender_user_id: i
     )
     db.add(msg)
     await db.flush()
+    # El último mensaje forma parte del listado de conversaciones
+    await _bump_conversation(db, conv)
     return msg
@@ -1,4 +1,5 @@
 # app/chat/websocket.py
+import logging
 from typing import Dict, Set
 from datetime import datetime, timezone, timedelta
 
@@ -10,7 +11,9 @@ from app.core.security import decode_token
 from app.core.database import AsyncSessionLocal
 from app.chat.service import send_message
 from app.chat.models import Conversation
-from app.seniors.models import CareTeam
+from app.core.acl import care_team_acl
+
+logger = logging.getLogger(__name__)
 
 # Zona horaria de Ecuador (ECT - UTC-5)
 ECUADOR_TZ = timezone(timedelta(hours=-5))
@@ -41,29 +44,25 @@ manager = ConnectionManager()
 
 async def conversations_ws(ws: WebSocket, conversation_id: int):
     # Primero validar el token ANTES de aceptar la conexión
-    print(f"🔌 Nueva conexión WebSocket a conversación {conversation_id}")
-    print(f"🔍 Query params: {ws.query_params}")
+    logger.debug("🔌 Nueva conexión WebSocket a conversación %s", conversation_id)
     
     try:
         token = ws.query_params.get("token")
         if not token:
-            print(f"❌ Token faltante en query params")
+            logger.info("❌ WebSocket sin token (conversación %s)", conversation_id)
             await ws.close(code=4001, reason="Missing token")
             return
         
-        print(f"🔑 Token recibido (primeros 20 chars): {token[:20]}...")
         payload = decode_token(token)
-        print(f"✅ Token decodificado: {payload}")
         
         if payload.get("type") != "access":
-            print(f"❌ Tipo de token inválido: {payload.get('type')}")
+            logger.info("❌ Tipo de token inválido en WebSocket: %s", payload.get("type"))
             await ws.close(code=4001, reason="Invalid token type")
             return
         
         user_id = int(payload["sub"])
-        print(f"👤 Usuario autenticado: {user_id}")
     except Exception as e:
-        print(f"❌ Error validando token WebSocket: {e}")
+        logger.info("❌ Error validando token WebSocket: %s", type(e).__name__)
         await ws.close(code=4001, reason="Invalid token")
         return
     
@@ -83,13 +82,7 @@ async def conversations_ws(ws: WebSocket, conversation_id: int):
             is_authorized = True
         else:
             # Verificar si es miembro del care team
-            cres = await db.execute(
-                select(CareTeam).where(
-                    CareTeam.senior_id == conv.senior_id,
-                    CareTeam.user_id == user_id,
-                )
-            )
-            if cres.scalar_one_or_none():
+            if await care_team_acl.is_member(db, user_id, conv.senior_id):
                 is_authorized = True
         
         if not is_authorized:
@@ -98,7 +91,7 @@ async def conversations_ws(ws: WebSocket, conversation_id: int):
     
     # Ahora sí, aceptar la conexión
     await manager.connect(conversation_id, ws)
-    print(f"✅ WebSocket conectado: user_id={user_id}, conversation_id={conversation_id}")
+    logger.info("✅ WebSocket conectado: user_id=%s, conversation_id=%s", user_id, conversation_id)
 
     try:
         while True:
@@ -123,8 +116,8 @@ async def conversations_ws(ws: WebSocket, conversation_id: int):
                 "content": msg.content,
                 "sent_at": msg.sent_at.isoformat(),
             })
-            print(f"📨 Mensaje enviado: user_id={user_id}, content={content[:50]}")
+            logger.debug("📨 Mensaje enviado: user_id=%s, conversation_id=%s", user_id, conversation_id)
 
     except WebSocketDisconnect:
         manager.disconnect(conversation_id, ws)
-        print(f"🔌 WebSocket desconectado: user_id={user_id}, conversation_id={conversation_id}")
+        logger.info("🔌 WebSocket desconectado: user_id=%s, conversation_id=%s", user_id, conversation_id)
@@ -0,0 +1,71 @@
+# app/core/acl.py
+import time
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.seniors.models import CareTeam
+
+# senior_id -> (can_view, can_edit)
+Permissions = Dict[int, Tuple[bool, bool]]
+
+
+class CareTeamACL:
+    """
+    Índice en memoria de permisos del care team: user_id -> {senior_id: (can_view, can_edit)}.
+    La primera consulta de un usuario carga todas sus filas de care_team en una sola query;
+    las siguientes verificaciones son búsquedas en diccionario.
+    Acotado por número de usuarios (LRU). invalidate() es local al proceso: en los demás
+    workers un permiso quitado sigue vigente hasta el TTL, que por eso es de pocos segundos
+    (alcanza para las ráfagas de verificaciones de un mismo cliente).
+    """
+
+    def __init__(self, max_users: int, ttl_seconds: float):
+        self.max_users = max_users
+        self.ttl_seconds = ttl_seconds
+        self._items: "OrderedDict[int, Tuple[float, Permissions]]" = OrderedDict()
+
+    async def permissions(self, db: AsyncSession, user_id: int) -> Permissions:
+        item = self._items.get(user_id)
+        if item is not None and item[0] >= time.monotonic():
+            self._items.move_to_end(user_id)
+            return item[1]
+
+        res = await db.execute(
+            select(CareTeam.senior_id, CareTeam.can_view, CareTeam.can_edit).where(CareTeam.user_id == user_id)
+        )
+        perms: Permissions = {senior_id: (can_view, can_edit) for senior_id, can_view, can_edit in res.all()}
+
+        if self.max_users > 0:
+            self._items[user_id] = (time.monotonic() + self.ttl_seconds, perms)
+            self._items.move_to_end(user_id)
+            while len(self._items) > self.max_users:
+                self._items.popitem(last=False)
+        return perms
+
+    async def is_member(self, db: AsyncSession, user_id: int, senior_id: int) -> bool:
+        return senior_id in await self.permissions(db, user_id)
+
+    async def can_view(self, db: AsyncSession, user_id: int, senior_id: int) -> bool:
+        return (await self.permissions(db, user_id)).get(senior_id, (False, False))[0]
+
+    async def can_edit(self, db: AsyncSession, user_id: int, senior_id: int) -> bool:
+        return (await self.permissions(db, user_id)).get(senior_id, (False, False))[1]
+
+    async def senior_ids(self, db: AsyncSession, user_id: int) -> List[int]:
+        return list(await self.permissions(db, user_id))
+
+    def invalidate(self, user_id: int):
+        self._items.pop(user_id, None)
+
+    def clear(self):
+        self._items.clear()
+
+
+care_team_acl = CareTeamACL(
+    max_users=settings.ACL_CACHE_MAX_USERS,
+    ttl_seconds=settings.ACL_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,390 @@
+# app/core/cache.py
+"""
+Cache read-through de respuestas JSON con invalidación por tags.
+
+- Backends: "memory" (LRU + TTL por proceso) o "redis" (cualquier servidor que hable el
+  protocolo RESP: Redis, KeyDB, un stand-in local...). "none" desactiva el cache.
+- Los valores se guardan ya serializados con orjson: un hit se devuelve sin volver a
+  serializar.
+- Cada entrada lleva tags (p. ej. "senior:12:meds", "meds"). Los services marcan tags en la
+  sesión con invalidate_on_commit(); al hacer commit se borran todas las entradas con esos
+  tags antes de que `await db.commit()` vuelva. Si la transacción hace rollback no se
+  invalida nada.
+- Los endpoints cacheados cargan desde el primario (get_db): una réplica atrasada leída
+  justo después de invalidar volvería a guardar datos viejos por todo el TTL.
+- Si el backend falla, se registra y se calcula la respuesta como si fuera un miss.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+import orjson
+from fastapi import Response
+from sqlalchemy import event
+from sqlalchemy.exc import MissingGreenlet
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.util import await_only
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_SESSION_TAGS_KEY = "cache_tags"
+
+
+def _default(value: Any) -> Any:
+    # AVG/SUM de MySQL llegan como Decimal
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"{type(value).__name__} no es serializable a JSON")
+
+
+def _dumps(value: Any) -> bytes:
+    return orjson.dumps(value, default=_default)
+
+
+def senior_tags(senior_id: int, *kinds: str) -> List[str]:
+    """Tags de un senior por tipo de dato, más el tag global de cada tipo."""
+    return [f"senior:{senior_id}:{kind}" for kind in kinds] + list(kinds)
+
+
+class MemoryBackend:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        # key -> (expira, valor, tags)
+        self._items: "OrderedDict[str, Tuple[float, bytes, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        if item[0] < time.monotonic():
+            self._drop(key)
+            return None
+        self._items.move_to_end(key)
+        return item[1]
+
+    async def set(self, key: str, value: bytes, ttl: int, tags: Iterable[str]):
+        if self.max_entries <= 0:
+            return
+        tags = tuple(tags)
+        self._drop(key)
+        self._items[key] = (time.monotonic() + ttl, value, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._items) > self.max_entries:
+            self._drop(next(iter(self._items)))
+
+    async def invalidate(self, tags: Iterable[str]) -> int:
+        removed = 0
+        for tag in tags:
+            for key in self._tags.pop(tag, ()):
+                removed += self._drop(key)
+        return removed
+
+    async def clear(self):
+        self._items.clear()
+        self._tags.clear()
+
+    async def close(self):
+        pass
+
+    def _drop(self, key: str) -> int:
+        item = self._items.pop(key, None)
+        if item is None:
+            return 0
+        for tag in item[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+        return 1
+
+
+class RespError(Exception):
+    pass
+
+
+class RespClient:
+    """Cliente RESP mínimo: una conexión, comandos en serie y pipelines."""
+
+    def __init__(self, url: str, timeout: float):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    async def _connect(self):
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout
+        )
+        setup = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            await self._roundtrip(setup)
+
+    @staticmethod
+    def _encode(args: Tuple[Any, ...]) -> bytes:
+        out = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            out.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(out)
+
+    async def _read_reply(self) -> Any:
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("Conexión cerrada por el servidor")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            raise RespError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            size = int(payload)
+            if size < 0:
+                return None
+            data = await self._reader.readexactly(size + 2)
+            return data[:-2]
+        if kind == b"*":
+            size = int(payload)
+            if size < 0:
+                return None
+            return [await self._read_reply() for _ in range(size)]
+        raise RespError(f"Respuesta RESP inesperada: {line!r}")
+
+    async def _roundtrip(self, commands: List[Tuple[Any, ...]]) -> List[Any]:
+        self._writer.write(b"".join(self._encode(cmd) for cmd in commands))
+        await self._writer.drain()
+        # Se leen todas las respuestas aunque alguna sea error, para no desincronizar el stream
+        replies, error = [], None
+        for _ in commands:
+            try:
+                replies.append(await self._read_reply())
+            except RespError as e:
+                replies.append(None)
+                error = error or e
+        if error is not None:
+            raise error
+        return replies
+
+    async def pipeline(self, commands: List[Tuple[Any, ...]]) -> List[Any]:
+        async with self._lock:
+            try:
+                if self._writer is None:
+                    await self._connect()
+                return await asyncio.wait_for(self._roundtrip(commands), self.timeout)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+                # Estado del stream desconocido: se reconecta en el próximo uso
+                await self.close()
+                raise
+
+    async def execute(self, *args: Any) -> Any:
+        return (await self.pipeline([args]))[0]
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._reader = self._writer = None
+
+
+class RedisBackend:
+    def __init__(self, url: str, prefix: str, timeout: float, tag_ttl: int):
+        self.client = RespClient(url, timeout)
+        self.prefix = prefix
+        self.tag_ttl = tag_ttl
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.execute("GET", self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: int, tags: Iterable[str]):
+        full_key = self.prefix + key
+        commands: List[Tuple[Any, ...]] = [("SET", full_key, value, "EX", ttl)]
+        for tag in tags:
+            commands.append(("SADD", self._tag_key(tag), full_key))
+            commands.append(("EXPIRE", self._tag_key(tag), self.tag_ttl))
+        await self.client.pipeline(commands)
+
+    async def invalidate(self, tags: Iterable[str]) -> int:
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        if not tag_keys:
+            return 0
+        members = await self.client.pipeline([("SMEMBERS", tag_key) for tag_key in tag_keys])
+        keys = {key for group in members for key in (group or [])}
+        await self.client.execute("DEL", *keys, *tag_keys)
+        return len(keys)
+
+    async def clear(self):
+        # Solo las claves propias (prefijo); SCAN para no bloquear el servidor
+        cursor = b"0"
+        while True:
+            cursor, keys = await self.client.execute("SCAN", cursor, "MATCH", f"{self.prefix}*", "COUNT", 500)
+            if keys:
+                await self.client.execute("DEL", *keys)
+            if cursor in (b"0", "0"):
+                break
+
+    async def close(self):
+        await self.client.close()
+
+
+class ResponseCache:
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.invalidations = 0
+        self._pending: Set[asyncio.Task] = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    async def json(
+        self,
+        key: str,
+        ttl: int,
+        tags: Iterable[str],
+        loader: Callable[[], Awaitable[Any]],
+        **response_kwargs: Any,
+    ) -> Response:
+        """Devuelve la respuesta cacheada o ejecuta loader(), la guarda y la devuelve."""
+        if not self.enabled or ttl <= 0:
+            return self._response(_dumps(await loader()), "BYPASS", response_kwargs)
+
+        try:
+            body = await self.backend.get(key)
+        except Exception:
+            self._backend_failed("get")
+            body = None
+        if body is not None:
+            self.hits += 1
+            return self._response(body, "HIT", response_kwargs)
+
+        self.misses += 1
+        body = _dumps(await loader())
+        try:
+            await self.backend.set(key, body, ttl, tags)
+        except Exception:
+            self._backend_failed("set")
+        return self._response(body, "MISS", response_kwargs)
+
+    async def invalidate(self, *tags: str):
+        if not self.enabled or not tags:
+            return
+        try:
+            self.invalidations += await self.backend.invalidate(tags)
+        except Exception:
+            self._backend_failed("invalidate")
+
+    def invalidate_soon(self, tags: Iterable[str]):
+        """Programa la invalidación sin bloquear (commit de una sesión síncrona)."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Script síncrono sin event loop: se invalida en uno propio
+            asyncio.run(self._invalidate_without_loop(tuple(tags)))
+            return
+        task = loop.create_task(self.invalidate(*tags))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _invalidate_without_loop(self, tags: Tuple[str, ...]):
+        await self.invalidate(*tags)
+        # La conexión RESP queda ligada a este loop, que se cierra al volver
+        await self.backend.close()
+
+    async def clear(self):
+        if self.enabled:
+            await self.backend.clear()
+
+    async def close(self):
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        if self.enabled:
+            await self.backend.close()
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": settings.CACHE_BACKEND,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidated_entries": self.invalidations,
+            "errors": self.errors,
+            "entries": len(self.backend._items) if isinstance(self.backend, MemoryBackend) else None,
+        }
+
+    def _backend_failed(self, operation: str):
+        self.errors += 1
+        logger.warning("Cache %s falló; se continúa sin cache", operation, exc_info=True)
+
+    @staticmethod
+    def _response(body: bytes, status: str, kwargs: Dict[str, Any]) -> Response:
+        headers = {**kwargs.pop("headers", {}), "X-Cache": status}
+        return Response(content=body, media_type="application/json", headers=headers, **kwargs)
+
+
+def invalidate_on_commit(db: AsyncSession, *tags: str):
+    """Marca tags a invalidar cuando la sesión haga commit (se descartan si hace rollback)."""
+    db.info.setdefault(_SESSION_TAGS_KEY, set()).update(tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session):
+    tags = session.info.pop(_SESSION_TAGS_KEY, None)
+    if not tags or not response_cache.enabled:
+        return
+    invalidation = response_cache.invalidate(*tags)
+    try:
+        # AsyncSession.commit() corre el commit en un greenlet: se espera la invalidación ahí
+        # mismo, así ninguna lectura posterior al commit encuentra la entrada vieja
+        await_only(invalidation)
+    except MissingGreenlet:
+        # Sesión síncrona (scripts): sin greenlet no se puede esperar
+        invalidation.close()
+        response_cache.invalidate_soon(tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session):
+    session.info.pop(_SESSION_TAGS_KEY, None)
+
+
+def _build_backend():
+    if settings.CACHE_BACKEND == "memory":
+        return MemoryBackend(settings.CACHE_MAX_ENTRIES)
+    if settings.CACHE_BACKEND == "redis":
+        return RedisBackend(
+            settings.CACHE_REDIS_URL,
+            prefix=settings.CACHE_KEY_PREFIX,
+            timeout=settings.CACHE_REDIS_TIMEOUT_SECONDS,
+            tag_ttl=settings.CACHE_TAG_TTL_SECONDS,
+        )
+    return None
+
+
+response_cache = ResponseCache(_build_backend())
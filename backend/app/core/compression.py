@@ -0,0 +1,150 @@
+# app/core/compression.py
+"""
+Compresión de respuestas negociada por Accept-Encoding (brotli si está instalado, si no gzip).
+
+- Solo se comprimen respuestas completas (un único mensaje de body) de tipos de texto/JSON
+  y de al menos COMPRESSION_MIN_SIZE bytes; las respuestas en streaming y las que ya traen
+  Content-Encoding (p. ej. reportes precomprimidos) pasan sin tocar.
+- Los cuerpos de COMPRESSION_OFFLOAD_MIN_SIZE bytes o más se comprimen en un thread para
+  no bloquear el event loop.
+- precompressed_variant() elige la variante .gz/.br en disco de un archivo, si existe
+  (reportes HTML anteriores al PDF en REPORTS_DIR).
+"""
+import asyncio
+import gzip
+import os
+from typing import List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:  # opcional: pip install brotli
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+_COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+_FILE_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+def supported_encodings() -> List[str]:
+    """Codificaciones disponibles en orden de preferencia del servidor."""
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def negotiate_encoding(accept_encoding: str, available: Optional[List[str]] = None) -> Optional[str]:
+    """Elige la codificación según Accept-Encoding (respeta q=0); None si no hay ninguna aceptable."""
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+
+    best, best_q = None, 0.0
+    for encoding in available or supported_encodings():
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress_bytes(data: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 4) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=brotli_quality)
+    return gzip.compress(data, compresslevel=gzip_level, mtime=0)
+
+
+def precompressed_variant(path: str, accept_encoding: str) -> Optional[tuple[str, str]]:
+    """(ruta, codificación) de la variante precomprimida que acepta el cliente, si existe en disco."""
+    available = [enc for enc in supported_encodings() if os.path.exists(path + _FILE_SUFFIXES[enc])]
+    encoding = negotiate_encoding(accept_encoding, available) if available else None
+    if encoding is None:
+        return None
+    return path + _FILE_SUFFIXES[encoding], encoding
+
+
+def _is_compressible(content_type: str) -> bool:
+    content_type = content_type.lower()
+    if content_type.startswith("text/event-stream"):
+        return False
+    return content_type.startswith(_COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        offload_size: int = 64 * 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                # Se retiene hasta ver el primer body
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            passthrough = True  # solo se decide una vez
+            headers = MutableHeaders(scope=start_message)
+            body = message.get("body", b"")
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+                or not _is_compressible(headers.get("content-type", ""))
+            ):
+                await send(start_message)
+                await send(message)
+                return
+
+            if len(body) >= self.offload_size:
+                compressed = await asyncio.to_thread(
+                    compress_bytes, body, encoding, self.gzip_level, self.brotli_quality
+                )
+            else:
+                compressed = compress_bytes(body, encoding, self.gzip_level, self.brotli_quality)
+
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed, "more_body": False})
+
+        await self.app(scope, receive, send_compressed)
@@ -11,18 +11,95 @@ class Settings(BaseSettings):
     ENVIRONMENT: str = "development"
     DEBUG: bool = True
 
+    # LOGGING
+    LOG_PROFILE: str = "development"  # "development" | "production"
+    LOG_LEVEL: str | None = None  # por defecto según perfil/DEBUG
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_ACCESS: bool = True  # access log de uvicorn (en producción)
+    # Log de cada sentencia SQL (antes echo=DEBUG); muestreado
+    SQL_ECHO: bool = False
+    SQL_LOG_SAMPLE_RATE: float = 1.0
+
     # API
     API_V1_PREFIX: str = "/api/v1"
 
     # DATABASE
     DATABASE_URL: str
+    # Réplicas de solo lectura (lista separada por comas). Vacío = todo va al primario
+    DATABASE_REPLICA_URLS: Union[str, List[str]] = []
+    # Segundos que una réplica caída queda fuera de la rotación
+    DATABASE_REPLICA_RETRY_SECONDS: int = 30
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # menor que wait_timeout de MySQL
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    DB_POOL_PRE_PING: bool = True
+    # Conexiones a abrir al iniciar (0 = no precalentar)
+    DB_POOL_PREWARM: int = 0
+    # Si schema_migrations ya está en la última versión, no verificar tablas ni hacer seed al iniciar
+    DB_FAST_START: bool = True
 
     # SECURITY
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # Purga en segundo plano de refresh tokens vencidos/revocados
+    REFRESH_TOKEN_PURGE_INTERVAL_SECONDS: int = 3600
+    REFRESH_TOKEN_PURGE_BATCH_SIZE: int = 1000
     PASSWORD_HASH_SCHEME: str = "bcrypt"
+    # Pool para bcrypt: "thread" o "process"
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    # Máximo de hash/verify en curso + en cola antes de responder 503
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # Cache de usuarios autenticados (get_current_user). MAX_SIZE=0 lo desactiva.
+    # Como en el ACL, invalidate() es local al proceso: el TTL es la demora máxima con la que
+    # los demás workers dejan de aceptar a un usuario desactivado o borrado
+    USER_CACHE_TTL_SECONDS: int = 5
+    USER_CACHE_MAX_SIZE: int = 10000
+
+    # Índice de permisos del care team (require_senior_access/edit, chat)
+    # invalidate() solo llega al worker que hizo el cambio: el TTL es la demora máxima con la
+    # que los demás workers ven un miembro quitado del equipo
+    ACL_CACHE_TTL_SECONDS: int = 5
+    ACL_CACHE_MAX_USERS: int = 10000
+
+    # Conteo de SQL por request (cabeceras X-DB-*) y aviso de N+1
+    SQL_STATS_ENABLED: bool = True
+    SQL_STATS_HEADERS: bool = True
+    SQL_N_PLUS_ONE_THRESHOLD: int = 10
+    # Registro de consultas lentas e histogramas por plantilla
+    SLOW_QUERY_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    SLOW_QUERY_SAMPLE_RATE: float = 1.0  # fracción de sentencias que entra al histograma
+    SLOW_QUERY_MAX_TEMPLATES: int = 500
+
+    # Métricas Prometheus en /metrics (Authorization: Bearer <token>; el token es obligatorio con DEBUG=false)
+    METRICS_ENABLED: bool = True
+    METRICS_BEARER_TOKEN: str | None = None
+    METRICS_ROOM_SERIES_LIMIT: int = 100  # máx. series ws_room_connections
+
+    # Cache de respuestas: "memory" (por proceso), "redis" (protocolo RESP) o "none"
+    CACHE_BACKEND: str = "memory"
+    CACHE_MAX_ENTRIES: int = 5000  # solo backend memory
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_REDIS_TIMEOUT_SECONDS: float = 0.5
+    CACHE_KEY_PREFIX: str = "cuidado:cache:"
+    CACHE_TAG_TTL_SECONDS: int = 3600  # debe ser >= al mayor TTL de ruta
+    # TTL por ruta (segundos; 0 = sin cache)
+    CACHE_TTL_DASHBOARD: int = 30
+    CACHE_TTL_GLOBAL_STATS: int = 120
+    CACHE_TTL_QUICK_STATS: int = 60
+    CACHE_TTL_SENIOR: int = 300
+    CACHE_TTL_MEDICATIONS: int = 300
+
+    # Rollup diario de adherencia (daily_adherence, ver app/meds/adherence.py)
+    ADHERENCE_ROLLUP_ENABLED: bool = True  # False = las stats leen solo intake_logs
+    # Offset del "día local" respecto de UTC. 0 = días UTC, igual que los rangos de las stats;
+    # si se cambia hay que reconstruir con scripts/backfill_adherence.py
+    ADHERENCE_DAY_UTC_OFFSET_MINUTES: int = 0
 
     # CORS / WS (en env pueden venir como "*" o como lista separada por comas)
     CORS_ALLOW_ORIGINS: Union[str, List[str]] = "*"
@@ -32,8 +109,29 @@ class Settings(BaseSettings):
 
     WS_ALLOW_ORIGINS: Union[str, List[str]] = "*"
 
+    # Compresión de respuestas (gzip, o brotli si el paquete está instalado)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes; por debajo no compensa
+    COMPRESSION_OFFLOAD_SIZE: int = 64 * 1024  # desde este tamaño se comprime en un thread
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
     # REPORTS
     REPORTS_DIR: str = "generated_reports"
+    # Cola de reportes (app/stats_reports/worker.py)
+    REPORT_WORKERS: int = 2  # workers dentro del proceso de la API; 0 = solo workers externos
+    REPORT_MAX_ATTEMPTS: int = 3
+    REPORT_RETRY_BASE_SECONDS: float = 5.0  # backoff: base * 2^(intento-1)
+    REPORT_JOB_TIMEOUT_SECONDS: int = 300  # también es el lease de un job RUNNING
+    REPORT_POLL_SECONDS: float = 2.0  # espera máxima sin jobs (otros procesos pueden encolar)
+    REPORT_RENDER_PROCESSES: int = 2  # procesos para el layout del PDF (reportlab)
+
+    @field_validator("DATABASE_REPLICA_URLS")
+    @classmethod
+    def parse_csv(cls, v):
+        if isinstance(v, str):
+            return [item.strip() for item in v.split(",") if item.strip()]
+        return v
 
     @field_validator("CORS_ALLOW_ORIGINS", "CORS_ALLOW_METHODS", "CORS_ALLOW_HEADERS", "WS_ALLOW_ORIGINS")
     @classmethod
@@ -6,9 +6,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.security import decode_token
+from app.core.user_cache import user_cache
+from app.core.acl import care_team_acl
 from app.auth.models import User
 from app.core.models import UserRole
-from app.seniors.models import CareTeam
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
@@ -29,10 +30,16 @@ async def get_current_user(
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid token payload")
 
+    cached = user_cache.get(int(user_id))
+    if cached:
+        # Persistente en la sesión del request: los cambios se guardan y las relaciones se cargan
+        return await db.merge(cached, load=False)
+
     res = await db.execute(select(User).where(User.id == int(user_id)))
     user = res.scalar_one_or_none()
     if not user or not user.is_active:
         raise HTTPException(status_code=401, detail="User inactive or not found")
+    user_cache.set(user)
     return user
 
 
@@ -52,11 +59,7 @@ async def require_senior_access(
     if user.role == UserRole.ADMIN:
         return
 
-    res = await db.execute(
-        select(CareTeam).where(CareTeam.senior_id == senior_id, CareTeam.user_id == user.id)
-    )
-    member = res.scalar_one_or_none()
-    if not member or not member.can_view:
+    if not await care_team_acl.can_view(db, user.id, senior_id):
         raise HTTPException(status_code=403, detail="No access to this senior")
 
 
@@ -68,9 +71,5 @@ async def require_senior_edit(
     if user.role == UserRole.ADMIN:
         return
 
-    res = await db.execute(
-        select(CareTeam).where(CareTeam.senior_id == senior_id, CareTeam.user_id == user.id)
-    )
-    member = res.scalar_one_or_none()
-    if not member or not member.can_edit:
+    if not await care_team_acl.can_edit(db, user.id, senior_id):
         raise HTTPException(status_code=403, detail="No edit permission for this senior")
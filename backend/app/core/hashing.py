@@ -0,0 +1,111 @@
+# app/core/hashing.py
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.security import hash_password, verify_password
+
+
+def _timed(fn: Callable[..., Any], *args: Any) -> Tuple[Any, float]:
+    # Se ejecuta dentro del worker: devuelve el resultado y el tiempo real de CPU/bcrypt
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+class _LatencyStats:
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.wait_seconds = 0.0
+
+    def record(self, total: float, run: float):
+        self.count += 1
+        self.total_seconds += total
+        self.max_seconds = max(self.max_seconds, total)
+        self.wait_seconds += max(total - run, 0.0)
+
+    def snapshot(self) -> Dict[str, float]:
+        avg = (self.total_seconds / self.count) if self.count else 0.0
+        avg_wait = (self.wait_seconds / self.count) if self.count else 0.0
+        return {
+            "count": self.count,
+            "avg_ms": round(avg * 1000, 2),
+            "max_ms": round(self.max_seconds * 1000, 2),
+            "avg_wait_ms": round(avg_wait * 1000, 2),
+        }
+
+
+class PasswordHasher:
+    """
+    Ejecuta hash/verify de contraseñas (bcrypt) en un pool de threads o procesos
+    para que el event loop siga atendiendo otras peticiones y el chat WebSocket.
+    Si hay demasiadas operaciones pendientes se rechaza con 503 en lugar de encolar sin límite.
+    """
+
+    def __init__(self, executor_kind: str, workers: int, max_pending: int):
+        self.executor_kind = executor_kind
+        self.workers = workers
+        self.max_pending = max_pending
+        self.in_flight = 0
+        self.rejected = 0
+        self._executor: Optional[Executor] = None
+        self._stats = {"hash": _LatencyStats(), "verify": _LatencyStats()}
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pwd-hash")
+        return self._executor
+
+    async def _run(self, op: str, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.in_flight >= self.max_pending:
+            self.rejected += 1
+            raise HTTPException(status_code=503, detail="Servidor ocupado, intenta nuevamente")
+
+        self.in_flight += 1
+        start = time.perf_counter()
+        run = 0.0
+        try:
+            loop = asyncio.get_running_loop()
+            result, run = await loop.run_in_executor(self._get_executor(), _timed, fn, *args)
+            return result
+        finally:
+            self.in_flight -= 1
+            self._stats[op].record(time.perf_counter() - start, run)
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", hash_password, password)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await self._run("verify", verify_password, password, password_hash)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "executor": self.executor_kind,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+            "hash": self._stats["hash"].snapshot(),
+            "verify": self._stats["verify"].snapshot(),
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    executor_kind=settings.PASSWORD_HASH_EXECUTOR,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
@@ -0,0 +1,90 @@
+# app/core/logging_config.py
+"""
+Logging no bloqueante: todos los loggers escriben en una cola en memoria (QueueHandler)
+y un thread de fondo (QueueListener) es el único que escribe a stdout.
+Si la cola se llena se descartan registros en lugar de frenar la request.
+
+Perfiles (LOG_PROFILE):
+- development: formato legible, nivel DEBUG si DEBUG=True.
+- production: una línea key=value por registro, nivel INFO, SQL solo WARNING+.
+"""
+import logging
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from app.core.config import settings
+
+_DEV_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+_PROD_FORMAT = 'ts=%(asctime)s level=%(levelname)s logger=%(name)s msg="%(message)s"'
+
+_listener: Optional[QueueListener] = None
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler que nunca bloquea: si la cola está llena cuenta y descarta."""
+
+    dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            DroppingQueueHandler.dropped += 1
+
+
+class SamplingFilter(logging.Filter):
+    """Deja pasar solo una fracción de los registros por debajo de WARNING."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
+
+
+def setup_logging():
+    global _listener
+    if _listener is not None:
+        return
+
+    production = settings.LOG_PROFILE == "production"
+    level = settings.LOG_LEVEL or ("INFO" if production or not settings.DEBUG else "DEBUG")
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(logging.Formatter(_PROD_FORMAT if production else _DEV_FORMAT))
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    queue_handler = DroppingQueueHandler(log_queue)
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(level)
+
+    # uvicorn configura sus propios handlers síncronos; se redirigen a la cola
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uv_logger = logging.getLogger(name)
+        uv_logger.handlers = []
+        uv_logger.propagate = True
+    if production and not settings.LOG_ACCESS:
+        logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
+
+    # SQL: solo si se pide explícitamente y nunca en producción por debajo de WARNING
+    sql_logger = logging.getLogger("sqlalchemy.engine.Engine")
+    sql_logger.setLevel(logging.INFO if settings.SQL_ECHO and not production else logging.WARNING)
+    sql_logger.addFilter(SamplingFilter(settings.SQL_LOG_SAMPLE_RATE))
+
+    _listener = QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging():
+    global _listener
+    if _listener is not None:
+        _listener.stop()  # vacía la cola antes de terminar
+        _listener = None
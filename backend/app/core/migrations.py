@@ -0,0 +1,174 @@
+# app/core/migrations.py
+"""
+Migraciones versionadas del esquema.
+
+- Base nueva (sin tablas): create_all con los modelos actuales y se marcan todas las
+  migraciones como aplicadas (los modelos ya incluyen esos cambios).
+- Base existente: aplica en orden los archivos migrations/NNNN_nombre.sql pendientes
+  y registra cada versión en schema_migrations. Los .sql están escritos para MySQL; si una
+  migración necesita otra sintaxis en otro motor se agrega NNNN_nombre.<dialecto>.sql
+  (p. ej. 0004_x.sqlite.sql), que reemplaza al genérico en ese motor.
+
+Uso manual (desde backend/):
+    python -m app.core.migrations status
+    python -m app.core.migrations upgrade
+"""
+import asyncio
+import logging
+import re
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import List, Tuple
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, func, inspect, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.database import engine
+from app.core.models import Base, UTCDateTime, utcnow
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "migrations"
+_FILENAME_RE = re.compile(r"^(\d+)_([\w\-]+)\.sql$")
+_LOCK_NAME = "cuidado_schema_migrations"
+_LOCK_TIMEOUT_SECONDS = 60
+
+logger = logging.getLogger(__name__)
+
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(200), nullable=False),
+    Column("applied_at", UTCDateTime(), nullable=False),
+)
+
+
+def list_migrations() -> List[Tuple[int, str, Path]]:
+    items = []
+    for path in MIGRATIONS_DIR.glob("*.sql"):
+        match = _FILENAME_RE.match(path.name)
+        if match:
+            items.append((int(match.group(1)), match.group(2), path))
+    return sorted(items)
+
+
+def _path_for_dialect(path: Path, dialect: str) -> Path:
+    override = path.with_name(f"{path.stem}.{dialect}.sql")
+    return override if override.exists() else path
+
+
+def latest_version() -> int:
+    migrations = list_migrations()
+    return migrations[-1][0] if migrations else 0
+
+
+def _split_statements(sql: str) -> List[str]:
+    lines = [line for line in sql.splitlines() if not line.strip().startswith("--")]
+    return [stmt.strip() for stmt in "\n".join(lines).split(";") if stmt.strip()]
+
+
+async def current_version(conn: AsyncConnection) -> int | None:
+    """Versión aplicada, o None si la tabla de versiones no existe."""
+    has_table = await conn.run_sync(lambda c: inspect(c).has_table("schema_migrations"))
+    if not has_table:
+        return None
+    res = await conn.execute(select(func.max(schema_migrations.c.version)))
+    return res.scalar() or 0
+
+
+async def schema_is_current() -> bool:
+    """Chequeo barato para fast start: una sola consulta a schema_migrations."""
+    try:
+        async with engine.connect() as conn:
+            res = await conn.execute(select(func.max(schema_migrations.c.version)))
+            return (res.scalar() or 0) >= latest_version()
+    except Exception:
+        # La tabla no existe todavía (primer arranque) u otro error: hacer el camino completo
+        return False
+
+
+@asynccontextmanager
+async def migration_lock():
+    """
+    Serializa migraciones y seed entre workers que arrancan a la vez.
+    En MySQL usa GET_LOCK (ligado a la conexión); en otros motores no bloquea.
+    """
+    async with engine.connect() as conn:
+        use_lock = conn.dialect.name == "mysql"
+        if use_lock:
+            res = await conn.execute(
+                text("SELECT GET_LOCK(:name, :timeout)"),
+                {"name": _LOCK_NAME, "timeout": _LOCK_TIMEOUT_SECONDS},
+            )
+            if res.scalar() != 1:
+                raise RuntimeError("No se pudo obtener el lock de migraciones")
+        try:
+            yield
+        finally:
+            if use_lock:
+                await conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": _LOCK_NAME})
+
+
+async def _stamp(conn: AsyncConnection, version: int, name: str):
+    await conn.execute(schema_migrations.insert().values(version=version, name=name, applied_at=utcnow()))
+
+
+async def run_migrations() -> int:
+    """Lleva el esquema a la última versión. Devuelve la versión final."""
+    migrations = list_migrations()
+
+    async with engine.begin() as conn:
+        tables = await conn.run_sync(lambda c: inspect(c).get_table_names())
+        if "users" not in tables:
+            # Base nueva: el esquema de los modelos ya es el más reciente
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(_metadata.create_all)
+            for version, name, _ in migrations:
+                await _stamp(conn, version, name)
+            logger.info("✅ Esquema creado en versión %s", latest_version())
+            return latest_version()
+
+        await conn.run_sync(_metadata.create_all)
+        version = await current_version(conn) or 0
+
+    for mig_version, name, path in migrations:
+        if mig_version <= version:
+            continue
+        # Cada migración en su propia transacción (en MySQL el DDL hace commit implícito)
+        async with engine.begin() as conn:
+            path = _path_for_dialect(path, conn.dialect.name)
+            for statement in _split_statements(path.read_text(encoding="utf-8")):
+                await conn.exec_driver_sql(statement)
+            await _stamp(conn, mig_version, name)
+        logger.info("✅ Migración aplicada: %s", path.name)
+        version = mig_version
+
+    # Tablas nuevas de modelos que aún no tienen migración propia
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return version
+
+
+async def _cli(command: str) -> int:
+    # Registrar todos los modelos antes de create_all
+    import app.main  # noqa: F401
+
+    if command == "status":
+        async with engine.connect() as conn:
+            version = await current_version(conn)
+        print(f"Versión aplicada: {version if version is not None else 'sin tabla'} / última: {latest_version()}")
+    elif command == "upgrade":
+        async with migration_lock():
+            await run_migrations()
+    else:
+        print("Uso: python -m app.core.migrations [status|upgrade]")
+        return 2
+    await engine.dispose()
+    from app.core.logging_config import shutdown_logging
+    shutdown_logging()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_cli(sys.argv[1] if len(sys.argv) > 1 else "status")))
@@ -4,22 +4,55 @@ from datetime import datetime, timezone
 
 from sqlalchemy import DateTime
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.types import TypeDecorator
 
 
 def utcnow():
     return datetime.now(timezone.utc)
 
 
+class UTCDateTime(TypeDecorator):
+    """
+    DATETIME que se guarda siempre en UTC. Ni MySQL DATETIME ni SQLite guardan la zona:
+    sin esto un valor con offset se guardaba con su hora local. Los valores naive se
+    asumen ya en UTC.
+
+    Al leer devuelve naive (en UTC), igual que MySQL siempre lo devolvió: la API sigue
+    emitiendo estas fechas sin zona y el front las muestra como antes.
+    aware=True las devuelve con tzinfo=UTC: para instantes que se comparan con
+    datetime.now(timezone.utc) o que el cliente debe convertir a su hora (chat).
+    """
+
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def __init__(self, aware: bool = False):
+        super().__init__()
+        self.aware = aware
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return value
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.replace(tzinfo=timezone.utc) if self.aware else value
+
+
 class Base(DeclarativeBase):
     pass
 
 
 class TimestampMixin:
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=utcnow, nullable=False
+        UTCDateTime(), default=utcnow, nullable=False
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=utcnow, onupdate=utcnow, nullable=False
+        UTCDateTime(), default=utcnow, onupdate=utcnow, nullable=False
     )
 
 
@@ -0,0 +1,112 @@
+# app/core/query_stats.py
+"""
+Conteo de sentencias SQL y tiempo de base de datos por request.
+
+Los eventos before/after_cursor_execute del engine acumulan en un objeto guardado en un
+ContextVar que crea QueryStatsMiddleware por cada request HTTP (SQLAlchemy async propaga
+el contexto al greenlet que ejecuta el driver). El resultado se devuelve en las cabeceras
+X-DB-Query-Count / X-DB-Time-Ms y se avisa en el log cuando la misma plantilla de SQL se
+repite más de SQL_N_PLUS_ONE_THRESHOLD veces (patrón N+1).
+El mismo hook alimenta el registro de consultas lentas (app.core.slow_queries).
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.slow_queries import slow_query_log
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+# "IN (%s, %s, %s)" / "IN (?, ?)" / "IN (__[POSTCOMPILE_x])" -> "IN (?)"
+_IN_LIST_RE = re.compile(r"\bIN \((?:\s*(?:%s|\?|%\(\w+\)s|:\w+)\s*,?)+\)", re.IGNORECASE)
+
+
+def normalize_statement(statement: str) -> str:
+    """Plantilla estable de una sentencia: espacios colapsados y listas IN de largo variable unificadas."""
+    statement = _WHITESPACE_RE.sub(" ", statement).strip()
+    return _IN_LIST_RE.sub("IN (?)", statement)
+
+
+class RequestQueryStats:
+    __slots__ = ("count", "total_seconds", "templates")
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.templates: Counter = Counter()
+
+    def record(self, template: str, seconds: float):
+        self.count += 1
+        self.total_seconds += seconds
+        self.templates[template] += 1
+
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_stats_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_query_stats_start", None)
+    seconds = time.perf_counter() - start if start else 0.0
+    stats = _current_stats.get()
+    if stats is None and not settings.SLOW_QUERY_ENABLED:
+        return
+
+    template = normalize_statement(statement)
+    if stats is not None:
+        stats.record(template, seconds)
+    if settings.SLOW_QUERY_ENABLED:
+        slow_query_log.record(template, seconds * 1000, parameters, executemany)
+
+
+def instrument_engine(engine: AsyncEngine):
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app: ASGIApp, n_plus_one_threshold: int = 10, add_headers: bool = True):
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.add_headers = add_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start" and self.add_headers:
+                headers = MutableHeaders(scope=message)
+                headers.append("X-DB-Query-Count", str(stats.count))
+                headers.append("X-DB-Time-Ms", f"{stats.total_seconds * 1000:.1f}")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current_stats.reset(token)
+            repeated = [(tpl, n) for tpl, n in stats.templates.items() if n > self.n_plus_one_threshold]
+            for template, n in repeated:
+                logger.warning(
+                    "Posible N+1 en %s %s: %d ejecuciones de %s",
+                    scope.get("method"), scope.get("path"), n, template[:300],
+                )
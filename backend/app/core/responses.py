@@ -0,0 +1,13 @@
+# app/core/responses.py
+from typing import Any
+
+from fastapi.responses import ORJSONResponse
+
+
+def trusted_json(content: Any, **kwargs: Any) -> ORJSONResponse:
+    """
+    Devuelve datos ya serializados desde filas de la BD (serialize_* de cada módulo).
+    Al retornar un Response, FastAPI no vuelve a validar contra response_model:
+    el response_model del endpoint queda solo como documentación OpenAPI.
+    """
+    return ORJSONResponse(content, **kwargs)
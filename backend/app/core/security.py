@@ -1,3 +1,5 @@
+import hashlib
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
 
@@ -31,9 +33,15 @@ def create_access_token(subject: str, extra_claims: Optional[Dict[str, Any]] = N
 
 def create_refresh_token(subject: str) -> str:
     expire = _utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode: Dict[str, Any] = {"sub": subject, "exp": expire, "type": "refresh"}
+    # jti: dos logins del mismo usuario en el mismo segundo darían el mismo token (y el mismo
+    # token_hash, que es único en refresh_tokens)
+    to_encode: Dict[str, Any] = {"sub": subject, "exp": expire, "type": "refresh", "jti": uuid.uuid4().hex}
     return jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
 
 
 def decode_token(token: str) -> Dict[str, Any]:
     return jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
@@ -0,0 +1,137 @@
+# app/core/slow_queries.py
+"""
+Registro de consultas lentas e histogramas de latencia por plantilla de SQL.
+
+Los tiempos los toma el hook de app.core.query_stats; aquí solo se agregan.
+- Toda sentencia que supere SLOW_QUERY_THRESHOLD_MS se escribe en el log con la
+  "forma" de sus parámetros (tipos y tamaños, nunca los valores).
+- Una fracción SLOW_QUERY_SAMPLE_RATE de las sentencias alimenta el histograma de su plantilla.
+"""
+import logging
+import random
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Límites superiores de cada bucket, en milisegundos (el último es +Inf)
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float("inf"))
+_OTHER_TEMPLATE = "<otras plantillas>"
+
+
+def param_shape(parameters: Any, executemany: bool = False) -> str:
+    """Describe los parámetros sin exponer datos: '(int, datetime, str[12])'."""
+    if executemany and isinstance(parameters, (list, tuple)) and parameters:
+        return f"{len(parameters)}x{param_shape(parameters[0])}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {_value_shape(v)}" for k, v in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(_value_shape(v) for v in parameters) + ")"
+    return _value_shape(parameters)
+
+
+def _value_shape(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, (str, bytes)):
+        return f"{type(value).__name__}[{len(value)}]"
+    if isinstance(value, (bool, int, float, Decimal, datetime, date)):
+        return type(value).__name__
+    if isinstance(value, (list, tuple)):
+        return f"list[{len(value)}]"
+    return type(value).__name__
+
+
+class TemplateHistogram:
+    __slots__ = ("count", "total_ms", "max_ms", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * len(BUCKETS_MS)
+
+    def observe(self, ms: float):
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        for i, upper in enumerate(BUCKETS_MS):
+            if ms <= upper:
+                self.buckets[i] += 1
+                break
+
+    def quantile(self, q: float) -> float:
+        """Cota superior del bucket que contiene el cuantil q (el máximo observado si cae en +Inf)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        for upper, n in zip(BUCKETS_MS, self.buckets):
+            cumulative += n
+            if cumulative >= target:
+                return self.max_ms if upper == float("inf") else float(upper)
+        return self.max_ms
+
+
+class SlowQueryLog:
+    def __init__(self, threshold_ms: float, sample_rate: float, max_templates: int):
+        self.threshold_ms = threshold_ms
+        self.sample_rate = sample_rate
+        self.max_templates = max_templates
+        self.slow_count = 0
+        self._histograms: Dict[str, TemplateHistogram] = {}
+
+    def record(self, template: str, ms: float, parameters: Any, executemany: bool):
+        if ms >= self.threshold_ms:
+            self.slow_count += 1
+            logger.warning(
+                "SQL lento (%.1f ms): %s | params=%s",
+                ms, template[:500], param_shape(parameters, executemany),
+            )
+
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        hist = self._histograms.get(template)
+        if hist is None:
+            if len(self._histograms) >= self.max_templates:
+                template = _OTHER_TEMPLATE
+                hist = self._histograms.setdefault(template, TemplateHistogram())
+            else:
+                hist = self._histograms[template] = TemplateHistogram()
+        hist.observe(ms)
+
+    def top(self, limit: int = 20, order_by: str = "total") -> List[Dict[str, Any]]:
+        keys = {
+            "total": lambda item: item[1].total_ms,
+            "max": lambda item: item[1].max_ms,
+            "p95": lambda item: item[1].quantile(0.95),
+            "count": lambda item: item[1].count,
+        }
+        ordered = sorted(self._histograms.items(), key=keys.get(order_by, keys["total"]), reverse=True)
+        return [
+            {
+                "template": template,
+                "count": hist.count,
+                "total_ms": round(hist.total_ms, 2),
+                "avg_ms": round(hist.total_ms / hist.count, 3) if hist.count else 0.0,
+                "p50_ms": hist.quantile(0.50),
+                "p95_ms": hist.quantile(0.95),
+                "p99_ms": hist.quantile(0.99),
+                "max_ms": round(hist.max_ms, 3),
+            }
+            for template, hist in ordered[:limit]
+        ]
+
+    def reset(self):
+        self._histograms.clear()
+        self.slow_count = 0
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    sample_rate=settings.SLOW_QUERY_SAMPLE_RATE,
+    max_templates=settings.SLOW_QUERY_MAX_TEMPLATES,
+)
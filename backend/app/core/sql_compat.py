@@ -0,0 +1,159 @@
+# app/core/sql_compat.py
+"""
+Diferencias entre motores (MySQL en producción, SQLite para benchmarks y pruebas locales).
+
+- engine_options(): pool y ajustes de conexión según la URL.
+- hour_of(col) / weekday_of(col): hora del día y día de la semana de un DATETIME, para
+  agrupar (EXTRACT/WEEKDAY en MySQL, strftime en SQLite).
+- local_date_of(col, offset_minutes): fecha de un DATETIME UTC desplazado a otra zona.
+- upsert_add(): INSERT que, si la clave ya existe, suma los valores nuevos a los guardados
+  (ON DUPLICATE KEY UPDATE en MySQL, ON CONFLICT DO UPDATE en SQLite/PostgreSQL).
+"""
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import Date, Integer, Table, cast, event, extract, func, literal_column
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.sql.expression import FunctionElement
+
+
+def is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    return ":memory:" in url or url.rstrip("/").endswith(":")
+
+
+def engine_options(url: str, poolclass, pool_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """kwargs de create_async_engine para la URL dada."""
+    if not is_sqlite(url):
+        return {"poolclass": poolclass, **pool_kwargs}
+    if _is_sqlite_memory(url):
+        # Una base en memoria existe por conexión: todas las sesiones deben compartir la misma
+        return {"poolclass": StaticPool}
+    # SQLite admite un solo escritor: un pool chico evita esperas por "database is locked"
+    return {"poolclass": poolclass, **{**pool_kwargs, "pool_size": min(pool_kwargs.get("pool_size", 5), 5)}}
+
+
+def configure_engine(engine, url: str):
+    """Ajustes por conexión que SQLite necesita (FKs, WAL, espera ante bloqueos)."""
+    if not is_sqlite(url):
+        return
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        if not _is_sqlite_memory(url):
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+
+class hour_of(FunctionElement):
+    """Hora (0-23) de una columna DATETIME."""
+
+    type = Integer()
+    name = "hour_of"
+    inherit_cache = True
+
+
+@compiles(hour_of)
+def _hour_of_default(element, compiler, **kw):
+    (column,) = element.clauses
+    return compiler.process(extract("hour", column), **kw)
+
+
+@compiles(hour_of, "sqlite")
+def _hour_of_sqlite(element, compiler, **kw):
+    (column,) = element.clauses
+    return compiler.process(cast(func.strftime("%H", column), Integer), **kw)
+
+
+class weekday_of(FunctionElement):
+    """Día de la semana de una columna DATETIME, 0 = lunes (igual que date.weekday())."""
+
+    type = Integer()
+    name = "weekday_of"
+    inherit_cache = True
+
+
+@compiles(weekday_of)
+def _weekday_of_default(element, compiler, **kw):
+    (column,) = element.clauses
+    return compiler.process(extract("isodow", column) - 1, **kw)
+
+
+@compiles(weekday_of, "mysql")
+def _weekday_of_mysql(element, compiler, **kw):
+    (column,) = element.clauses
+    return compiler.process(func.weekday(column), **kw)
+
+
+@compiles(weekday_of, "sqlite")
+def _weekday_of_sqlite(element, compiler, **kw):
+    (column,) = element.clauses
+    # %w: 0 = domingo
+    return compiler.process((cast(func.strftime("%w", column), Integer) + 6) % 7, **kw)
+
+
+class local_date_of(FunctionElement):
+    """Fecha (DATE) de una columna DATETIME en UTC, desplazada offset_minutes."""
+
+    type = Date()
+    name = "local_date_of"
+    inherit_cache = True
+
+    def __init__(self, column, offset_minutes: int = 0):
+        # El offset va como literal (no parámetro): así forma parte de la clave de cache
+        # y la expresión es idéntica en SELECT y GROUP BY
+        super().__init__(column, literal_column(str(int(offset_minutes))))
+
+
+@compiles(local_date_of)
+def _local_date_of_default(element, compiler, **kw):
+    column, offset = element.clauses
+    return "CAST((%s + INTERVAL '%s minutes') AS DATE)" % (
+        compiler.process(column, **kw), compiler.process(offset, **kw)
+    )
+
+
+@compiles(local_date_of, "mysql")
+def _local_date_of_mysql(element, compiler, **kw):
+    column, offset = element.clauses
+    return "DATE(DATE_ADD(%s, INTERVAL %s MINUTE))" % (compiler.process(column, **kw), compiler.process(offset, **kw))
+
+
+@compiles(local_date_of, "sqlite")
+def _local_date_of_sqlite(element, compiler, **kw):
+    column, offset = element.clauses
+    return "date(%s, '%s minutes')" % (compiler.process(column, **kw), compiler.process(offset, **kw))
+
+
+def upsert_add(
+    dialect_name: str,
+    table: Table,
+    rows: List[Dict[str, Any]],
+    key_columns: Sequence[str],
+    add_columns: Sequence[str],
+):
+    """INSERT de `rows`; en conflicto de clave, columna = columna + valor nuevo para add_columns."""
+    if dialect_name == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+
+        stmt = insert(table).values(rows)
+        return stmt.on_duplicate_key_update({col: table.c[col] + stmt.inserted[col] for col in add_columns})
+
+    if dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        raise NotImplementedError(f"upsert no soportado para {dialect_name}")
+    stmt = insert(table).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=list(key_columns),
+        set_={col: table.c[col] + stmt.excluded[col] for col in add_columns},
+    )
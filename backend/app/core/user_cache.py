@@ -0,0 +1,64 @@
+# app/core/user_cache.py
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.auth.models import User
+from app.core.config import settings
+
+# Columnas que se guardan del usuario (suficiente para auth y respuestas /me).
+# password_hash no se cachea: solo lo usa el login, que consulta la base
+_USER_FIELDS = ("id", "full_name", "email", "role", "is_active", "created_at", "updated_at")
+
+
+class UserCache:
+    """
+    Cache en memoria (TTL + LRU) de usuarios activos por id para get_current_user.
+    Guarda una copia de las columnas y devuelve un User detached nuevo en cada hit (nunca se
+    comparte una instancia ORM entre sesiones); get_current_user lo adjunta a la sesión del
+    request con merge(load=False), sin consultar la base.
+    La invalidación es por proceso: con varios workers el TTL (pocos segundos, igual que el
+    ACL) acota cuánto puede seguir autenticando un usuario desactivado o borrado.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._items: "OrderedDict[int, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def get(self, user_id: int) -> Optional[User]:
+        item = self._items.get(user_id)
+        if item is None:
+            return None
+        expires_at, values = item
+        if expires_at < time.monotonic():
+            del self._items[user_id]
+            return None
+        self._items.move_to_end(user_id)
+        user = User(**values)
+        # Detached con estas columnas como estado cargado (las demás quedan sin cargar)
+        make_transient_to_detached(user)
+        return user
+
+    def set(self, user: User):
+        if self.max_size <= 0 or not user.is_active:
+            return
+        values = {field: getattr(user, field) for field in _USER_FIELDS}
+        self._items[user.id] = (time.monotonic() + self.ttl_seconds, values)
+        self._items.move_to_end(user.id)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def invalidate(self, user_id: int):
+        self._items.pop(user_id, None)
+
+    def clear(self):
+        self._items.clear()
+
+
+user_cache = UserCache(
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+    max_size=settings.USER_CACHE_MAX_SIZE,
+)
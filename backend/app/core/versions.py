@@ -0,0 +1,100 @@
+# app/core/versions.py
+"""
+Contadores de versión por entidad para ETags y GET condicionales.
+
+Cada escritura que cambia un listado incrementa (scope, entity_id) en la misma transacción
+que el cambio, p. ej. ("medications", senior_id). Los endpoints de lectura arman un ETag
+débil con las versiones y, si coincide con If-None-Match, responden 304 sin ejecutar la
+consulta del listado (una sola lectura por clave primaria).
+
+Scopes usados:
+- medications / reminders / team: por senior_id
+- chat_senior: conversaciones y mensajes de un senior
+- chat_user: conversaciones donde el usuario es el doctor
+"""
+import hashlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy import BigInteger, Integer, String, and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.models import Base
+from app.core.sql_compat import upsert_add
+
+VersionKey = Tuple[str, int]
+
+
+class EntityVersion(Base):
+    __tablename__ = "entity_versions"
+
+    scope: Mapped[str] = mapped_column(String(32), primary_key=True)
+    entity_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+async def bump_version(db: AsyncSession, scope: str, *entity_ids: int):
+    """Incrementa la versión (la crea en 1 si no existe). No hace commit."""
+    ids = sorted({entity_id for entity_id in entity_ids if entity_id is not None})
+    if not ids:
+        return
+    await db.execute(upsert_add(
+        db.get_bind().dialect.name,
+        EntityVersion.__table__,
+        [{"scope": scope, "entity_id": i, "version": 1} for i in ids],
+        key_columns=("scope", "entity_id"),
+        add_columns=("version",),
+    ))
+
+
+async def get_versions(db: AsyncSession, keys: Iterable[VersionKey]) -> Dict[VersionKey, int]:
+    """Versiones de varias claves en una consulta; las que no existen valen 0."""
+    by_scope: Dict[str, set] = defaultdict(set)
+    for scope, entity_id in keys:
+        by_scope[scope].add(entity_id)
+    if not by_scope:
+        return {}
+
+    versions = {(scope, entity_id): 0 for scope, ids in by_scope.items() for entity_id in ids}
+    res = await db.execute(
+        select(EntityVersion.scope, EntityVersion.entity_id, EntityVersion.version).where(
+            or_(*(and_(EntityVersion.scope == scope, EntityVersion.entity_id.in_(ids)) for scope, ids in by_scope.items()))
+        )
+    )
+    for scope, entity_id, version in res.all():
+        versions[(scope, entity_id)] = version
+    return versions
+
+
+def make_etag(versions: Dict[VersionKey, int], variant: str = "") -> str:
+    """ETag débil estable: depende de las claves, sus versiones y la variante (query params)."""
+    items: List[str] = [f"{scope}:{entity_id}:{version}" for (scope, entity_id), version in sorted(versions.items())]
+    digest = hashlib.blake2b("|".join(items + [variant]).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+async def versions_etag(db: AsyncSession, keys: Iterable[VersionKey], request: Request | None = None) -> str:
+    variant = str(request.url.query) if request is not None else ""
+    return make_etag(await get_versions(db, keys), variant)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Comparación débil de If-None-Match (acepta listas y '*')."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in header.split(","))
+
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    # no-cache: el cliente puede guardar la respuesta pero debe revalidar siempre
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=etag_headers(etag))
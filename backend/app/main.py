@@ -1,12 +1,24 @@
 # app/main.py
+import asyncio
+import logging
+
 from fastapi import FastAPI, WebSocket
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import select
+from sqlalchemy.pool import StaticPool
 
 from app.core.config import settings
-from app.core.database import engine, AsyncSessionLocal
-from app.core.models import Base, UserRole
-from app.core.security import hash_password
+from app.core.logging_config import setup_logging, shutdown_logging
+from app.core.database import AsyncSessionLocal, engine, replica_engines, prewarm_pool
+from app.core.models import UserRole
+from app.core.migrations import latest_version, migration_lock, run_migrations, schema_is_current
+from app.core.hashing import password_hasher
+from app.stats_reports.pdf import report_renderer
+from app.core.cache import response_cache
+from app.core.metrics import MetricsMiddleware
+from app.core.query_stats import QueryStatsMiddleware, instrument_engine
+from app.core.compression import CompressionMiddleware
 
 from app.auth.router import router as auth_router
 from app.seniors.router import router as seniors_router
@@ -15,7 +27,11 @@ from app.reminders.router import router as reminders_router
 from app.appointments.router import router as appointments_router
 from app.chat.router import router as chat_router
 from app.stats_reports.router import router as stats_router
+from app.monitoring.router import router as monitoring_router
+from app.monitoring.metrics import router as metrics_router, register_collectors
 from app.chat.websocket import conversations_ws
+from app.auth.tasks import refresh_token_purge_loop
+from app.stats_reports.worker import report_worker_loop
 
 # Importar todos los modelos para que SQLAlchemy los registre
 from app.auth.models import User
@@ -28,8 +44,15 @@ from app.appointments.models import Appointment, AppointmentNote
 from app.chat.models import Conversation, Message
 from app.stats_reports.models import ReportJob
 from app.audit.models import AuditLog
+from app.core.versions import EntityVersion
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+app = FastAPI(title=settings.APP_NAME, debug=settings.DEBUG, default_response_class=ORJSONResponse)
 
-app = FastAPI(title=settings.APP_NAME, debug=settings.DEBUG)
+# Tareas en segundo plano lanzadas en startup (se cancelan en shutdown)
+background_tasks: list[asyncio.Task] = []
 
 
 async def create_default_users():
@@ -40,7 +63,7 @@ async def create_default_users():
         existing_user = result.scalar_one_or_none()
         
         if existing_user:
-            print("⏭️  Usuarios ya existen, omitiendo creación de usuarios por defecto")
+            logger.info("⏭️  Usuarios ya existen, omitiendo creación de usuarios por defecto")
             return
         
         # Usuarios por defecto
@@ -84,7 +107,7 @@ async def create_default_users():
             user = User(
                 full_name=user_data["full_name"],
                 email=user_data["email"],
-                password_hash=hash_password(user_data["password"]),
+                password_hash=await password_hasher.hash(user_data["password"]),
                 role=user_data["role"],
                 is_active=user_data["is_active"],
             )
@@ -115,9 +138,9 @@ async def create_default_users():
                 db.add(care_team)
         
         await db.commit()
-        print(f"✅ Se crearon {len(default_users)} usuarios por defecto:")
+        logger.info("✅ Se crearon %d usuarios por defecto:", len(default_users))
         for user_data in default_users:
-            print(f"   - {user_data['email']} ({user_data['role'].value})")
+            logger.info("   - %s (%s)", user_data["email"], user_data["role"].value)
         
         # Crear seniors adicionales de ejemplo (no vinculados a usuarios)
         default_seniors = [
@@ -135,19 +158,68 @@ async def create_default_users():
             db.add(senior)
         
         await db.commit()
-        print(f"✅ Se crearon {len(default_seniors)} seniors adicionales de ejemplo")
+        logger.info("✅ Se crearon %d seniors adicionales de ejemplo", len(default_seniors))
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Crear tablas automáticamente al iniciar el servidor"""
-    async with engine.begin() as conn:
-        # Crear tablas si no existen (no borra datos existentes)
-        await conn.run_sync(Base.metadata.create_all)
-    print("✅ Tablas de base de datos verificadas/creadas")
-    
-    # Crear usuarios por defecto
-    await create_default_users()
+    """Migrar el esquema (si hace falta) y crear usuarios por defecto al iniciar el servidor"""
+    if settings.DB_FAST_START and await schema_is_current():
+        # Esquema ya en la última versión: se omiten verificación de tablas y seed
+        logger.info("⚡ Esquema en versión %s, arranque rápido", latest_version())
+    else:
+        # El lock evita que varios workers migren o creen los usuarios a la vez
+        async with migration_lock():
+            await run_migrations()
+            logger.info("✅ Tablas de base de datos verificadas/creadas")
+
+            # Crear usuarios por defecto
+            await create_default_users()
+
+    if settings.DB_POOL_PREWARM > 0:
+        opened = await prewarm_pool(settings.DB_POOL_PREWARM)
+        logger.info("✅ Pool de conexiones precalentado (%d conexiones)", opened)
+
+    background_tasks.append(asyncio.create_task(refresh_token_purge_loop()))
+    if settings.REPORT_WORKERS and isinstance(engine.pool, StaticPool):
+        # SQLite en memoria: una única conexión compartida; el rollback del polling de los
+        # workers desharía las transacciones de los requests en curso
+        logger.warning("⚠️  Workers de reportes desactivados: el pool tiene una sola conexión (StaticPool)")
+    else:
+        for worker_id in range(settings.REPORT_WORKERS):
+            background_tasks.append(asyncio.create_task(report_worker_loop(worker_id)))
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    background_tasks.clear()
+    password_hasher.shutdown()
+    report_renderer.shutdown()
+    await response_cache.close()
+    shutdown_logging()
+
+if settings.SQL_STATS_ENABLED or settings.SLOW_QUERY_ENABLED:
+    for db_engine in [engine, *replica_engines]:
+        instrument_engine(db_engine)
+
+if settings.SQL_STATS_ENABLED:
+    app.add_middleware(
+        QueryStatsMiddleware,
+        n_plus_one_threshold=settings.SQL_N_PLUS_ONE_THRESHOLD,
+        add_headers=settings.SQL_STATS_HEADERS,
+    )
+
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        offload_size=settings.COMPRESSION_OFFLOAD_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
 
 app.add_middleware(
     CORSMiddleware,
@@ -157,6 +229,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.METRICS_ENABLED:
+    # Último en agregarse = más externo: mide la request completa
+    register_collectors()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_router)
+
 # REST routers
 app.include_router(auth_router, prefix=f"{settings.API_V1_PREFIX}", tags=["auth"])
 app.include_router(seniors_router, prefix=f"{settings.API_V1_PREFIX}/seniors", tags=["seniors"])
@@ -165,6 +243,7 @@ app.include_router(reminders_router, prefix=f"{settings.API_V1_PREFIX}/reminders
 app.include_router(appointments_router, prefix=f"{settings.API_V1_PREFIX}/appointments", tags=["appointments"])
 app.include_router(chat_router, prefix=f"{settings.API_V1_PREFIX}/chat", tags=["chat"])
 app.include_router(stats_router, prefix=f"{settings.API_V1_PREFIX}/stats", tags=["stats-reports"])
+app.include_router(monitoring_router, prefix=f"{settings.API_V1_PREFIX}/monitoring", tags=["monitoring"])
 
 # WS (ruta exacta pedida)
 @app.websocket("/ws/conversations/{conversation_id}")
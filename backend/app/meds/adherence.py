@@ -0,0 +1,188 @@
+# app/meds/adherence.py
+"""
+Rollup diario de adherencia: daily_adherence guarda, por (senior, medicamento, día local),
+cuántas tomas hay en cada estado.
+
+- Escritura: cada alta o cambio de estado de un IntakeLog llama a record_intake_change()
+  dentro de la misma transacción (upsert que suma +1/-1 al contador del estado).
+- Lectura: intake_counts_subquery() arma los contadores de un rango combinando los días
+  completos del rollup con los tramos sueltos de los bordes leídos de intake_logs, en una
+  sola consulta. Un rango de meses lee unos cientos de filas en lugar de todas las tomas.
+- Reconstrucción: rebuild_daily_adherence() recalcula el rollup desde intake_logs por lotes
+  de seniors (scripts/backfill_adherence.py).
+"""
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Tuple
+
+from sqlalchemy import and_, case, delete, func, insert, or_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.sql_compat import local_date_of, upsert_add
+from app.meds.models import DailyAdherence, IntakeLog, IntakeStatus
+
+# Columna del rollup para cada estado
+STATUS_COLUMNS = {
+    IntakeStatus.TAKEN: "taken",
+    IntakeStatus.LATE: "late",
+    IntakeStatus.MISSED: "missed",
+    IntakeStatus.SKIPPED: "skipped",
+}
+_KEY_COLUMNS = ("senior_id", "medication_id", "local_day")
+# Un rango que termina en 23:59:59 cubre el día completo (como los rangos de las stats)
+_END_OF_DAY_TOLERANCE = timedelta(seconds=1)
+
+
+def _local_tz() -> timezone:
+    return timezone(timedelta(minutes=settings.ADHERENCE_DAY_UTC_OFFSET_MINUTES))
+
+
+def _as_utc(dt: datetime) -> datetime:
+    # Los datetime naive se guardan y comparan como UTC (ver UTCDateTime)
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
+
+
+def local_day(dt: datetime) -> date:
+    return _as_utc(dt).astimezone(_local_tz()).date()
+
+
+def day_start(day: date) -> datetime:
+    """Inicio del día local, en UTC."""
+    return datetime.combine(day, time.min, tzinfo=_local_tz()).astimezone(timezone.utc)
+
+
+async def record_intake_change(
+    db: AsyncSession,
+    intake: IntakeLog,
+    old_status: IntakeStatus | None = None,
+):
+    """
+    Refleja en el rollup el alta de `intake` (old_status=None) o su cambio de old_status
+    al estado actual. No hace commit.
+    """
+    if old_status == intake.status:
+        return
+    row = {
+        "senior_id": intake.senior_id,
+        "medication_id": intake.medication_id,
+        "local_day": local_day(intake.scheduled_at),
+        **{column: 0 for column in STATUS_COLUMNS.values()},
+    }
+    if old_status is not None:
+        row[STATUS_COLUMNS[old_status]] -= 1
+    row[STATUS_COLUMNS[intake.status]] += 1
+    await db.execute(upsert_add(
+        db.get_bind().dialect.name,
+        DailyAdherence.__table__,
+        [row],
+        key_columns=_KEY_COLUMNS,
+        add_columns=tuple(STATUS_COLUMNS.values()),
+    ))
+
+
+def split_range(from_dt: datetime, to_dt: datetime) -> Tuple[date | None, date | None, List[Tuple[datetime, datetime, bool]]]:
+    """
+    Divide [from_dt, to_dt] en días locales completos (first_day..last_day, o None si no hay)
+    y los tramos de los bordes [(desde, hasta, hasta_inclusivo)] que hay que leer de intake_logs.
+    """
+    from_dt, to_dt = _as_utc(from_dt), _as_utc(to_dt)
+    from_local = from_dt.astimezone(_local_tz())
+    first_day = from_local.date()
+    if from_local.time() != time.min:
+        first_day += timedelta(days=1)
+    last_day = (to_dt + _END_OF_DAY_TOLERANCE).astimezone(_local_tz()).date() - timedelta(days=1)
+
+    if not settings.ADHERENCE_ROLLUP_ENABLED or first_day > last_day:
+        return None, None, [(from_dt, to_dt, True)]
+
+    edges = []
+    if from_dt < day_start(first_day):
+        edges.append((from_dt, day_start(first_day), False))
+    tail_start = day_start(last_day + timedelta(days=1))
+    if tail_start <= to_dt:
+        edges.append((tail_start, to_dt, True))
+    return first_day, last_day, edges
+
+
+def intake_counts_subquery(key: str, from_dt: datetime, to_dt: datetime, senior_id: int | None = None):
+    """
+    Subconsulta (group_key, taken, late, missed, skipped) con las tomas de [from_dt, to_dt] agrupadas
+    por `key` ("senior_id" o "medication_id"). Puede traer más de una fila por key (una del
+    rollup y otra de los bordes): quien la usa suma con GROUP BY.
+    """
+    first_day, last_day, edges = split_range(from_dt, to_dt)
+    selects = []
+
+    if first_day is not None:
+        criteria = [DailyAdherence.local_day >= first_day, DailyAdherence.local_day <= last_day]
+        if senior_id is not None:
+            criteria.append(DailyAdherence.senior_id == senior_id)
+        key_column = getattr(DailyAdherence, key)
+        selects.append(
+            select(
+                key_column.label("group_key"),
+                *(func.sum(getattr(DailyAdherence, column)).label(column) for column in STATUS_COLUMNS.values()),
+            )
+            .where(*criteria)
+            .group_by(key_column)
+        )
+
+    if edges:
+        ranges = [
+            and_(
+                IntakeLog.scheduled_at >= start,
+                (IntakeLog.scheduled_at <= end) if inclusive else (IntakeLog.scheduled_at < end),
+            )
+            for start, end, inclusive in edges
+        ]
+        criteria = [or_(*ranges)]
+        if senior_id is not None:
+            criteria.append(IntakeLog.senior_id == senior_id)
+        key_column = getattr(IntakeLog, key)
+        selects.append(
+            select(
+                key_column.label("group_key"),
+                *(
+                    func.sum(case((IntakeLog.status == status, 1), else_=0)).label(column)
+                    for status, column in STATUS_COLUMNS.items()
+                ),
+            )
+            .where(*criteria)
+            .group_by(key_column)
+        )
+
+    stmt = selects[0] if len(selects) == 1 else union_all(*selects)
+    return stmt.subquery("intake_counts")
+
+
+def status_sums(subquery) -> list:
+    """Columnas SUM(taken), SUM(late)... de intake_counts_subquery (0 si no hay filas)."""
+    return [func.coalesce(func.sum(subquery.c[column]), 0).label(column) for column in STATUS_COLUMNS.values()]
+
+
+async def rebuild_daily_adherence(engine, first_senior_id: int, last_senior_id: int, batch_size: int = 500) -> int:
+    """
+    Recalcula el rollup de los seniors first..last desde intake_logs, un lote de seniors por
+    transacción (DELETE + INSERT ... SELECT agrupado). Devuelve las filas escritas.
+    """
+    day = local_date_of(IntakeLog.scheduled_at, settings.ADHERENCE_DAY_UTC_OFFSET_MINUTES)
+    written = 0
+    for lo in range(first_senior_id, last_senior_id + 1, batch_size):
+        hi = min(lo + batch_size - 1, last_senior_id)
+        grouped = (
+            select(
+                IntakeLog.senior_id,
+                IntakeLog.medication_id,
+                day,
+                *(func.sum(case((IntakeLog.status == status, 1), else_=0)) for status in STATUS_COLUMNS),
+            )
+            .where(IntakeLog.senior_id.between(lo, hi))
+            .group_by(IntakeLog.senior_id, IntakeLog.medication_id, day)
+        )
+        async with engine.begin() as conn:
+            await conn.execute(delete(DailyAdherence).where(DailyAdherence.senior_id.between(lo, hi)))
+            result = await conn.execute(
+                insert(DailyAdherence).from_select([*_KEY_COLUMNS, *STATUS_COLUMNS.values()], grouped)
+            )
+            written += max(result.rowcount or 0, 0)
+    return written
@@ -1,10 +1,10 @@
 # app/meds/models.py
 import enum
 from datetime import datetime, date
-from sqlalchemy import Date, DateTime, Enum, ForeignKey, Integer, String, Text, JSON
+from sqlalchemy import Date, Enum, ForeignKey, Index, Integer, String, Text, JSON
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.core.models import Base, TimestampMixin
+from app.core.models import Base, TimestampMixin, UTCDateTime
 
 
 class IntakeStatus(str, enum.Enum):
@@ -49,15 +49,43 @@ class MedicationSchedule(TimestampMixin, Base):
 
 class IntakeLog(TimestampMixin, Base):
     __tablename__ = "intake_logs"
+    __table_args__ = (
+        # stats/listado por senior en rango de fechas
+        Index("ix_intake_logs_senior_scheduled", "senior_id", "scheduled_at"),
+        # adherencia por medicamento (rango + estado)
+        Index("ix_intake_logs_med_scheduled_status", "medication_id", "scheduled_at", "status"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     senior_id: Mapped[int] = mapped_column(ForeignKey("seniors.id"), index=True, nullable=False)
     medication_id: Mapped[int] = mapped_column(ForeignKey("medications.id"), index=True, nullable=False)
 
-    scheduled_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
-    taken_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    scheduled_at: Mapped[datetime] = mapped_column(UTCDateTime(), nullable=False, index=True)
+    taken_at: Mapped[datetime | None] = mapped_column(UTCDateTime(), nullable=True)
 
     status: Mapped[IntakeStatus] = mapped_column(Enum(IntakeStatus), nullable=False, index=True)
 
     # quién marcó la toma (cuidador/familiar/senior)
     actor_user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"), nullable=True, index=True)
+
+
+class DailyAdherence(Base):
+    """
+    Rollup de IntakeLog por (senior, medicamento, día local) con un contador por estado.
+    Se actualiza en la misma transacción que cada toma (app/meds/adherence.py) y se
+    reconstruye con scripts/backfill_adherence.py.
+    """
+    __tablename__ = "daily_adherence"
+    __table_args__ = (
+        # stats globales: todos los seniors en un rango de días
+        Index("ix_daily_adherence_day", "local_day"),
+    )
+
+    senior_id: Mapped[int] = mapped_column(ForeignKey("seniors.id"), primary_key=True, autoincrement=False)
+    medication_id: Mapped[int] = mapped_column(ForeignKey("medications.id"), primary_key=True, autoincrement=False)
+    local_day: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    taken: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    late: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    missed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    skipped: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -1,18 +1,28 @@
 # app/meds/router.py
-from fastapi import APIRouter, Depends
+import logging
+
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 from typing import Optional
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 # from app.core.deps import get_current_user, require_senior_access, require_senior_edit
 from app.meds.models import IntakeStatus
 from app.meds.schemas import (
     MedicationCreate, MedicationPublic,
     MedicationScheduleCreate, MedicationSchedulePublic,
-    IntakeLogCreate, IntakeLogPublic
+    IntakeLogCreate, IntakeLogPublic,
+    serialize_medication, serialize_intake_log
 )
+from app.core.responses import trusted_json
+from app.core.cache import invalidate_on_commit, response_cache, senior_tags
+from app.core.config import settings
+from app.core.versions import bump_version, etag_headers, etag_matches, not_modified, versions_etag
 from app.meds.service import create_medication, add_schedule, log_intake, list_intakes, list_medications
+from app.meds.adherence import record_intake_change
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -26,7 +36,7 @@ async def create_medication_endpoint(
 ):
     try:
         from sqlalchemy.orm import selectinload
-        print(f"📥 Recibiendo datos: {payload.model_dump()}")
+        logger.debug("📥 Recibiendo datos: %s", payload.model_dump())
         med = await create_medication(db, senior_id, payload.model_dump(exclude={"senior_id"}))
         await db.commit()
         
@@ -40,17 +50,15 @@ async def create_medication_endpoint(
         )
         med = result.scalar_one()
         
-        print(f"✅ Medicamento creado: {med.id}")
+        logger.info("✅ Medicamento creado: %s", med.id)
         return med
     except Exception as e:
-        print(f"❌ Error creando medicamento: {type(e).__name__}: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Error creando medicamento: %s", type(e).__name__)
         raise
 
 
 @router.get("/medications", response_model=list[MedicationPublic])
-async def get_all_medications_endpoint(db: AsyncSession = Depends(get_db)):
+async def get_all_medications_endpoint(db: AsyncSession = Depends(get_read_db)):
     """Listar todos los medicamentos del sistema (para admin)"""
     from sqlalchemy import select
     from sqlalchemy.orm import selectinload
@@ -60,15 +68,27 @@ async def get_all_medications_endpoint(db: AsyncSession = Depends(get_db)):
         .options(selectinload(Medication.schedules))
         .order_by(Medication.created_at.desc())
     )
-    return result.scalars().all()
+    return trusted_json([serialize_medication(m) for m in result.scalars().all()])
 
 
 @router.get("/seniors/{senior_id}/medications", response_model=list[MedicationPublic])
 async def get_medications_endpoint(
     senior_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
-    return await list_medications(db, senior_id)
+    etag = await versions_etag(db, [("medications", senior_id)])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    async def load():
+        return [serialize_medication(m) for m in await list_medications(db, senior_id)]
+
+    # La versión va en la clave: con cache por proceso, otro worker puede no haber
+    # invalidado todavía y no debe devolver el cuerpo viejo con el ETag nuevo
+    return await response_cache.json(
+        f"medications:{senior_id}:{etag}", settings.CACHE_TTL_MEDICATIONS, senior_tags(senior_id, "meds"), load,
+        headers=etag_headers(etag),
+    )
 
 
 @router.get("/medications/{medication_id}", response_model=MedicationPublic)
@@ -100,7 +120,7 @@ async def delete_medication_endpoint(
 ):
     """Eliminar un medicamento y sus datos asociados"""
     from sqlalchemy import select, delete
-    from app.meds.models import Medication, MedicationSchedule, IntakeLog
+    from app.meds.models import DailyAdherence, Medication, MedicationSchedule, IntakeLog
     from app.reminders.models import Reminder
     from fastapi import HTTPException
     
@@ -115,12 +135,16 @@ async def delete_medication_endpoint(
     
     # Eliminar logs de toma asociados
     await db.execute(delete(IntakeLog).where(IntakeLog.medication_id == medication_id))
+    await db.execute(delete(DailyAdherence).where(DailyAdherence.medication_id == medication_id))
     
     # Eliminar horarios asociados
     await db.execute(delete(MedicationSchedule).where(MedicationSchedule.medication_id == medication_id))
     
     # Eliminar medicamento
     await db.delete(medication)
+    await bump_version(db, "medications", medication.senior_id)
+    await bump_version(db, "reminders", medication.senior_id)
+    invalidate_on_commit(db, *senior_tags(medication.senior_id, "meds", "reminders"))
     await db.commit()
     
     return {"message": "Medication deleted successfully"}
@@ -173,10 +197,11 @@ async def get_intakes_endpoint(
     senior_id: int,
     from_dt: Optional[datetime] = None,
     to_dt: Optional[datetime] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db),  # primario: se lee justo después de /medications/{id}/take
     # _=Depends(require_senior_access),  # Autenticación deshabilitada temporalmente
 ):
-    return await list_intakes(db, senior_id, from_dt, to_dt)
+    logs = await list_intakes(db, senior_id, from_dt, to_dt)
+    return trusted_json([serialize_intake_log(log) for log in logs])
 
 
 @router.post("/medications/{medication_id}/take", response_model=IntakeLogPublic)
@@ -207,6 +232,8 @@ async def mark_medication_taken_endpoint(
         actor_user_id=1  # Usuario por defecto
     )
     db.add(intake)
+    await record_intake_change(db, intake)
+    invalidate_on_commit(db, *senior_tags(medication.senior_id, "meds"))
     await db.commit()
     await db.refresh(intake)
     return intake
@@ -223,16 +250,20 @@ async def update_intake_status_endpoint(
     from app.meds.models import IntakeLog
     from datetime import datetime, timezone
     
-    result = await db.execute(select(IntakeLog).where(IntakeLog.id == intake_id))
+    # FOR UPDATE: dos PATCH concurrentes restarían el mismo estado anterior del rollup
+    result = await db.execute(select(IntakeLog).where(IntakeLog.id == intake_id).with_for_update())
     intake = result.scalar_one_or_none()
     if not intake:
         from fastapi import HTTPException
         raise HTTPException(status_code=404, detail="Intake not found")
     
+    old_status = intake.status
     intake.status = status
+    await record_intake_change(db, intake, old_status)
     if status == IntakeStatus.TAKEN and not intake.taken_at:
         intake.taken_at = datetime.now(timezone.utc)
     
+    invalidate_on_commit(db, *senior_tags(intake.senior_id, "meds"))
     await db.commit()
     await db.refresh(intake)
     return intake
@@ -139,3 +139,40 @@ class IntakeLogPublic(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+# Serializadores "confiables": construyen el dict de *Public directo desde filas ORM
+# ya validadas por la BD, sin pasar por la validación de Pydantic (listas grandes).
+def serialize_schedule(s) -> dict:
+    return {
+        "id": s.id,
+        "medication_id": s.medication_id,
+        "start_date": s.start_date,
+        "end_date": s.end_date,
+        "hours": s.hours,
+        "days_of_week": s.days_of_week,
+    }
+
+
+def serialize_medication(m) -> dict:
+    return {
+        "id": m.id,
+        "senior_id": m.senior_id,
+        "name": m.name,
+        "dose": m.dose,
+        "unit": m.unit,
+        "notes": m.notes,
+        "schedules": [serialize_schedule(s) for s in m.schedules],
+    }
+
+
+def serialize_intake_log(log) -> dict:
+    return {
+        "id": log.id,
+        "senior_id": log.senior_id,
+        "medication_id": log.medication_id,
+        "scheduled_at": log.scheduled_at,
+        "taken_at": log.taken_at,
+        "status": log.status,
+        "actor_user_id": log.actor_user_id,
+    }
@@ -4,7 +4,10 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, date, time, timedelta
 
+from app.meds.adherence import record_intake_change
 from app.meds.models import Medication, MedicationSchedule, IntakeLog
+from app.core.versions import bump_version
+from app.core.cache import invalidate_on_commit, senior_tags
 
 
 async def create_medication(db: AsyncSession, senior_id: int, data: dict) -> Medication:
@@ -28,6 +31,8 @@ async def create_medication(db: AsyncSession, senior_id: int, data: dict) -> Med
     med = Medication(senior_id=senior_id, **data)
     db.add(med)
     await db.flush()
+    await bump_version(db, "medications", senior_id)
+    invalidate_on_commit(db, *senior_tags(senior_id, "meds"))
     
     # Si hay datos de horario, crear el schedule automáticamente
     if schedule_data:
@@ -48,6 +53,8 @@ async def add_schedule(db: AsyncSession, medication_id: int, data: dict) -> Medi
     sched = MedicationSchedule(medication_id=medication_id, **data)
     db.add(sched)
     await db.flush()
+    await bump_version(db, "medications", medication.senior_id)
+    invalidate_on_commit(db, *senior_tags(medication.senior_id, "meds"))
     
     # Crear recordatorios automáticos para cada horario
     await create_medication_reminders(db, medication, sched)
@@ -95,12 +102,16 @@ async def create_medication_reminders(db: AsyncSession, medication: Medication,
             db.add(reminder)
     
     await db.flush()
+    await bump_version(db, "reminders", medication.senior_id)
+    invalidate_on_commit(db, *senior_tags(medication.senior_id, "reminders"))
 
 
 async def log_intake(db: AsyncSession, data: dict) -> IntakeLog:
     log = IntakeLog(**data)
     db.add(log)
     await db.flush()
+    await record_intake_change(db, log)
+    invalidate_on_commit(db, *senior_tags(log.senior_id, "meds"))
     return log
 
 
@@ -0,0 +1,115 @@
+# app/monitoring/metrics.py
+"""
+Endpoint /metrics (formato texto de Prometheus) y collectors del estado de la aplicación:
+pool de BD, rooms del chat WebSocket, pool de bcrypt y cache de respuestas.
+Los collectors leen contadores que ya existen; solo se ejecutan al hacer scrape.
+
+Con DEBUG=false el endpoint exige METRICS_BEARER_TOKEN: expone rutas, estado del pool y
+conexiones por room, igual de sensibles que /api/v1/monitoring (solo ADMIN). Sin token
+configurado responde 401 a todo scrape.
+"""
+import logging
+import secrets
+from typing import Iterable, List
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.chat.websocket import manager
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.database import pool_status
+from app.core.hashing import password_hasher
+from app.core.metrics import CONTENT_TYPE, Counter, Gauge, registry
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+def _gauge(name: str, documentation: str, value: float) -> Gauge:
+    metric = Gauge(name, documentation)
+    metric.set(value=value)
+    return metric
+
+
+def _counter(name: str, documentation: str, value: float) -> Counter:
+    metric = Counter(name, documentation)
+    metric.inc(amount=value)
+    return metric
+
+
+def collect_db_pool() -> Iterable:
+    status = pool_status()
+    yield _gauge("db_pool_size", "Tamaño configurado del pool del primario", status["pool_size"])
+    yield _gauge("db_pool_checked_out", "Conexiones del primario en uso", status["checked_out"])
+    yield _gauge("db_pool_checked_in", "Conexiones del primario libres en el pool", status["checked_in"])
+    yield _gauge("db_pool_overflow", "Conexiones de overflow abiertas en el primario", status["overflow"])
+    yield _counter("db_pool_checkouts_total", "Checkouts de conexión del primario", status["checkouts"])
+    yield _counter("db_pool_timeouts_total", "Esperas de conexión que terminaron en timeout", status["timeouts"])
+    yield _gauge("db_pool_max_wait_seconds", "Mayor espera observada por una conexión", status["max_wait_ms"] / 1000)
+
+    if status["replicas"]:
+        replica_out = Gauge("db_replica_checked_out", "Conexiones en uso por réplica", ("replica",))
+        replica_up = Gauge("db_replica_available", "1 si la réplica está en rotación", ("replica",))
+        for idx, replica in enumerate(status["replicas"]):
+            replica_out.set(str(idx), value=replica["checked_out"])
+            replica_up.set(str(idx), value=1 if replica["available"] else 0)
+        yield replica_out
+        yield replica_up
+
+
+def collect_websocket_rooms() -> Iterable:
+    rooms = manager.rooms
+    yield _gauge("ws_rooms", "Conversaciones con al menos un WebSocket conectado", len(rooms))
+    yield _gauge("ws_connections", "WebSockets de chat conectados", sum(len(c) for c in rooms.values()))
+
+    # Solo las rooms con más conexiones, para acotar la cardinalidad
+    per_room = Gauge("ws_room_connections", "WebSockets conectados por conversación", ("conversation_id",))
+    busiest = sorted(rooms.items(), key=lambda item: len(item[1]), reverse=True)
+    for conversation_id, connections in busiest[: settings.METRICS_ROOM_SERIES_LIMIT]:
+        per_room.set(str(conversation_id), value=len(connections))
+    yield per_room
+
+
+def collect_password_hasher() -> Iterable:
+    snapshot = password_hasher.snapshot()
+    yield _gauge("password_hash_in_flight", "Operaciones de bcrypt en curso", snapshot["in_flight"])
+    yield _counter("password_hash_rejected_total", "Operaciones de bcrypt rechazadas (503)", snapshot["rejected"])
+    ops = Counter("password_hash_operations_total", "Operaciones de bcrypt completadas", ("operation",))
+    for operation in ("hash", "verify"):
+        ops.inc(operation, amount=snapshot[operation]["count"])
+    yield ops
+
+
+def collect_response_cache() -> Iterable:
+    if not response_cache.enabled:
+        return
+    snapshot = response_cache.snapshot()
+    lookups = Counter("response_cache_lookups_total", "Búsquedas en el cache de respuestas", ("result",))
+    lookups.inc("hit", amount=snapshot["hits"])
+    lookups.inc("miss", amount=snapshot["misses"])
+    yield lookups
+    yield _counter("response_cache_errors_total", "Errores del backend de cache", snapshot["errors"])
+
+
+_COLLECTORS: List = [collect_db_pool, collect_websocket_rooms, collect_password_hasher, collect_response_cache]
+
+
+def register_collectors():
+    for collector in _COLLECTORS:
+        registry.add_collector(collector)
+    if not settings.DEBUG and not settings.METRICS_BEARER_TOKEN:
+        logger.warning("⚠️  /metrics sin METRICS_BEARER_TOKEN con DEBUG=false: el endpoint responderá 401")
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics_endpoint(authorization: str | None = Header(None)):
+    if settings.METRICS_BEARER_TOKEN:
+        expected = f"Bearer {settings.METRICS_BEARER_TOKEN}"
+        if not authorization or not secrets.compare_digest(authorization, expected):
+            raise HTTPException(status_code=401, detail="Not authenticated")
+    elif not settings.DEBUG:
+        # Fuera de desarrollo no se exponen métricas sin token
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,57 @@
+# app/monitoring/router.py
+from fastapi import APIRouter, Depends, Query
+
+from app.core.cache import response_cache
+from app.core.database import pool_status
+from app.core.deps import require_roles
+from app.core.hashing import password_hasher
+from app.core.models import UserRole
+from app.core.slow_queries import slow_query_log
+
+router = APIRouter(dependencies=[Depends(require_roles(UserRole.ADMIN))])
+
+
+@router.get("/db-pool")
+async def db_pool_endpoint():
+    """Estado del pool de conexiones: en uso, overflow y tiempos de espera"""
+    return pool_status()
+
+
+@router.get("/password-hashing")
+async def password_hashing_endpoint():
+    """Latencia y cola del pool de bcrypt"""
+    return password_hasher.snapshot()
+
+
+@router.get("/cache")
+async def cache_endpoint():
+    """Aciertos, fallos e invalidaciones del cache de respuestas"""
+    return response_cache.snapshot()
+
+
+@router.delete("/cache")
+async def clear_cache_endpoint():
+    """Vacía el cache de respuestas"""
+    await response_cache.clear()
+    return {"ok": True}
+
+
+@router.get("/slow-queries")
+async def slow_queries_endpoint(
+    limit: int = Query(20, ge=1, le=200),
+    order_by: str = Query("total", pattern="^(total|max|p95|count)$"),
+):
+    """Plantillas de SQL con más tiempo acumulado (o mayor max/p95/conteo)"""
+    return {
+        "threshold_ms": slow_query_log.threshold_ms,
+        "sample_rate": slow_query_log.sample_rate,
+        "slow_count": slow_query_log.slow_count,
+        "templates": slow_query_log.top(limit, order_by),
+    }
+
+
+@router.delete("/slow-queries")
+async def reset_slow_queries_endpoint():
+    """Reinicia los histogramas (por ejemplo, antes de una prueba de carga)"""
+    slow_query_log.reset()
+    return {"ok": True}
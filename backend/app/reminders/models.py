@@ -1,10 +1,10 @@
 # app/reminders/models.py
 import enum
 from datetime import datetime
-from sqlalchemy import DateTime, Enum, ForeignKey, String, Text
+from sqlalchemy import Enum, ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.core.models import Base, TimestampMixin
+from app.core.models import Base, TimestampMixin, UTCDateTime
 
 
 class ReminderStatus(str, enum.Enum):
@@ -15,6 +15,9 @@ class ReminderStatus(str, enum.Enum):
 
 class Reminder(TimestampMixin, Base):
     __tablename__ = "reminders"
+    __table_args__ = (
+        Index("ix_reminders_senior_status_scheduled", "senior_id", "status", "scheduled_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     senior_id: Mapped[int] = mapped_column(ForeignKey("seniors.id"), index=True, nullable=False)
@@ -22,11 +25,11 @@ class Reminder(TimestampMixin, Base):
     title: Mapped[str] = mapped_column(String(120), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
 
-    scheduled_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True, nullable=False)
+    scheduled_at: Mapped[datetime] = mapped_column(UTCDateTime(), index=True, nullable=False)
     repeat_rule: Mapped[str | None] = mapped_column(String(120), nullable=True)  # ej "DAILY", "WEEKLY:1,3,5"
 
     status: Mapped[ReminderStatus] = mapped_column(Enum(ReminderStatus), default=ReminderStatus.PENDING, nullable=False)
-    done_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    done_at: Mapped[datetime | None] = mapped_column(UTCDateTime(), nullable=True)
     
     # Referencia opcional a medicamento (para recordatorios automáticos)
     medication_id: Mapped[int | None] = mapped_column(ForeignKey("medications.id"), nullable=True, index=True)
@@ -1,12 +1,15 @@
 # app/reminders/router.py
 from datetime import date, datetime
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
 from app.core.database import get_db
 # from app.core.deps import get_current_user, require_senior_access, require_senior_edit
-from app.reminders.schemas import ReminderCreate, ReminderPublic, ReminderUpdate
+from app.reminders.schemas import ReminderCreate, ReminderPublic, ReminderUpdate, serialize_reminder
+from app.core.responses import trusted_json
+from app.core.cache import invalidate_on_commit, senior_tags
+from app.core.versions import bump_version, etag_headers, etag_matches, not_modified, versions_etag
 from app.reminders.service import create_reminder, list_reminders_by_date, mark_done
 from app.reminders.models import Reminder, ReminderStatus
 
@@ -28,12 +31,18 @@ async def create_reminder_endpoint(
 @router.get("/seniors/{senior_id}/reminders", response_model=list[ReminderPublic])
 async def get_reminders_endpoint(
     senior_id: int,
+    request: Request,
     date_: Optional[date] = Query(None, alias="date"),
     status: Optional[ReminderStatus] = None,
     db: AsyncSession = Depends(get_db),
 ):
     """Obtener recordatorios de un senior. Si no se pasa fecha, devuelve todos."""
     from sqlalchemy import select
+
+    # El ETag incluye los query params: cada filtro es una representación distinta
+    etag = await versions_etag(db, [("reminders", senior_id)], request)
+    if etag_matches(request, etag):
+        return not_modified(etag)
     
     query = select(Reminder).where(Reminder.senior_id == senior_id)
     
@@ -48,7 +57,7 @@ async def get_reminders_endpoint(
     
     query = query.order_by(Reminder.scheduled_at)
     result = await db.execute(query)
-    return list(result.scalars().all())
+    return trusted_json([serialize_reminder(r) for r in result.scalars().all()], headers=etag_headers(etag))
 
 
 @router.post("/{reminder_id}/done", response_model=ReminderPublic)
@@ -80,6 +89,8 @@ async def update_reminder_status_endpoint(
     if status == ReminderStatus.DONE and not reminder.done_at:
         reminder.done_at = datetime.now()
     
+    await bump_version(db, "reminders", reminder.senior_id)
+    invalidate_on_commit(db, *senior_tags(reminder.senior_id, "reminders"))
     await db.commit()
     await db.refresh(reminder)
     return reminder
@@ -102,6 +113,8 @@ async def update_reminder_endpoint(
     for key, value in payload.model_dump(exclude_unset=True).items():
         setattr(reminder, key, value)
     
+    await bump_version(db, "reminders", reminder.senior_id)
+    invalidate_on_commit(db, *senior_tags(reminder.senior_id, "reminders"))
     await db.commit()
     await db.refresh(reminder)
     return reminder
@@ -121,5 +134,7 @@ async def delete_reminder_endpoint(
         raise HTTPException(status_code=404, detail="Reminder not found")
     
     await db.delete(reminder)
+    await bump_version(db, "reminders", reminder.senior_id)
+    invalidate_on_commit(db, *senior_tags(reminder.senior_id, "reminders"))
     await db.commit()
     return {"message": "Reminder deleted successfully"}
@@ -33,3 +33,18 @@ class ReminderUpdate(BaseModel):
     scheduled_at: Optional[datetime] = None
     repeat_rule: Optional[str] = None
     status: Optional[ReminderStatus] = None
+
+
+# Serializador "confiable" (fila ORM -> dict de ReminderPublic sin validar con Pydantic)
+def serialize_reminder(r) -> dict:
+    return {
+        "id": r.id,
+        "senior_id": r.senior_id,
+        "title": r.title,
+        "description": r.description,
+        "scheduled_at": r.scheduled_at,
+        "repeat_rule": r.repeat_rule,
+        "status": r.status,
+        "done_at": r.done_at,
+        "actor_user_id": r.actor_user_id,
+    }
@@ -5,12 +5,16 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.reminders.models import Reminder, ReminderStatus
+from app.core.versions import bump_version
+from app.core.cache import invalidate_on_commit, senior_tags
 
 
 async def create_reminder(db: AsyncSession, senior_id: int, data: dict) -> Reminder:
     r = Reminder(senior_id=senior_id, **data)
     db.add(r)
     await db.flush()
+    await bump_version(db, "reminders", senior_id)
+    invalidate_on_commit(db, *senior_tags(senior_id, "reminders"))
     return r
 
 
@@ -39,6 +43,7 @@ async def mark_done(db: AsyncSession, reminder_id: int, actor_user_id: int) -> R
     
     # Si el recordatorio está asociado a un medicamento, crear un IntakeLog
     if r.medication_id:
+        from app.meds.adherence import record_intake_change
         from app.meds.models import IntakeLog, IntakeStatus
         
         now = datetime.now(timezone.utc)
@@ -63,6 +68,10 @@ async def mark_done(db: AsyncSession, reminder_id: int, actor_user_id: int) -> R
             actor_user_id=actor_user_id
         )
         db.add(intake)
+        await record_intake_change(db, intake)
     
     await db.flush()
+    await bump_version(db, "reminders", r.senior_id)
+    # mark_done también puede registrar una toma (adherencia)
+    invalidate_on_commit(db, *senior_tags(r.senior_id, "reminders", "meds"))
     return r
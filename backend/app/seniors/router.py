@@ -1,16 +1,21 @@
 # app/seniors/router.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.core.database import get_db
 from app.core.deps import get_current_user
+from app.core.acl import care_team_acl
+from app.core.cache import invalidate_on_commit, response_cache, senior_tags
+from app.core.config import settings
+from app.core.versions import bump_version, etag_headers, etag_matches, not_modified, versions_etag
 # from app.core.deps import require_senior_access, require_senior_edit
 from app.core.models import UserRole
 from app.auth.models import User
 from app.seniors.schemas import (
     SeniorCreate, SeniorPublic, CareTeamAdd, CareTeamMemberPublic
 )
+from app.core.responses import trusted_json
 from app.seniors.service import create_senior, add_team_member, get_senior, list_team
 
 router = APIRouter()
@@ -18,7 +23,7 @@ router = APIRouter()
 
 @router.get("/", response_model=list[SeniorPublic])
 async def list_seniors_endpoint(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db),  # primario: se lee justo después de POST /seniors/
     user_id: int | None = None
 ):
     """
@@ -65,19 +70,28 @@ async def get_senior_endpoint(
     db: AsyncSession = Depends(get_db),
     # _=Depends(require_senior_access),  # Autenticación deshabilitada temporalmente
 ):
-    senior = await get_senior(db, senior_id)
-    if not senior:
-        raise HTTPException(status_code=404, detail="Senior not found")
-    return senior
+    async def load():
+        senior = await get_senior(db, senior_id)
+        if not senior:
+            raise HTTPException(status_code=404, detail="Senior not found")
+        return SeniorPublic.model_validate(senior).model_dump(mode="json")
+
+    return await response_cache.json(
+        f"senior:{senior_id}", settings.CACHE_TTL_SENIOR, senior_tags(senior_id, "profile"), load
+    )
 
 
 @router.get("/{senior_id}/team", response_model=list[CareTeamMemberPublic])
 async def get_team_endpoint(
     senior_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db),
     # _=Depends(require_senior_access),  # Autenticación deshabilitada temporalmente
 ):
-    return await list_team(db, senior_id)
+    etag = await versions_etag(db, [("team", senior_id)])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return trusted_json(await list_team(db, senior_id), headers=etag_headers(etag))
 
 
 @router.get("/my-relations/all")
@@ -123,6 +137,7 @@ async def add_team_member_endpoint(
     
     member = await add_team_member(db, senior_id, payload.model_dump())
     await db.commit()
+    care_team_acl.invalidate(payload.user_id)
     
     # Recargar el miembro con la relación del usuario
     result = await db.execute(
@@ -168,9 +183,13 @@ async def remove_team_member_endpoint(
     if not member:
         raise HTTPException(status_code=404, detail="Relación no encontrada")
     
+    member_user_id = member.user_id
     await db.execute(
         delete(CareTeam).where(CareTeam.id == member_id)
     )
+    await bump_version(db, "team", senior_id)
+    invalidate_on_commit(db, "seniors")
     await db.commit()
+    care_team_acl.invalidate(member_user_id)
     
     return {"message": "Relación eliminada exitosamente"}
@@ -5,12 +5,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.seniors.models import SeniorProfile, CareTeam
 from app.auth.models import User
+from app.core.versions import bump_version
+from app.core.cache import invalidate_on_commit
 
 
 async def create_senior(db: AsyncSession, payload: dict) -> SeniorProfile:
     senior = SeniorProfile(**payload)
     db.add(senior)
     await db.flush()
+    invalidate_on_commit(db, "seniors")
     return senior
 
 
@@ -34,6 +37,8 @@ async def add_team_member(db: AsyncSession, senior_id: int, payload: dict) -> Ca
     member = CareTeam(senior_id=senior_id, **payload)
     db.add(member)
     await db.flush()
+    await bump_version(db, "team", senior_id)
+    invalidate_on_commit(db, "seniors")
     return member
 
 
@@ -1,9 +1,10 @@
 # app/stats_reports/advanced_service.py
+import heapq
 from datetime import datetime, date, timezone, timedelta
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, func, and_, or_, literal, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List, Tuple
 
 from app.auth.models import User, UserRole
 from app.seniors.models import SeniorProfile, CareTeam
@@ -11,6 +12,9 @@ from app.meds.models import Medication, IntakeLog, IntakeStatus
 from app.appointments.models import Appointment
 from app.reminders.models import Reminder, ReminderStatus
 from app.audit.models import AuditLog
+from app.core.sql_compat import hour_of
+from app.meds.adherence import STATUS_COLUMNS, intake_counts_subquery, status_sums
+from app.stats_reports.service import medication_intake_counts
 from app.stats_reports.schemas import (
     MedicationAdherenceDetail,
     AppointmentSummary,
@@ -99,30 +103,11 @@ async def _get_medications_adherence(
     dt_start: datetime,
     dt_end: datetime
 ) -> List[MedicationAdherenceDetail]:
-    """Calcula adherencia por cada medicamento."""
-    
-    # Obtener todos los medicamentos del senior
-    result = await db.execute(
-        select(Medication)
-        .where(Medication.senior_id == senior_id)
-        .order_by(Medication.name)
-    )
-    medications = result.scalars().all()
+    """Calcula adherencia por cada medicamento (una consulta, compartida con compute_stats)."""
     
     details = []
-    for med in medications:
-        # Contar intakes por medicamento
-        result = await db.execute(
-            select(IntakeLog.status, func.count(IntakeLog.id))
-            .where(
-                IntakeLog.medication_id == med.id,
-                IntakeLog.scheduled_at >= dt_start,
-                IntakeLog.scheduled_at <= dt_end
-            )
-            .group_by(IntakeLog.status)
-        )
-        
-        counts = {status.value: cnt for status, cnt in result.all()}
+    for med in await medication_intake_counts(db, senior_id, dt_start, dt_end):
+        counts = med["counts"]
         taken = counts.get(IntakeStatus.TAKEN.value, 0)
         missed = counts.get(IntakeStatus.MISSED.value, 0) + counts.get(IntakeStatus.SKIPPED.value, 0)
         total = taken + missed
@@ -130,7 +115,7 @@ async def _get_medications_adherence(
         adherence = (taken / total * 100) if total > 0 else 0.0
         
         details.append(MedicationAdherenceDetail(
-            medication_name=med.name,
+            medication_name=med["name"],
             total_doses=total,
             taken=taken,
             missed=missed,
@@ -199,7 +184,7 @@ async def _get_reminders_stats(
             Reminder.senior_id == senior_id,
             Reminder.scheduled_at >= dt_start,
             Reminder.scheduled_at <= dt_end,
-            Reminder.status == ReminderStatus.COMPLETED
+            Reminder.status == ReminderStatus.DONE
         )
     )
     completed = result.scalar() or 0
@@ -207,62 +192,71 @@ async def _get_reminders_stats(
     return {'total': total, 'completed': completed}
 
 
+async def count_by_bucket(
+    db: AsyncSession,
+    bucket: Callable[[Any], Any],
+    sources: Dict[str, Tuple[Any, List[Any]]],
+) -> Dict[str, Dict[int, int]]:
+    """
+    Conteos por bucket (hour_of, weekday_of...) de varias tablas en una sola consulta:
+    un SELECT ... GROUP BY bucket por fuente unidos con UNION ALL.
+    sources: nombre -> (columna de fecha a agrupar, filtros WHERE).
+    Devuelve {nombre: {bucket: cantidad}}; los buckets sin filas no aparecen.
+    """
+    selects = []
+    for name, (column, criteria) in sources.items():
+        key = bucket(column)
+        selects.append(
+            select(literal(name).label("source"), key.label("bucket"), func.count().label("total"))
+            .where(*criteria)
+            .group_by(key)
+        )
+
+    counts: Dict[str, Dict[int, int]] = {name: {} for name in sources}
+    result = await db.execute(union_all(*selects))
+    for source, key, total in result.all():
+        if key is not None:
+            counts[source][int(key)] = total
+    return counts
+
+
 async def _get_activity_by_hour(
     db: AsyncSession,
     senior_id: int,
     dt_start: datetime,
     dt_end: datetime
 ) -> List[ActivityByHour]:
-    """Analiza la actividad por hora del día."""
-    
-    activity_hours = []
+    """Analiza la actividad por hora del día (una sola consulta para las tres fuentes)."""
+    
+    counts = await count_by_bucket(db, hour_of, {
+        # Medicamentos tomados
+        "intakes": (IntakeLog.taken_at, [
+            IntakeLog.senior_id == senior_id,
+            IntakeLog.taken_at >= dt_start,
+            IntakeLog.taken_at <= dt_end,
+            IntakeLog.status == IntakeStatus.TAKEN,
+        ]),
+        "appointments": (Appointment.starts_at, [
+            Appointment.senior_id == senior_id,
+            Appointment.starts_at >= dt_start,
+            Appointment.starts_at <= dt_end,
+        ]),
+        "reminders": (Reminder.scheduled_at, [
+            Reminder.senior_id == senior_id,
+            Reminder.scheduled_at >= dt_start,
+            Reminder.scheduled_at <= dt_end,
+        ]),
+    })
     
-    for hour in range(24):
-        # Medicamentos tomados en esta hora
-        result = await db.execute(
-            select(func.count(IntakeLog.id))
-            .where(
-                IntakeLog.senior_id == senior_id,
-                IntakeLog.taken_at >= dt_start,
-                IntakeLog.taken_at <= dt_end,
-                IntakeLog.status == IntakeStatus.TAKEN,
-                func.extract('hour', IntakeLog.taken_at) == hour
-            )
-        )
-        med_count = result.scalar() or 0
-        
-        # Citas en esta hora
-        result = await db.execute(
-            select(func.count(Appointment.id))
-            .where(
-                Appointment.senior_id == senior_id,
-                Appointment.starts_at >= dt_start,
-                Appointment.starts_at <= dt_end,
-                func.extract('hour', Appointment.starts_at) == hour
-            )
-        )
-        appt_count = result.scalar() or 0
-        
-        # Recordatorios en esta hora
-        result = await db.execute(
-            select(func.count(Reminder.id))
-            .where(
-                Reminder.senior_id == senior_id,
-                Reminder.scheduled_at >= dt_start,
-                Reminder.scheduled_at <= dt_end,
-                func.extract('hour', Reminder.scheduled_at) == hour
-            )
-        )
-        rem_count = result.scalar() or 0
-        
-        activity_hours.append(ActivityByHour(
+    return [
+        ActivityByHour(
             hour=hour,
-            medication_intakes=med_count,
-            appointments=appt_count,
-            reminders=rem_count
-        ))
-    
-    return activity_hours
+            medication_intakes=counts["intakes"].get(hour, 0),
+            appointments=counts["appointments"].get(hour, 0),
+            reminders=counts["reminders"].get(hour, 0)
+        )
+        for hour in range(24)
+    ]
 
 
 async def _get_care_team_activity(
@@ -287,7 +281,7 @@ async def _get_care_team_activity(
         result = await db.execute(
             select(func.count(AuditLog.id))
             .where(
-                AuditLog.user_id == member.user_id,
+                AuditLog.actor_user_id == member.user_id,
                 AuditLog.created_at >= dt_start,
                 AuditLog.created_at <= dt_end
             )
@@ -298,7 +292,7 @@ async def _get_care_team_activity(
         result = await db.execute(
             select(AuditLog.created_at)
             .where(
-                AuditLog.user_id == member.user_id,
+                AuditLog.actor_user_id == member.user_id,
                 AuditLog.created_at >= dt_start,
                 AuditLog.created_at <= dt_end
             )
@@ -408,56 +402,51 @@ async def get_global_stats(db: AsyncSession) -> GlobalStatsResponse:
     )
     active_reminders = result.scalar() or 0
     
-    # Adherencia promedio global
-    result = await db.execute(
-        select(SeniorProfile.id, SeniorProfile.full_name)
-    )
-    seniors = result.all()
-    
-    adherence_list = []
-    top_performers = []
-    need_attention = []
-    
-    # Calcular para últimos 7 días
+    # Adherencia de los últimos 7 días por senior en una consulta: rollup diario para los
+    # días completos + intake_logs para los bordes del rango
     week_ago = datetime.now(timezone.utc) - timedelta(days=7)
     now = datetime.now(timezone.utc)
     
-    for senior_id, senior_name in seniors:
-        result = await db.execute(
-            select(IntakeLog.status, func.count(IntakeLog.id))
-            .where(
-                IntakeLog.senior_id == senior_id,
-                IntakeLog.scheduled_at >= week_ago,
-                IntakeLog.scheduled_at <= now
-            )
-            .group_by(IntakeLog.status)
-        )
+    counts = intake_counts_subquery("senior_id", week_ago, now)
+    result = await db.execute(
+        select(SeniorProfile.id, SeniorProfile.full_name, *status_sums(counts))
+        .join(counts, counts.c.group_key == SeniorProfile.id)
+        .group_by(SeniorProfile.id, SeniorProfile.full_name)
+        .order_by(SeniorProfile.id)
+    )
+    
+    adherence_sum = 0.0
+    seniors_with_doses = 0
+    top_candidates = []
+    attention_candidates = []
+    
+    for senior_id, senior_name, *sums in result.all():
+        by_status = dict(zip(STATUS_COLUMNS, (int(n) for n in sums)))
+        total = sum(by_status.values())
+        if not total:
+            continue
+        taken = by_status[IntakeStatus.TAKEN]
+        adherence = (taken / total) * 100
+        adherence_sum += adherence
+        seniors_with_doses += 1
         
-        counts = {status.value: cnt for status, cnt in result.all()}
-        taken = counts.get(IntakeStatus.TAKEN.value, 0)
-        total = sum(counts.values())
+        senior_data = {
+            'id': senior_id,
+            'name': senior_name,
+            'adherence': round(adherence, 1),
+            'total_doses': total
+        }
         
-        if total > 0:
-            adherence = (taken / total) * 100
-            adherence_list.append(adherence)
-            
-            senior_data = {
-                'id': senior_id,
-                'name': senior_name,
-                'adherence': round(adherence, 1),
-                'total_doses': total
-            }
-            
-            if adherence >= 90:
-                top_performers.append(senior_data)
-            elif adherence < 70:
-                need_attention.append(senior_data)
-    
-    average_adherence = sum(adherence_list) / len(adherence_list) if adherence_list else 0.0
-    
-    # Ordenar listas
-    top_performers = sorted(top_performers, key=lambda x: x['adherence'], reverse=True)[:5]
-    need_attention = sorted(need_attention, key=lambda x: x['adherence'])[:5]
+        if adherence >= 90:
+            top_candidates.append(senior_data)
+        elif adherence < 70:
+            attention_candidates.append(senior_data)
+    
+    average_adherence = adherence_sum / seniors_with_doses if seniors_with_doses else 0.0
+    
+    # Top 5 con heap acotado (O(n log 5)); empates: menor id primero, como el orden anterior
+    top_performers = heapq.nlargest(5, top_candidates, key=lambda x: (x['adherence'], -x['id']))
+    need_attention = heapq.nsmallest(5, attention_candidates, key=lambda x: (x['adherence'], x['id']))
     
     return GlobalStatsResponse(
         total_seniors=total_seniors,
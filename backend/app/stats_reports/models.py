@@ -1,20 +1,25 @@
 # app/stats_reports/models.py
 import enum
-from datetime import date
-from sqlalchemy import Date, Enum, ForeignKey, String
+from datetime import date, datetime
+from sqlalchemy import Date, Enum, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.core.models import Base, TimestampMixin
+from app.core.models import Base, TimestampMixin, UTCDateTime
 
 
 class ReportStatus(str, enum.Enum):
     PENDING = "PENDING"
+    RUNNING = "RUNNING"
     READY = "READY"
     FAILED = "FAILED"
 
 
 class ReportJob(TimestampMixin, Base):
     __tablename__ = "report_jobs"
+    __table_args__ = (
+        # cola: próximo job pendiente (o con lease vencido) por fecha de intento
+        Index("ix_report_jobs_status_next_attempt", "status", "next_attempt_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     senior_id: Mapped[int] = mapped_column(ForeignKey("seniors.id"), index=True, nullable=False)
@@ -25,3 +30,12 @@ class ReportJob(TimestampMixin, Base):
     status: Mapped[ReportStatus] = mapped_column(Enum(ReportStatus), default=ReportStatus.PENDING, nullable=False)
     file_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
     error: Mapped[str | None] = mapped_column(String(500), nullable=True)
+
+    # Cola (app/stats_reports/worker.py)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[datetime | None] = mapped_column(UTCDateTime(), nullable=True)
+    # Mientras está RUNNING: si vence sin terminar (worker caído) otro worker lo retoma
+    locked_until: Mapped[datetime | None] = mapped_column(UTCDateTime(), nullable=True)
+    started_at: Mapped[datetime | None] = mapped_column(UTCDateTime(), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(UTCDateTime(), nullable=True)
+    duration_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
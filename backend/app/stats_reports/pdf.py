@@ -0,0 +1,253 @@
+# app/stats_reports/pdf.py
+"""
+PDF del reporte de salud (SeniorHealthReport) con reportlab.
+
+- render_report_pdf() corre en un proceso del pool (ReportRenderer): el layout de
+  reportlab es CPU puro y bloquearía el event loop. Recibe el reporte ya serializado
+  (dict) y escribe el archivo; al proceso padre solo vuelve el número de páginas.
+- El PDF se escribe en un archivo temporal propio del proceso y se renombra al terminar,
+  así una descarga nunca ve un archivo a medias.
+- Si el job vence (timeout) o se cancela con el render en curso, se termina el pool
+  (Pool.terminate()): un render colgado no ocupa un slot para siempre ni termina después
+  pisando el PDF del reintento.
+- No se escribe página por página: reportlab (platypus y también Canvas) arma el documento
+  entero antes de escribirlo. En su lugar el contenido es agregado (24 buckets horarios, una
+  fila por medicamento y por miembro del equipo), así la memoria no crece con la longitud
+  del período, y el render corre fuera del proceso de la API.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+from multiprocessing.pool import Pool
+from typing import Any, Dict, List, Optional, Set
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_MARGIN_CM = 2.0
+_BAR_COLORS = ("#0066cc", "#2e9e5b", "#f0a202")
+
+
+def _latin(text: Any) -> str:
+    # Las fuentes estándar de PDF (Helvetica) usan WinAnsi: se quitan emojis y otros símbolos
+    return str(text).encode("cp1252", "ignore").decode("cp1252").strip()
+
+
+def _hourly_chart(activity: List[Dict[str, int]], width: float):
+    from reportlab.graphics.charts.barcharts import VerticalBarChart
+    from reportlab.graphics.charts.legends import Legend
+    from reportlab.graphics.shapes import Drawing
+    from reportlab.lib import colors
+
+    height = 190
+    drawing = Drawing(width, height)
+    chart = VerticalBarChart()
+    chart.x, chart.y = 30, 40
+    chart.width, chart.height = width - 40, height - 60
+    chart.data = [
+        [h["medication_intakes"] for h in activity],
+        [h["appointments"] for h in activity],
+        [h["reminders"] for h in activity],
+    ]
+    chart.categoryAxis.categoryNames = [str(h["hour"]) for h in activity]
+    chart.categoryAxis.labels.fontSize = 7
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.labels.fontSize = 7
+    chart.barSpacing = 0
+    chart.groupSpacing = 2
+    for idx, color in enumerate(_BAR_COLORS):
+        chart.bars[idx].fillColor = colors.HexColor(color)
+        chart.bars[idx].strokeColor = None
+    drawing.add(chart)
+
+    legend = Legend()
+    legend.x, legend.y = 30, 12
+    legend.alignment = "right"
+    legend.columnMaximum = 1
+    legend.fontSize = 8
+    legend.colorNamePairs = [
+        (colors.HexColor(color), name)
+        for color, name in zip(_BAR_COLORS, ("Tomas", "Citas", "Recordatorios"))
+    ]
+    drawing.add(legend)
+    return drawing
+
+
+def _table(rows: List[List[Any]], col_widths: Optional[List[float]] = None, numeric_from: int = 1):
+    from reportlab.lib import colors
+    from reportlab.platypus import Table, TableStyle
+
+    table = Table(rows, colWidths=col_widths, repeatRows=1)
+    table.setStyle(TableStyle([
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, -1), 9),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#f2f2f2")),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#dddddd")),
+        ("ALIGN", (numeric_from, 1), (-1, -1), "RIGHT"),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#fafafa")]),
+    ]))
+    return table
+
+
+def render_report_pdf(report: Dict[str, Any], path: str) -> int:
+    """Escribe el PDF de `report` (SeniorHealthReport.model_dump(mode="json")) en `path`. Devuelve las páginas."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import cm
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+    from xml.sax.saxutils import escape
+
+    styles = getSampleStyleSheet()
+    body, h1, h2 = styles["BodyText"], styles["Title"], styles["Heading2"]
+
+    def para(text: Any, style=body) -> Paragraph:
+        return Paragraph(escape(_latin(text)), style)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    doc = SimpleDocTemplate(
+        tmp_path,
+        pagesize=A4,
+        leftMargin=_MARGIN_CM * cm, rightMargin=_MARGIN_CM * cm,
+        topMargin=_MARGIN_CM * cm, bottomMargin=_MARGIN_CM * cm,
+        title=_latin(f"Reporte de salud - {report['senior_name']}"),
+    )
+    width = doc.width
+
+    story = [
+        para("Reporte de salud", h1),
+        para(f"{report['senior_name']} (senior #{report['senior_id']})"),
+        para(f"Período: {report['period_start']} a {report['period_end']}"),
+        Spacer(1, 0.4 * cm),
+    ]
+
+    # Adherencia por medicamento
+    story.append(para("Adherencia a medicamentos", h2))
+    story.append(para(
+        f"{report['total_medications']} medicamento(s), adherencia promedio "
+        f"{report['medication_adherence']:.1f}%"
+    ))
+    meds = report["medications_detail"]
+    if meds:
+        rows = [["Medicamento", "Dosis", "Tomadas", "Perdidas", "Adherencia"]]
+        rows += [
+            [_latin(m["medication_name"]), m["total_doses"], m["taken"], m["missed"], f"{m['adherence_rate']:.1f}%"]
+            for m in meds
+        ]
+        story.append(_table(rows, [width * 0.4] + [width * 0.15] * 4))
+    story.append(Spacer(1, 0.4 * cm))
+
+    # Actividad por hora
+    story.append(para("Actividad por hora del día", h2))
+    story.append(_hourly_chart(report["activity_by_hour"], width))
+    if report["most_active_hours"]:
+        hours = ", ".join(f"{h}:00" for h in report["most_active_hours"])
+        story.append(para(f"Horas más activas: {hours}"))
+    story.append(Spacer(1, 0.4 * cm))
+
+    # Citas y recordatorios
+    story.append(para("Citas y recordatorios", h2))
+    appts = report["appointments_summary"]
+    story.append(_table([
+        ["Citas", "Total", "Completadas", "Canceladas", "Pendientes", "Perdidas"],
+        ["", appts["total"], appts["completed"], appts["cancelled"], appts["pending"], appts["missed"]],
+    ], [width * 0.25] + [width * 0.15] * 5))
+    story.append(Spacer(1, 0.2 * cm))
+    story.append(para(
+        f"Recordatorios: {report['completed_reminders']} completados de {report['total_reminders']}"
+    ))
+    story.append(Spacer(1, 0.4 * cm))
+
+    # Equipo de cuidado
+    team = report["care_team_activity"]
+    if team:
+        story.append(para("Equipo de cuidado", h2))
+        rows = [["Miembro", "Rol", "Acciones", "Última actividad"]]
+        rows += [
+            [_latin(m["user_name"]), _latin(m["role"]), m["actions_count"], (m["last_activity"] or "-")[:16].replace("T", " ")]
+            for m in team
+        ]
+        story.append(_table(rows, [width * 0.35, width * 0.2, width * 0.15, width * 0.3], numeric_from=2))
+        story.append(Spacer(1, 0.4 * cm))
+
+    # Observaciones
+    if report["insights"]:
+        story.append(para("Observaciones", h2))
+        for insight in report["insights"]:
+            story.append(para(f"• {_latin(insight)}"))
+
+    try:
+        doc.build(story)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return doc.page
+
+
+class RendererRestarted(RuntimeError):
+    """El pool se reinició con este render en curso (otro render se canceló a mitad)."""
+
+
+class ReportRenderer:
+    """
+    Pool de procesos (multiprocessing.Pool) para render_report_pdf, creado en el primer uso.
+    Se usa Pool y no ProcessPoolExecutor porque expone terminate(): es la única forma
+    pública de cortar un render en curso.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._pool: Optional[Pool] = None
+        self._pending: Set[asyncio.Future] = set()
+
+    def _get_pool(self) -> Pool:
+        if self._pool is None:
+            self._pool = multiprocessing.get_context().Pool(processes=self.workers)
+        return self._pool
+
+    async def render(self, report: Dict[str, Any], path: str) -> int:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def deliver(setter, value):
+            # Corre en el hilo de resultados del Pool: se pasa al event loop
+            try:
+                loop.call_soon_threadsafe(lambda: future.done() or setter(value))
+            except RuntimeError:
+                pass  # loop ya cerrado (apagado)
+
+        self._get_pool().apply_async(
+            render_report_pdf,
+            (report, path),
+            callback=lambda pages: deliver(future.set_result, pages),
+            error_callback=lambda exc: deliver(future.set_exception, exc),
+        )
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            # Timeout o apagado con el render en curso: se terminan los procesos para que no
+            # siga ocupando un slot ni escriba después del reintento
+            logger.warning("⚠️  Render de %s cancelado en curso; se reinicia el pool de PDF", path)
+            self._terminate(RendererRestarted(f"Pool de PDF reiniciado al cancelar {path}"))
+            raise
+
+    def _terminate(self, error: Exception):
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.terminate()
+        # Los renders que corrían en esos procesos no van a devolver nada: fallan y su job se reintenta
+        for future in list(self._pending):
+            if not future.done():
+                future.set_exception(error)
+
+    def shutdown(self):
+        self._terminate(RendererRestarted("Pool de PDF apagado"))
+
+
+report_renderer = ReportRenderer(workers=settings.REPORT_RENDER_PROCESSES)
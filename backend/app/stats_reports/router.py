@@ -1,23 +1,29 @@
 # app/stats_reports/router.py
 from datetime import datetime, timezone, date
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 import os
 from typing import Optional
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 # from app.core.deps import require_senior_access, require_senior_edit
 from app.core.config import settings
+from app.core.compression import precompressed_variant
+from app.core.cache import response_cache, senior_tags
 from app.stats_reports.schemas import StatsResponse, ReportCreate, ReportPublic, SeniorHealthReport, GlobalStatsResponse
-from app.stats_reports.service import compute_stats, create_report_job, get_report_job, finalize_report_pdf
+from app.stats_reports.service import compute_stats, create_report_job, get_report_job
+from app.stats_reports.worker import notify_new_job
 from app.stats_reports.advanced_service import generate_senior_health_report, get_global_stats
 from app.stats_reports.models import ReportStatus
+from app.meds.adherence import STATUS_COLUMNS, intake_counts_subquery, status_sums
 from app.meds.models import Medication
 from app.appointments.models import Appointment
 from app.reminders.models import Reminder, ReminderStatus
 from app.audit.models import AuditLog
+from app.auth.models import User
+from app.seniors.models import CareTeam
 
 router = APIRouter()
 
@@ -32,6 +38,17 @@ async def dashboard_stats(
     Si se proporciona senior_id, devuelve estadísticas de ese senior.
     Si no, devuelve estadísticas globales.
     """
+    kinds = ("meds", "appointments", "reminders")
+    if senior_id:
+        key, tags = f"dashboard:senior:{senior_id}", senior_tags(senior_id, *kinds)
+    else:
+        key, tags = "dashboard:global", list(kinds)
+    return await response_cache.json(
+        key, settings.CACHE_TTL_DASHBOARD, tags, lambda: _dashboard_payload(db, senior_id)
+    )
+
+
+async def _dashboard_payload(db: AsyncSession, senior_id: Optional[int]) -> dict:
     # Total de medicamentos activos
     med_query = select(func.count(Medication.id))
     if senior_id:
@@ -99,7 +116,7 @@ async def stats_endpoint(
     senior_id: int,
     from_dt: datetime,
     to_dt: datetime,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     # _=Depends(require_senior_access),  # Autenticación deshabilitada temporalmente
 ):
     stats = await compute_stats(db, senior_id, from_dt, to_dt)
@@ -111,20 +128,20 @@ async def stats_endpoint(
     }
 
 
-@router.post("/seniors/{senior_id}/reports", response_model=ReportPublic)
+@router.post("/seniors/{senior_id}/reports", response_model=ReportPublic, status_code=202)
 async def create_report_endpoint(
     senior_id: int,
     payload: ReportCreate,
     db: AsyncSession = Depends(get_db),
     # _=Depends(require_senior_edit),  # Autenticación deshabilitada temporalmente
 ):
+    """
+    Encola el reporte y responde enseguida con el job PENDING. Lo genera un worker de la
+    cola (app/stats_reports/worker.py); consultar GET /reports/{id} hasta READY o FAILED.
+    """
     job = await create_report_job(db, senior_id, payload.range_start, payload.range_end)
-
-    # MVP: finaliza en el acto (luego será un job async real)
-    await finalize_report_pdf(db, job)
-
     await db.commit()
-    await db.refresh(job)
+    notify_new_job()
     return job
 
 
@@ -142,6 +159,7 @@ async def get_report_endpoint(
 @router.get("/reports/{report_id}/download")
 async def download_report(
     report_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
     job = await get_report_job(db, report_id)
@@ -149,9 +167,23 @@ async def download_report(
         raise HTTPException(status_code=404, detail="Report not found")
     if job.status != ReportStatus.READY:
         raise HTTPException(status_code=400, detail=f"Report not ready: {job.status}")
+    pdf_path = os.path.join(settings.REPORTS_DIR, f"report_{job.id}.pdf")
+    if os.path.exists(pdf_path):
+        return FileResponse(pdf_path, media_type="application/pdf", filename=f"report_{job.id}.pdf")
+
+    # Reportes generados antes del PDF (HTML, con sus variantes .gz/.br)
     html_path = os.path.join(settings.REPORTS_DIR, f"report_{job.id}.html")
     if not os.path.exists(html_path):
         raise HTTPException(status_code=404, detail="Report file not found on disk")
+    variant = precompressed_variant(html_path, request.headers.get("accept-encoding", ""))
+    if variant:
+        path, encoding = variant
+        return FileResponse(
+            path,
+            media_type="text/html",
+            filename=f"report_{job.id}.html",
+            headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"},
+        )
     return FileResponse(html_path, media_type="text/html", filename=f"report_{job.id}.html")
 
 
@@ -162,7 +194,7 @@ async def get_senior_health_report(
     senior_id: int,
     period_start: date = Query(..., description="Fecha de inicio del período"),
     period_end: date = Query(..., description="Fecha de fin del período"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Genera un reporte completo de salud para un adulto mayor específico.
@@ -186,9 +218,15 @@ async def get_global_statistics(
     Incluye totales por tipo de usuario, adherencia promedio,
     y listas de seniors destacados y que requieren atención.
     """
-    try:
+    async def load():
         stats = await get_global_stats(db)
-        return stats
+        return GlobalStatsResponse.model_validate(stats).model_dump(mode="json")
+
+    try:
+        return await response_cache.json(
+            "global-stats", settings.CACHE_TTL_GLOBAL_STATS,
+            ["meds", "appointments", "reminders", "seniors", "users"], load,
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching global stats: {str(e)}")
 
@@ -203,26 +241,28 @@ async def get_senior_quick_stats(
     Obtiene estadísticas rápidas para un senior (últimos N días).
     Útil para dashboards y vistas rápidas.
     """
+    return await response_cache.json(
+        f"quick-stats:{senior_id}:{days}",
+        settings.CACHE_TTL_QUICK_STATS,
+        senior_tags(senior_id, "meds", "appointments", "reminders"),
+        lambda: _senior_quick_stats(db, senior_id, days),
+    )
+
+
+async def _senior_quick_stats(db: AsyncSession, senior_id: int, days: int) -> dict:
     from datetime import timedelta
-    from app.meds.models import IntakeLog, IntakeStatus
+    from app.meds.models import IntakeStatus
     from app.appointments.models import Appointment
     from app.reminders.models import Reminder, ReminderStatus
     
     end_date = datetime.now(timezone.utc)
     start_date = end_date - timedelta(days=days)
     
-    # Medicamentos
-    result = await db.execute(
-        select(IntakeLog.status, func.count(IntakeLog.id))
-        .where(
-            IntakeLog.senior_id == senior_id,
-            IntakeLog.scheduled_at >= start_date,
-            IntakeLog.scheduled_at <= end_date
-        )
-        .group_by(IntakeLog.status)
-    )
-    med_counts = {status.value: cnt for status, cnt in result.all()}
-    taken = med_counts.get(IntakeStatus.TAKEN.value, 0)
+    # Medicamentos (rollup diario + bordes del rango)
+    counts = intake_counts_subquery("senior_id", start_date, end_date, senior_id=senior_id)
+    result = await db.execute(select(*status_sums(counts)))
+    med_counts = {column: int(total) for column, total in result.one()._mapping.items()}
+    taken = med_counts[STATUS_COLUMNS[IntakeStatus.TAKEN]]
     total_meds = sum(med_counts.values())
     adherence = (taken / total_meds * 100) if total_meds > 0 else 0.0
     
@@ -266,7 +306,7 @@ async def get_senior_quick_stats(
 async def get_care_team_member_performance(
     user_id: int,
     days: int = Query(30, description="Número de días hacia atrás para analizar"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Analiza el desempeño de un miembro del equipo de cuidado.
@@ -289,7 +329,7 @@ async def get_care_team_member_performance(
     result = await db.execute(
         select(func.count(AuditLog.id))
         .where(
-            AuditLog.user_id == user_id,
+            AuditLog.actor_user_id == user_id,
             AuditLog.created_at >= start_date,
             AuditLog.created_at <= end_date
         )
@@ -309,7 +349,7 @@ async def get_care_team_member_performance(
     # Última actividad
     result = await db.execute(
         select(AuditLog.created_at, AuditLog.action)
-        .where(AuditLog.user_id == user_id)
+        .where(AuditLog.actor_user_id == user_id)
         .order_by(AuditLog.created_at.desc())
         .limit(1)
     )
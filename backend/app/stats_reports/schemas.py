@@ -30,6 +30,11 @@ class ReportPublic(BaseModel):
     status: ReportStatus
     file_url: Optional[str] = None
     error: Optional[str] = None
+    attempts: int = 0
+    next_attempt_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_ms: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -1,24 +1,56 @@
 # app/stats_reports/service.py
 import os
-from datetime import datetime, date, timezone
+from collections import defaultdict
+from datetime import datetime, date
+from typing import Dict, List
 
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.meds.models import IntakeLog, IntakeStatus
+from app.meds.adherence import STATUS_COLUMNS, intake_counts_subquery, status_sums
+from app.meds.models import IntakeStatus, Medication
 from app.stats_reports.models import ReportJob, ReportStatus
 from app.core.config import settings
+from app.stats_reports.pdf import report_renderer
 
 
-async def compute_stats(db: AsyncSession, senior_id: int, from_dt: datetime, to_dt: datetime):
+async def medication_intake_counts(db: AsyncSession, senior_id: int, from_dt: datetime, to_dt: datetime) -> List[dict]:
+    """
+    Tomas del rango por medicamento y estado en una sola consulta (rollup daily_adherence
+    para los días completos + intake_logs para los bordes, ver app/meds/adherence.py).
+    Incluye los medicamentos sin tomas. Devuelve [{"medication_id", "name", "counts": {estado: n}}]
+    ordenado por nombre.
+    """
+    counts = intake_counts_subquery("medication_id", from_dt, to_dt, senior_id=senior_id)
     q = (
-        select(IntakeLog.status, func.count(IntakeLog.id))
-        .where(IntakeLog.senior_id == senior_id)
-        .where(IntakeLog.scheduled_at >= from_dt, IntakeLog.scheduled_at <= to_dt)
-        .group_by(IntakeLog.status)
+        select(Medication.id, Medication.name, *status_sums(counts))
+        .select_from(Medication)
+        .outerjoin(counts, counts.c.group_key == Medication.id)
+        .where(Medication.senior_id == senior_id)
+        .group_by(Medication.id, Medication.name)
+        .order_by(Medication.name, Medication.id)
     )
     res = await db.execute(q)
-    counts = {status.value: cnt for status, cnt in res.all()}
+
+    medications = []
+    for medication_id, name, *sums in res.all():
+        medications.append({
+            "medication_id": medication_id,
+            "name": name,
+            "counts": {
+                status.value: int(total)
+                for status, total in zip(STATUS_COLUMNS, sums)
+                if total
+            },
+        })
+    return medications
+
+
+async def compute_stats(db: AsyncSession, senior_id: int, from_dt: datetime, to_dt: datetime):
+    counts: Dict[str, int] = defaultdict(int)
+    for medication in await medication_intake_counts(db, senior_id, from_dt, to_dt):
+        for status, cnt in medication["counts"].items():
+            counts[status] += cnt
 
     taken = counts.get(IntakeStatus.TAKEN.value, 0)
     missed = counts.get(IntakeStatus.MISSED.value, 0)
@@ -58,85 +90,25 @@ async def finalize_report_dummy(db: AsyncSession, job: ReportJob):
 
 
 async def finalize_report_pdf(db: AsyncSession, job: ReportJob):
-    """Genera un reporte HTML real y lo guarda en disco."""
-    try:
-        # Crea directorio si no existe
-        os.makedirs(settings.REPORTS_DIR, exist_ok=True)
-        html_path = os.path.join(settings.REPORTS_DIR, f"report_{job.id}.html")
-
-        # Calcula stats con fechas completas
-        from_dt = datetime(job.range_start.year, job.range_start.month, job.range_start.day, tzinfo=timezone.utc)
-        to_dt = datetime(job.range_end.year, job.range_end.month, job.range_end.day, 23, 59, 59, tzinfo=timezone.utc)
-        stats = await compute_stats(db, job.senior_id, from_dt, to_dt)
-
-        # Genera HTML
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <title>Reporte de Cuidado</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 40px; }}
-                h1 {{ color: #333; }}
-                h2 {{ color: #666; margin-top: 30px; }}
-                table {{ border-collapse: collapse; width: 100%; }}
-                th, td {{ border: 1px solid #ddd; padding: 12px; text-align: left; }}
-                th {{ background-color: #f2f2f2; }}
-                .adherence {{ font-weight: bold; color: #0066cc; }}
-            </style>
-        </head>
-        <body>
-            <h1>Reporte de Cuidado</h1>
-            <p><strong>Senior ID:</strong> {job.senior_id}</p>
-            <p><strong>Rango:</strong> {job.range_start} a {job.range_end}</p>
-            
-            <h2>Estadísticas de Medicación</h2>
-            <table>
-                <tr>
-                    <th>Métrica</th>
-                    <th>Valor</th>
-                </tr>
-                <tr>
-                    <td>Total de tomas</td>
-                    <td>{stats['total_intakes']}</td>
-                </tr>
-                <tr>
-                    <td>Tomadas</td>
-                    <td>{stats['taken']}</td>
-                </tr>
-                <tr>
-                    <td>Tardías</td>
-                    <td>{stats['late']}</td>
-                </tr>
-                <tr>
-                    <td>Omitidas</td>
-                    <td>{stats['missed']}</td>
-                </tr>
-                <tr>
-                    <td>Saltadas</td>
-                    <td>{stats['skipped']}</td>
-                </tr>
-                <tr>
-                    <td class="adherence">Adherencia</td>
-                    <td class="adherence">{stats['adherence_rate']:.2%}</td>
-                </tr>
-            </table>
-        </body>
-        </html>
-        """
-
-        # Guarda HTML
-        with open(html_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-
-        # Actualiza job
-        job.status = ReportStatus.READY
-        job.file_url = f"/api/v1/reports/{job.id}/download"
-        job.error = None
-        await db.flush()
-
-    except Exception as e:
-        job.status = ReportStatus.FAILED
-        job.error = str(e)
-        await db.flush()
\ No newline at end of file
+    """
+    Genera el reporte de salud del rango, lo renderiza a PDF en el pool de procesos
+    (app/stats_reports/pdf.py) y deja el job READY.
+    Lo ejecuta un worker de la cola (app/stats_reports/worker.py); los errores se propagan
+    para que el worker decida si reintentar.
+    """
+    # Import diferido: advanced_service importa este módulo
+    from app.stats_reports.advanced_service import generate_senior_health_report
+
+    report = await generate_senior_health_report(db, job.senior_id, job.range_start, job.range_end)
+
+    # Crea directorio si no existe
+    os.makedirs(settings.REPORTS_DIR, exist_ok=True)
+    pdf_path = os.path.join(settings.REPORTS_DIR, f"report_{job.id}.pdf")
+    # El PDF ya sale comprimido (streams deflate): no se precomprime como el HTML
+    await report_renderer.render(report.model_dump(mode="json"), pdf_path)
+
+    # Actualiza job
+    job.status = ReportStatus.READY
+    job.file_url = f"/api/v1/reports/{job.id}/download"
+    job.error = None
+    await db.flush()
@@ -0,0 +1,234 @@
+# app/stats_reports/worker.py
+"""
+Cola de generación de reportes sobre la tabla report_jobs.
+
+- create_report_endpoint solo inserta el job (PENDING) y responde; el cliente consulta
+  GET /reports/{id} hasta que queda READY o FAILED.
+- Cada worker toma el próximo job con claim_next_job(): en MySQL/PostgreSQL con
+  SELECT ... FOR UPDATE SKIP LOCKED (los workers no se bloquean entre sí); en SQLite, que
+  no lo tiene, el UPDATE repite la condición y solo un worker lo modifica.
+- Un job tomado queda RUNNING con un lease (locked_until). Si el worker muere sin
+  terminarlo, al vencer el lease otro worker lo retoma; si ya usó REPORT_MAX_ATTEMPTS
+  intentos queda FAILED (un job que tira abajo al worker no se reintenta para siempre).
+- Errores y timeouts se reintentan con backoff exponencial hasta REPORT_MAX_ATTEMPTS;
+  después el job queda FAILED con el último error.
+- Los workers corren dentro de la API (REPORT_WORKERS) o en un proceso aparte:
+      python -m app.stats_reports.worker --workers 4
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import report_generation_seconds, report_queue_wait_seconds
+from app.stats_reports.models import ReportJob, ReportStatus
+from app.stats_reports.service import finalize_report_pdf
+
+logger = logging.getLogger(__name__)
+
+# Margen del lease sobre el timeout del job (commit final, reloj entre procesos)
+_LEASE_MARGIN = timedelta(seconds=60)
+_CLAIM_RETRIES = 3
+
+# Despierta a los workers de este proceso al encolar; los de otros procesos hacen polling
+_wakeup = asyncio.Event()
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def notify_new_job():
+    _wakeup.set()
+
+
+def _claimable(now: datetime):
+    return or_(
+        and_(
+            ReportJob.status == ReportStatus.PENDING,
+            or_(ReportJob.next_attempt_at.is_(None), ReportJob.next_attempt_at <= now),
+        ),
+        and_(
+            ReportJob.status == ReportStatus.RUNNING,
+            ReportJob.locked_until < now,
+            ReportJob.attempts < settings.REPORT_MAX_ATTEMPTS,
+        ),
+    )
+
+
+async def fail_exhausted_leases(db: AsyncSession, now: datetime) -> int:
+    """Marca FAILED los jobs con el lease vencido que ya no tienen intentos. No hace commit."""
+    res = await db.execute(
+        update(ReportJob)
+        .where(
+            ReportJob.status == ReportStatus.RUNNING,
+            ReportJob.locked_until < now,
+            ReportJob.attempts >= settings.REPORT_MAX_ATTEMPTS,
+        )
+        .values(
+            status=ReportStatus.FAILED,
+            error=f"Lease vencido sin terminar tras {settings.REPORT_MAX_ATTEMPTS} intentos",
+            locked_until=None,
+            finished_at=now,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return max(res.rowcount or 0, 0)
+
+
+async def claim_next_job(db: AsyncSession) -> int | None:
+    """Marca RUNNING el próximo job disponible y devuelve su id (None si no hay). Hace commit."""
+    skip_locked = db.get_bind().dialect.name != "sqlite"
+    failed = await fail_exhausted_leases(db, utcnow())
+    if failed:
+        await db.commit()
+        logger.warning("⚠️  %s reporte(s) FAILED por lease vencido sin intentos restantes", failed)
+    for _ in range(_CLAIM_RETRIES):
+        now = utcnow()
+        stmt = select(ReportJob.id).where(_claimable(now)).order_by(ReportJob.id).limit(1)
+        if skip_locked:
+            stmt = stmt.with_for_update(skip_locked=True)
+        job_id = (await db.execute(stmt)).scalar()
+        if job_id is None:
+            await db.rollback()
+            return None
+
+        res = await db.execute(
+            update(ReportJob)
+            .where(ReportJob.id == job_id, _claimable(now))
+            .values(
+                status=ReportStatus.RUNNING,
+                attempts=ReportJob.attempts + 1,
+                started_at=now,
+                locked_until=now + timedelta(seconds=settings.REPORT_JOB_TIMEOUT_SECONDS) + _LEASE_MARGIN,
+                finished_at=None,
+                duration_ms=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        if res.rowcount == 1:
+            return job_id
+        # SQLite: otro worker lo tomó entre el SELECT y el UPDATE; probar con el siguiente
+    return None
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=settings.REPORT_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0))
+
+
+async def _release(job_id: int):
+    """Devuelve a la cola un job interrumpido por el apagado, sin contar el intento."""
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(ReportJob)
+                .where(ReportJob.id == job_id, ReportJob.status == ReportStatus.RUNNING)
+                .values(status=ReportStatus.PENDING, attempts=ReportJob.attempts - 1, locked_until=None)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+    except Exception as e:
+        # Si no se pudo, el lease vencido lo devuelve a la cola igual
+        logger.warning("⚠️  No se pudo liberar el reporte %s: %s", job_id, type(e).__name__)
+
+
+async def run_job(job_id: int) -> ReportStatus | None:
+    """Genera un job ya tomado y registra el resultado (READY, reintento o FAILED). None si ya no existe."""
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        job = await db.get(ReportJob, job_id)
+        if job is None:
+            # Borrado entre el claim y la ejecución
+            logger.warning("⚠️  Reporte %s ya no existe; se descarta", job_id)
+            return None
+        if job.attempts == 1:
+            report_queue_wait_seconds.observe(max((job.started_at - job.created_at).total_seconds(), 0.0))
+
+        outcome = "ready"
+        try:
+            await asyncio.wait_for(finalize_report_pdf(db, job), settings.REPORT_JOB_TIMEOUT_SECONDS)
+        except asyncio.CancelledError:
+            await db.rollback()
+            await _release(job_id)
+            raise
+        except Exception as e:
+            await db.rollback()
+            await db.refresh(job)
+            if isinstance(e, asyncio.TimeoutError):
+                job.error = f"Timeout tras {settings.REPORT_JOB_TIMEOUT_SECONDS}s"
+            else:
+                job.error = f"{type(e).__name__}: {e}"[:500]
+            if job.attempts < settings.REPORT_MAX_ATTEMPTS:
+                outcome = "retry"
+                job.status = ReportStatus.PENDING
+                job.next_attempt_at = utcnow() + _retry_delay(job.attempts)
+            else:
+                outcome = "failed"
+                job.status = ReportStatus.FAILED
+            logger.warning("⚠️  Reporte %s falló (intento %s, %s): %s", job_id, job.attempts, outcome, job.error)
+
+        elapsed = time.perf_counter() - started
+        job.locked_until = None
+        # finished_at solo en estados finales: un reintento vuelve a PENDING sin terminar
+        job.finished_at = utcnow() if outcome != "retry" else None
+        job.duration_ms = int(elapsed * 1000)
+        await db.commit()
+
+    report_generation_seconds.observe(elapsed, outcome)
+    return job.status
+
+
+async def report_worker_loop(worker_id: int):
+    logger.info("✅ Worker de reportes %s iniciado", worker_id)
+    while True:
+        _wakeup.clear()
+        try:
+            async with AsyncSessionLocal() as db:
+                job_id = await claim_next_job(db)
+            if job_id is not None:
+                await run_job(job_id)
+                continue
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception("❌ Error en el worker de reportes %s: %s", worker_id, type(e).__name__)
+
+        try:
+            await asyncio.wait_for(_wakeup.wait(), settings.REPORT_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _cli(workers: int) -> int:
+    # Registrar todos los modelos (relaciones entre tablas)
+    import app.main  # noqa: F401
+    from app.core.database import engine
+    from app.core.logging_config import shutdown_logging
+
+    tasks = [asyncio.create_task(report_worker_loop(i)) for i in range(workers)]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await engine.dispose()
+        shutdown_logging()
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Workers de la cola de reportes")
+    parser.add_argument("--workers", type=int, default=max(settings.REPORT_WORKERS, 1))
+    try:
+        sys.exit(asyncio.run(_cli(parser.parse_args().workers)))
+    except KeyboardInterrupt:
+        pass
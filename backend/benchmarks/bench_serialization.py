@@ -0,0 +1,91 @@
+# benchmarks/bench_serialization.py
+"""
+Costo por fila de serializar listas grandes de filas ORM.
+
+Compara el camino por defecto de FastAPI (validar cada fila con el *Public vía
+from_attributes + dump a JSON + json stdlib) con los serializadores confiables
+(serialize_*) + orjson que usan los endpoints de listado.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_serialization --rows 10000
+"""
+import argparse
+import json
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import orjson
+from pydantic import TypeAdapter
+
+# Solo modelos y schemas: no hace falta base de datos ni Settings
+from app.meds.models import IntakeLog, IntakeStatus, Medication, MedicationSchedule
+from app.meds.schemas import MedicationPublic, IntakeLogPublic, serialize_medication, serialize_intake_log
+
+
+def build_medications(n: int) -> list[Medication]:
+    rows = []
+    for i in range(n):
+        med = Medication(id=i + 1, senior_id=(i % 500) + 1, name=f"Medicamento {i}", dose="500", unit="mg", notes=None)
+        med.schedules = [
+            MedicationSchedule(
+                id=i * 2 + j + 1, medication_id=i + 1, start_date=date(2025, 1, 1), end_date=None,
+                hours=[8, 14, 20], days_of_week=[0, 1, 2, 3, 4],
+            )
+            for j in range(2)
+        ]
+        rows.append(med)
+    return rows
+
+
+def build_intakes(n: int) -> list[IntakeLog]:
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [
+        IntakeLog(
+            id=i + 1, senior_id=(i % 500) + 1, medication_id=(i % 2000) + 1,
+            scheduled_at=base + timedelta(hours=i), taken_at=base + timedelta(hours=i, minutes=5),
+            status=IntakeStatus.TAKEN, actor_user_id=1,
+        )
+        for i in range(n)
+    ]
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench(label: str, rows: list, schema, serializer, repeat: int):
+    adapter = TypeAdapter(list[schema])
+
+    def pydantic_path():
+        validated = adapter.validate_python(rows, from_attributes=True)
+        json.dumps(adapter.dump_python(validated, mode="json")).encode("utf-8")
+
+    def trusted_path():
+        orjson.dumps([serializer(r) for r in rows])
+
+    slow = _best_of(pydantic_path, repeat)
+    fast = _best_of(trusted_path, repeat)
+    n = len(rows)
+    print(f"{label} ({n} filas)")
+    print(f"  pydantic + json : {slow * 1000:8.1f} ms  ({slow / n * 1e6:6.2f} µs/fila)")
+    print(f"  serialize + orjson: {fast * 1000:8.1f} ms  ({fast / n * 1e6:6.2f} µs/fila)")
+    print(f"  mejora: x{slow / fast:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    bench("Medicamentos con horarios", build_medications(args.rows), MedicationPublic, serialize_medication, args.repeat)
+    bench("Tomas (intake logs)", build_intakes(args.rows), IntakeLogPublic, serialize_intake_log, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
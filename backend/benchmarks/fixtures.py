@@ -0,0 +1,72 @@
+# benchmarks/fixtures.py
+"""
+Base SQLite embebida para benchmarks y pruebas sin servidor MySQL.
+
+    from benchmarks.fixtures import use_sqlite, sqlite_app
+
+    use_sqlite("bench.db")          # antes de importar scripts.datagen o cualquier app.*
+    from scripts.datagen import DatagenConfig
+
+    async with sqlite_app("bench.db", seed_config=DatagenConfig(seniors=50)) as (app, result):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            ...
+
+Sin path se usa una base en memoria: es la más rápida pero tiene una sola conexión
+compartida, así que solo sirve para pruebas secuenciales. Para carga concurrente usar
+un archivo (WAL permite lecturas en paralelo con un escritor); sqlite_app lo recrea vacío.
+"""
+import os
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+MEMORY_URL = "sqlite+aiosqlite:///:memory:"
+
+
+def sqlite_url(path: str | Path | None = None) -> str:
+    if path is None:
+        return MEMORY_URL
+    return f"sqlite+aiosqlite:///{Path(path).resolve()}"
+
+
+def use_sqlite(path: str | Path | None = None) -> str:
+    """
+    Configura las variables de entorno para que app.* use SQLite. Tiene que llamarse antes
+    del primer import de app.core.config (la configuración y el engine se crean al importar).
+    """
+    url = sqlite_url(path)
+    os.environ["DATABASE_URL"] = url
+    # Sin réplicas ni Redis aunque el .env local los tenga
+    os.environ["DATABASE_REPLICA_URLS"] = ""
+    os.environ["CACHE_BACKEND"] = "memory"
+    # Sin workers de reportes en el proceso: con :memory: compartirían la única conexión
+    os.environ.setdefault("REPORT_WORKERS", "0")
+    os.environ.setdefault("JWT_SECRET_KEY", "bench-only-secret")
+    # Con DEBUG=True el root queda en DEBUG y aiosqlite loguea cada operación: se mediría el logging
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    return url
+
+
+@asynccontextmanager
+async def sqlite_app(path: str | Path | None = None, seed_config=None):
+    """
+    Levanta la app sobre SQLite: ejecuta los eventos de startup (migraciones y usuarios por
+    defecto), genera datos con scripts.datagen si se pasa seed_config y al salir ejecuta
+    shutdown y cierra el engine. Devuelve (app, DatagenResult | None).
+    """
+    if path is not None:
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{Path(path)}{suffix}").unlink(missing_ok=True)
+    use_sqlite(path)
+
+    from app.core.database import engine
+    from app.main import app
+    from scripts.datagen import generate
+
+    # httpx.ASGITransport no envía eventos lifespan: se ejecutan aquí (lifespan_context
+    # corre los handlers de startup/shutdown en Starlette viejo y nuevo)
+    try:
+        async with app.router.lifespan_context(app):
+            result = await generate(engine, seed_config) if seed_config is not None else None
+            yield app, result
+    finally:
+        await engine.dispose()
@@ -0,0 +1,266 @@
+# benchmarks/load_test.py
+"""
+Prueba de carga HTTP contra una API en marcha, con los datos de benchmarks/seed.py.
+
+Cada escenario se ejecuta por separado durante --duration segundos con --concurrency
+clientes concurrentes (los primeros --warmup segundos no se miden) y se reporta
+req/s, errores y latencias p50/p95/p99. Las elecciones aleatorias (senior, fecha,
+conversación) salen de --seed, así dos corridas piden la misma secuencia de recursos.
+
+Uso (desde backend/, con la API levantada):
+    pip install -r benchmarks/requirements.txt
+    python -m benchmarks.seed --seniors 1000 --days 90
+    python -m benchmarks.load_test --concurrency 32 --duration 20 --json-out run1.json
+    python -m benchmarks.load_test --concurrency 32 --duration 20 --compare run1.json
+
+Sin MySQL ni servidor (la app corre en el mismo proceso sobre SQLite, datos generados al vuelo):
+    python -m benchmarks.load_test --sqlite bench.db --sqlite-seniors 200 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import subprocess
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+API = "/api/v1"
+# Lo escribe benchmarks/seed.py (no se importa para no requerir la app ni la BD aquí)
+MANIFEST_PATH = Path(__file__).with_name("seed_manifest.json")
+
+
+class Context:
+    def __init__(self, manifest: dict, rng: random.Random):
+        self.manifest = manifest
+        self.rng = rng
+        self.first_day = date.fromisoformat(manifest["first_day"])
+        self.last_day = date.fromisoformat(manifest["last_day"])
+        self.tokens: List[str] = []
+
+    def senior_id(self) -> int:
+        return self.rng.randint(*self.manifest["senior_ids"])
+
+    def conversation_id(self) -> int:
+        return self.rng.randint(*self.manifest["conversation_ids"])
+
+    def day(self) -> date:
+        return self.first_day + timedelta(days=self.rng.randrange((self.last_day - self.first_day).days + 1))
+
+    def auth(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.rng.choice(self.tokens)}"}
+
+
+Scenario = Callable[[httpx.AsyncClient, Context], Awaitable[httpx.Response]]
+
+
+async def login(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    email = ctx.rng.choice(ctx.manifest["users"])
+    return await client.post(f"{API}/auth/login", json={"email": email, "password": ctx.manifest["password"]})
+
+
+async def medications(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    return await client.get(f"{API}/meds/seniors/{ctx.senior_id()}/medications")
+
+
+async def reminders_by_date(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    return await client.get(
+        f"{API}/reminders/seniors/{ctx.senior_id()}/reminders", params={"date": ctx.day().isoformat()}
+    )
+
+
+async def health_report(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    end = ctx.day()
+    return await client.get(
+        f"{API}/stats/seniors/{ctx.senior_id()}/health-report",
+        params={"period_start": (end - timedelta(days=30)).isoformat(), "period_end": end.isoformat()},
+    )
+
+
+async def global_stats(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    return await client.get(f"{API}/stats/global-stats")
+
+
+async def chat_send(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    return await client.post(
+        f"{API}/chat/conversations/{ctx.conversation_id()}/messages",
+        json={"content": f"bench {ctx.rng.randrange(10**6)}"},
+        headers=ctx.auth(),
+    )
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "login": login,
+    "medications": medications,
+    "reminders_by_date": reminders_by_date,
+    "health_report": health_report,
+    "global_stats": global_stats,
+    "chat_send": chat_send,
+}
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def run_scenario(client: httpx.AsyncClient, ctx: Context, scenario: Scenario, args) -> dict:
+    latencies: List[float] = []
+    errors = 0
+    measure_from = time.perf_counter() + args.warmup
+    deadline = measure_from + args.duration
+
+    async def worker():
+        nonlocal errors
+        while True:
+            start = time.perf_counter()
+            if start >= deadline:
+                return
+            try:
+                response = await scenario(client, ctx)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            end = time.perf_counter()
+            if start >= measure_from:
+                latencies.append(end - start)
+                errors += failed
+
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / args.duration, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+    }
+
+
+async def prepare_tokens(client: httpx.AsyncClient, ctx: Context, count: int):
+    for email in ctx.manifest["users"][:count]:
+        response = await client.post(
+            f"{API}/auth/login", json={"email": email, "password": ctx.manifest["password"]}
+        )
+        if response.status_code != 200:
+            raise SystemExit(f"Login de {email} falló ({response.status_code}): {response.text[:300]}")
+        ctx.tokens.append(response.json()["access_token"])
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(results: Dict[str, dict], baseline: Dict[str, dict] | None = None):
+    header = f"{'escenario':<20}{'req':>8}{'err':>6}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+    if baseline:
+        header += f"{'Δ req/s':>10}{'Δ p95':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        line = (
+            f"{name:<20}{r['requests']:>8}{r['errors']:>6}{r['rps']:>9}"
+            f"{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}{r['max_ms']:>10}"
+        )
+        base = (baseline or {}).get(name)
+        if base:
+            line += f"{_delta(r['rps'], base['rps']):>10}{_delta(r['p95_ms'], base['p95_ms']):>9}"
+        print(line)
+
+
+def _delta(current: float, previous: float) -> str:
+    if not previous:
+        return "-"
+    return f"{(current - previous) / previous * 100:+.1f}%"
+
+
+@asynccontextmanager
+async def open_client(args):
+    """Cliente HTTP y manifest: contra --base-url, o con --sqlite contra la app en este proceso."""
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    if not args.sqlite:
+        manifest = json.loads(Path(args.manifest).read_text(encoding="utf-8"))
+        async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+            yield client, manifest
+        return
+
+    # Las variables de entorno tienen que quedar puestas antes de importar app.*
+    from benchmarks.fixtures import sqlite_app, use_sqlite
+    use_sqlite(args.sqlite)
+    from benchmarks.seed import build_manifest
+    from scripts.datagen import DatagenConfig
+
+    config = DatagenConfig(seniors=args.sqlite_seniors, days=30, conversation_ratio=1.0, seed=args.seed)
+    async with sqlite_app(args.sqlite, seed_config=config) as (app, result):
+        # Una excepción de la app llega como 500 (se cuenta como error) en lugar de cortar la corrida
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://sqlite", timeout=args.timeout) as client:
+            yield client, build_manifest(config, result)
+
+
+async def main(args):
+    results: Dict[str, dict] = {}
+    async with open_client(args) as (client, manifest):
+        ctx = Context(manifest, random.Random(args.seed))
+        # Smoke: al menos un usuario generado tiene que poder loguearse (chat_send usa sus tokens)
+        count = min(args.concurrency, len(manifest["users"])) if "chat_send" in args.scenarios else 1
+        await prepare_tokens(client, ctx, count)
+        for name in args.scenarios:
+            print(f"→ {name} ({args.concurrency} clientes, {args.duration}s)")
+            results[name] = await run_scenario(client, ctx, SCENARIOS[name], args)
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))["results"]
+    print()
+    print_report(results, baseline)
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps({
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "git_revision": _git_revision(),
+            "base_url": f"sqlite:{args.sqlite}" if args.sqlite else args.base_url,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "seed": args.seed,
+            "results": results,
+        }, indent=2), encoding="utf-8")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga de la API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--manifest", default=str(MANIFEST_PATH))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=15.0, help="segundos medidos por escenario")
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--json-out", help="guarda los resultados para comparar corridas")
+    parser.add_argument("--compare", help="resultados JSON de una corrida anterior")
+    parser.add_argument(
+        "--sqlite", nargs="?", const="bench.db", metavar="PATH",
+        help="levanta la app en este proceso sobre un archivo SQLite nuevo (por defecto bench.db)",
+    )
+    parser.add_argument("--sqlite-seniors", type=int, default=200, help="seniors generados con --sqlite")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
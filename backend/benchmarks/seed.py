@@ -0,0 +1,80 @@
+# benchmarks/seed.py
+"""
+Carga una base local con volúmenes realistas para las pruebas de carga.
+
+Usa el generador de scripts/datagen.py con un perfil fijo (todos los seniors con
+conversación) y escribe benchmarks/seed_manifest.json con los ids y credenciales que
+usa load_test.py. Para otros volúmenes o distribuciones, usar scripts.datagen directamente.
+
+Uso (desde backend/, con DATABASE_URL apuntando a una base local):
+    python -m benchmarks.seed --seniors 1000 --days 90
+"""
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import app.main  # noqa: F401  (registra todos los modelos)
+from app.core.database import engine
+from app.core.logging_config import shutdown_logging
+from app.core.migrations import run_migrations
+from scripts.datagen import DatagenConfig, DatagenResult, Distribution, generate
+
+MANIFEST_PATH = Path(__file__).with_name("seed_manifest.json")
+
+
+def build_manifest(config: DatagenConfig, result: DatagenResult) -> dict:
+    return {
+        "seed": config.seed,
+        "password": config.password,
+        "users": result.caregiver_emails,
+        "doctor_email": result.doctor_emails[0],
+        "senior_ids": list(result.senior_ids or ()),
+        "conversation_ids": list(result.conversation_ids or ()),
+        "first_day": config.start.isoformat(),
+        "last_day": config.end.isoformat(),
+        "totals": result.totals,
+    }
+
+
+async def _main(args):
+    config = DatagenConfig(
+        seniors=args.seniors,
+        seniors_per_caregiver=args.seniors_per_caregiver,
+        meds_per_senior=Distribution(str(args.meds_per_senior)),
+        days=args.days,
+        conversation_ratio=1.0,
+        messages_per_conversation=Distribution(str(args.messages_per_conversation)),
+        seed=args.seed,
+        batch_size=args.batch_size,
+    )
+    await run_migrations()
+    started = time.perf_counter()
+    try:
+        result = await generate(engine, config)
+    finally:
+        await engine.dispose()
+
+    MANIFEST_PATH.write_text(json.dumps(build_manifest(config, result), indent=2), encoding="utf-8")
+    print(f"Datos generados en {time.perf_counter() - started:.1f}s")
+    for table, count in result.totals.items():
+        print(f"  {table:<22} {count:>10}")
+    print(f"Manifest: {MANIFEST_PATH}")
+    shutdown_logging()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Genera datos para las pruebas de carga")
+    parser.add_argument("--seniors", type=int, default=1000)
+    parser.add_argument("--seniors-per-caregiver", type=int, default=5)
+    parser.add_argument("--meds-per-senior", type=int, default=3)
+    parser.add_argument("--days", type=int, default=90, help="días de historial de tomas y recordatorios")
+    parser.add_argument("--messages-per-conversation", type=int, default=40)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(parse_args()))
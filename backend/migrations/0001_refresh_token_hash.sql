@@ -0,0 +1,11 @@
+-- Refresh tokens: guardar SHA-256 del JWT en lugar del texto completo.
+-- Los tokens existentes siguen siendo válidos: SHA2(token, 256) coincide con token_digest().
+ALTER TABLE refresh_tokens ADD COLUMN token_hash VARCHAR(64) NULL;
+UPDATE refresh_tokens SET token_hash = SHA2(token, 256);
+ALTER TABLE refresh_tokens
+    DROP INDEX uq_refresh_tokens_token,
+    DROP COLUMN token,
+    MODIFY token_hash VARCHAR(64) NOT NULL,
+    ADD UNIQUE INDEX uq_refresh_tokens_token_hash (token_hash),
+    ADD INDEX ix_refresh_tokens_expires_at (expires_at),
+    ADD INDEX ix_refresh_tokens_revoked (revoked);
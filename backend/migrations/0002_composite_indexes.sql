@@ -0,0 +1,18 @@
+-- Índices compuestos para las consultas más frecuentes (stats y listados).
+-- ALGORITHM=INPLACE, LOCK=NONE: InnoDB construye el índice sin bloquear escrituras.
+ALTER TABLE intake_logs
+    ADD INDEX ix_intake_logs_senior_scheduled (senior_id, scheduled_at),
+    ADD INDEX ix_intake_logs_med_scheduled_status (medication_id, scheduled_at, status),
+    ALGORITHM=INPLACE, LOCK=NONE;
+ALTER TABLE reminders
+    ADD INDEX ix_reminders_senior_status_scheduled (senior_id, status, scheduled_at),
+    ALGORITHM=INPLACE, LOCK=NONE;
+ALTER TABLE appointments
+    ADD INDEX ix_appointments_senior_starts (senior_id, starts_at),
+    ALGORITHM=INPLACE, LOCK=NONE;
+ALTER TABLE messages
+    ADD INDEX ix_messages_conversation_sent (conversation_id, sent_at),
+    ALGORITHM=INPLACE, LOCK=NONE;
+ALTER TABLE audit_logs
+    ADD INDEX ix_audit_logs_actor_created (actor_user_id, created_at),
+    ALGORITHM=INPLACE, LOCK=NONE;
@@ -0,0 +1,7 @@
+-- Contadores de versión por (scope, entidad) para ETags de los listados.
+CREATE TABLE IF NOT EXISTS entity_versions (
+    scope VARCHAR(32) NOT NULL,
+    entity_id BIGINT NOT NULL,
+    version INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (scope, entity_id)
+) ENGINE=InnoDB;
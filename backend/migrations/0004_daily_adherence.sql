@@ -0,0 +1,22 @@
+-- Rollup diario de adherencia por (senior, medicamento, día). Ver app/meds/adherence.py.
+CREATE TABLE IF NOT EXISTS daily_adherence (
+    senior_id INT NOT NULL,
+    medication_id INT NOT NULL,
+    local_day DATE NOT NULL,
+    taken INT NOT NULL DEFAULT 0,
+    late INT NOT NULL DEFAULT 0,
+    missed INT NOT NULL DEFAULT 0,
+    skipped INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (senior_id, medication_id, local_day),
+    KEY ix_daily_adherence_day (local_day),
+    CONSTRAINT fk_daily_adherence_senior FOREIGN KEY (senior_id) REFERENCES seniors (id),
+    CONSTRAINT fk_daily_adherence_medication FOREIGN KEY (medication_id) REFERENCES medications (id)
+) ENGINE=InnoDB;
+
+-- Carga inicial con días UTC (ADHERENCE_DAY_UTC_OFFSET_MINUTES=0). Con otro offset,
+-- correr después python -m scripts.backfill_adherence
+INSERT INTO daily_adherence (senior_id, medication_id, local_day, taken, late, missed, skipped)
+SELECT senior_id, medication_id, DATE(scheduled_at),
+       SUM(status = 'TAKEN'), SUM(status = 'LATE'), SUM(status = 'MISSED'), SUM(status = 'SKIPPED')
+FROM intake_logs
+GROUP BY senior_id, medication_id, DATE(scheduled_at);
@@ -0,0 +1,10 @@
+-- Cola de reportes: estado RUNNING, reintentos con backoff, lease del worker y tiempos por job.
+ALTER TABLE report_jobs
+    MODIFY status ENUM('PENDING', 'RUNNING', 'READY', 'FAILED') NOT NULL,
+    ADD COLUMN attempts INT NOT NULL DEFAULT 0,
+    ADD COLUMN next_attempt_at DATETIME NULL,
+    ADD COLUMN locked_until DATETIME NULL,
+    ADD COLUMN started_at DATETIME NULL,
+    ADD COLUMN finished_at DATETIME NULL,
+    ADD COLUMN duration_ms INT NULL,
+    ADD INDEX ix_report_jobs_status_next_attempt (status, next_attempt_at);
@@ -0,0 +1,8 @@
+-- messages.sent_at se guardaba con la hora local de Ecuador (UTC-5): chat/service usaba
+-- datetime.now(ECUADOR_TZ) y el driver descartaba el offset. Desde UTCDateTime todo se
+-- guarda y se lee en UTC, así que las filas existentes se pasan a UTC.
+-- Se aplica al iniciar, antes de atender requests: ninguna fila escrita en UTC llega a moverse
+-- (en un despliegue sin corte, detener antes las instancias con el código anterior).
+UPDATE messages
+SET sent_at = sent_at + INTERVAL 5 HOUR,
+    read_at = read_at + INTERVAL 5 HOUR;
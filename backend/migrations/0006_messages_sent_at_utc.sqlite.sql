@@ -0,0 +1 @@
+-- Las bases SQLite se crearon con UTCDateTime: sus mensajes ya están en UTC.
@@ -0,0 +1,55 @@
+# scripts/backfill_adherence.py
+"""
+Reconstruye el rollup daily_adherence desde intake_logs.
+
+Hace falta al activar el rollup sobre una base con historial cargado por fuera de la API,
+o después de cambiar ADHERENCE_DAY_UTC_OFFSET_MINUTES. Procesa lotes de --batch-size
+seniors, cada uno en su propia transacción (DELETE + INSERT ... SELECT agrupado), así que
+se puede correr con la API en marcha.
+
+Uso (desde backend/):
+    python -m scripts.backfill_adherence
+    python -m scripts.backfill_adherence --from-senior 1000 --to-senior 1999
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from sqlalchemy import func, select
+
+import app.main  # noqa: F401  (registra todos los modelos)
+from app.core.database import engine
+from app.core.logging_config import shutdown_logging
+from app.meds.adherence import rebuild_daily_adherence
+from app.seniors.models import SeniorProfile
+
+
+async def main(args) -> int:
+    started = time.perf_counter()
+    try:
+        async with engine.connect() as conn:
+            first, last = (await conn.execute(select(func.min(SeniorProfile.id), func.max(SeniorProfile.id)))).one()
+        if first is None:
+            print("No hay seniors")
+            return 0
+        first = max(first, args.from_senior or first)
+        last = min(last, args.to_senior or last)
+        written = await rebuild_daily_adherence(engine, first, last, args.batch_size)
+    finally:
+        await engine.dispose()
+    print(f"daily_adherence: {written} filas para seniors {first}..{last} en {time.perf_counter() - started:.1f}s")
+    shutdown_logging()
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Reconstruye daily_adherence desde intake_logs")
+    parser.add_argument("--from-senior", type=int)
+    parser.add_argument("--to-senior", type=int)
+    parser.add_argument("--batch-size", type=int, default=500, help="seniors por transacción")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,139 @@
+# scripts/check_indexes.py
+"""
+Verifica con EXPLAIN que las consultas de stats y listados usan los índices compuestos.
+
+Uso (desde backend/, con DATABASE_URL apuntando a una base con datos realistas):
+    python -m scripts.check_indexes
+
+Con tablas casi vacías el optimizador puede preferir un full scan; por eso primero
+se ejecuta ANALYZE TABLE y se reporta también possible_keys.
+"""
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, func, or_, select
+
+from app.core.database import engine
+from app.meds.adherence import split_range
+from app.meds.models import DailyAdherence, IntakeLog, IntakeStatus
+from app.reminders.models import Reminder, ReminderStatus
+from app.appointments.models import Appointment
+from app.chat.models import Message
+from app.audit.models import AuditLog
+
+_now = datetime.now(timezone.utc)
+_week_ago = _now - timedelta(days=7)
+
+# Las stats de adherencia (app/meds/adherence.py intake_counts_subquery) leen en una UNION ALL:
+# - los días completos de daily_adherence, cuya PK (senior_id, medication_id, local_day)
+#   resuelve un senior y rango de días con el prefijo senior_id;
+# - solo los tramos de los bordes (horas antes del primer día completo y después del
+#   último) de intake_logs, un OR de rangos sobre (senior_id, scheduled_at).
+# EXPLAIN de la UNION devuelve una fila por parte: se verifica cada parte por separado.
+_first_day, _last_day, _edges = split_range(_week_ago, _now)
+_edge_ranges = or_(*(
+    and_(IntakeLog.scheduled_at >= start, (IntakeLog.scheduled_at <= end) if inclusive else (IntakeLog.scheduled_at < end))
+    for start, end, inclusive in _edges
+))
+_rollup_sums = [func.sum(getattr(DailyAdherence, c)) for c in ("taken", "late", "missed", "skipped")]
+
+# (descripción, consulta con la misma forma que en la app, índice esperado)
+CHECKS = [
+    (
+        "compute_stats / quick-stats: rollup daily_adherence por senior y días completos",
+        select(DailyAdherence.medication_id, *_rollup_sums)
+        .where(
+            DailyAdherence.senior_id == 1,
+            DailyAdherence.local_day >= _first_day,
+            DailyAdherence.local_day <= _last_day,
+        )
+        .group_by(DailyAdherence.medication_id),
+        "PRIMARY",
+    ),
+    (
+        "compute_stats / quick-stats: bordes del rango en intake_logs",
+        select(IntakeLog.medication_id, IntakeLog.status, func.count(IntakeLog.id))
+        .where(IntakeLog.senior_id == 1, _edge_ranges)
+        .group_by(IntakeLog.medication_id, IntakeLog.status),
+        "ix_intake_logs_senior_scheduled",
+    ),
+    (
+        "global-stats: rollup daily_adherence de todos los seniors por días",
+        select(DailyAdherence.senior_id, *_rollup_sums)
+        .where(DailyAdherence.local_day >= _first_day, DailyAdherence.local_day <= _last_day)
+        .group_by(DailyAdherence.senior_id),
+        "ix_daily_adherence_day",
+    ),
+    (
+        "list_intakes: historial por senior",
+        select(IntakeLog)
+        .where(IntakeLog.senior_id == 1, IntakeLog.scheduled_at >= _week_ago)
+        .order_by(IntakeLog.scheduled_at.asc()),
+        "ix_intake_logs_senior_scheduled",
+    ),
+    (
+        # La adherencia por medicamento sale del rollup (primer check); por medication_id
+        # solo queda el borrado de las tomas de un medicamento
+        "borrado de medicamento: tomas por medication_id",
+        select(IntakeLog.id).where(IntakeLog.medication_id == 1),
+        "ix_intake_logs_med_scheduled_status",
+    ),
+    (
+        "recordatorios pendientes del día",
+        select(func.count(Reminder.id))
+        .where(
+            Reminder.senior_id == 1,
+            Reminder.status == ReminderStatus.PENDING,
+            Reminder.scheduled_at >= _week_ago,
+            Reminder.scheduled_at <= _now,
+        ),
+        "ix_reminders_senior_status_scheduled",
+    ),
+    (
+        "list_appointments por senior",
+        select(Appointment).where(Appointment.senior_id == 1).order_by(Appointment.starts_at.asc()),
+        "ix_appointments_senior_starts",
+    ),
+    (
+        "list_messages por conversación",
+        select(Message).where(Message.conversation_id == 1).order_by(Message.sent_at.asc()),
+        "ix_messages_conversation_sent",
+    ),
+    (
+        "actividad del care team (auditoría)",
+        select(func.count(AuditLog.id))
+        .where(AuditLog.actor_user_id == 1, AuditLog.created_at >= _week_ago, AuditLog.created_at <= _now),
+        "ix_audit_logs_actor_created",
+    ),
+]
+
+TABLES = ["daily_adherence", "intake_logs", "reminders", "appointments", "messages", "audit_logs"]
+
+
+async def main() -> int:
+    failures = 0
+    async with engine.connect() as conn:
+        for table in TABLES:
+            await conn.exec_driver_sql(f"ANALYZE TABLE {table}")
+
+        for description, stmt, expected in CHECKS:
+            compiled = stmt.compile(dialect=conn.dialect)
+            params = compiled.construct_params()
+            args = tuple(params[name] for name in compiled.positiontup)
+            res = await conn.exec_driver_sql("EXPLAIN " + compiled.string, args)
+            row = res.mappings().first()
+            key = row.get("key") if row else None
+            possible = row.get("possible_keys") if row else None
+
+            ok = key == expected
+            failures += 0 if ok else 1
+            print(f"{'✅' if ok else '❌'} {description}")
+            print(f"     esperado={expected} usado={key} posibles={possible}")
+
+    await engine.dispose()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,436 @@
+# scripts/datagen.py
+"""
+Generador de datos sintéticos para pruebas de volumen.
+
+Crea seniors con su care team (cuidadores, familiares y doctor), medicamentos con
+MedicationSchedule, historial de IntakeLog y Reminder (uno por toma programada),
+citas, conversaciones con mensajes y registros de auditoría. Al final reconstruye el
+rollup daily_adherence de los seniors generados.
+
+- Determinista: el mismo --seed, --end y estado inicial de la base dan los mismos datos
+  (los ids se asignan a partir del máximo existente de cada tabla).
+- Las cantidades aceptan distribuciones: "3" (fijo), "1-6" (uniforme entero) o
+  "1:30,2:40,3:30" (valores con pesos).
+- Inserta con INSERT multi-fila por lotes de --batch-size, en orden de foreign keys.
+
+Uso (desde backend/, con DATABASE_URL apuntando a una base local):
+    python -m scripts.datagen --seniors 5000 --days 180 --seed 7
+    python -m scripts.datagen --seniors 200 --meds-per-senior 2-8 --adherence TAKEN:70,LATE:10,MISSED:15,SKIPPED:5
+    python -m scripts.datagen --seniors 100000 --dry-run   # solo cuenta filas
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, time as dtime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, insert, select
+
+from app.appointments.models import Appointment
+from app.audit.models import AuditLog
+from app.auth.models import User
+from app.chat.models import Conversation, Message
+from app.core.models import MembershipRole, UserRole
+from app.meds.models import DailyAdherence, IntakeLog, IntakeStatus, Medication, MedicationSchedule
+from app.reminders.models import Reminder, ReminderStatus
+from app.seniors.models import CareTeam, SeniorProfile
+
+# Orden de inserción (respeta las foreign keys)
+TABLES = [
+    User, SeniorProfile, CareTeam, Medication, MedicationSchedule, IntakeLog, Reminder,
+    Appointment, Conversation, Message, AuditLog,
+]
+
+_MED_NAMES = [
+    "Metformina", "Losartán", "Atorvastatina", "Omeprazol", "Levotiroxina", "Amlodipino",
+    "Aspirina", "Vitamina D", "Enalapril", "Furosemida", "Insulina glargina", "Paracetamol",
+]
+_UNITS = ["mg", "mg", "mg", "UI", "ml"]
+_CONDITIONS = ["Hipertensión", "Diabetes tipo 2", "Artritis", "EPOC", "Insuficiencia cardiaca", "Alzheimer leve"]
+_FIRST_NAMES = ["Rosa", "Juan", "María", "Luis", "Carmen", "José", "Ana", "Pedro", "Elena", "Jorge"]
+_LAST_NAMES = ["García", "López", "Martínez", "Ramírez", "Torres", "Flores", "Vega", "Castro"]
+_SPECIALTIES = ["Geriatría", "Cardiología", "Endocrinología", "Medicina general", "Neurología"]
+_DOSE_HOURS = {1: [8], 2: [8, 20], 3: [8, 14, 20], 4: [7, 12, 17, 22]}
+# Acciones con las palabras clave que usa el dashboard para clasificar la actividad
+_AUDIT_ACTIONS = [
+    ("MEDICATION_TAKEN", "IntakeLog"),
+    ("REMINDER_DONE", "Reminder"),
+    ("APPOINTMENT_CREATED", "Appointment"),
+    ("CHAT_MESSAGE", "Message"),
+    ("MEDICATION_UPDATED", "Medication"),
+]
+
+
+class Distribution:
+    """Cantidad aleatoria a partir de una especificación de texto (ver docstring del módulo)."""
+
+    def __init__(self, spec: str):
+        self.spec = spec
+        spec = spec.strip()
+        self._choices: Optional[Tuple[List[str], List[float]]] = None
+        self._range: Optional[Tuple[int, int]] = None
+        if ":" in spec:
+            pairs = [item.split(":") for item in spec.split(",")]
+            self._choices = ([v.strip() for v, _ in pairs], [float(w) for _, w in pairs])
+        elif "-" in spec:
+            low, high = spec.split("-")
+            self._range = (int(low), int(high))
+        else:
+            self._range = (int(spec), int(spec))
+
+    def sample(self, rng: random.Random) -> Any:
+        if self._choices is not None:
+            values, weights = self._choices
+            return rng.choices(values, weights)[0]
+        return rng.randint(*self._range)
+
+    def sample_int(self, rng: random.Random) -> int:
+        return int(self.sample(rng))
+
+    def __repr__(self):
+        return f"Distribution({self.spec!r})"
+
+
+@dataclass
+class DatagenConfig:
+    seniors: int = 1000
+    seniors_per_caregiver: int = 5
+    caregivers_per_senior: Distribution = field(default_factory=lambda: Distribution("1"))
+    family_per_senior: Distribution = field(default_factory=lambda: Distribution("0-2"))
+    doctors: int = 20
+    meds_per_senior: Distribution = field(default_factory=lambda: Distribution("1-5"))
+    doses_per_day: Distribution = field(default_factory=lambda: Distribution("1:35,2:40,3:20,4:5"))
+    adherence: Distribution = field(default_factory=lambda: Distribution("TAKEN:80,LATE:8,MISSED:8,SKIPPED:4"))
+    end: date = field(default_factory=lambda: date.today() - timedelta(days=1))
+    days: int = 90
+    future_days: int = 7
+    appointments_per_senior: Distribution = field(default_factory=lambda: Distribution("0-6"))
+    conversation_ratio: float = 0.8
+    messages_per_conversation: Distribution = field(default_factory=lambda: Distribution("5-80"))
+    audit_logs_per_senior: Distribution = field(default_factory=lambda: Distribution("10-60"))
+    password: str = "bench12345"
+    email_domain: str = "example.com"  # debe pasar EmailStr (email-validator rechaza .local, .test...)
+    seed: int = 42
+    batch_size: int = 5000
+
+    @property
+    def start(self) -> date:
+        return self.end - timedelta(days=self.days - 1)
+
+
+@dataclass
+class DatagenResult:
+    totals: Dict[str, int]
+    first_ids: Dict[str, int]
+    caregiver_emails: List[str]
+    doctor_emails: List[str]
+    senior_ids: Tuple[int, int] | None
+    conversation_ids: Tuple[int, int] | None
+
+
+class BatchWriter:
+    """Acumula filas por tabla y las inserta en lotes, siempre en orden de dependencias."""
+
+    def __init__(self, engine, batch_size: int, dry_run: bool = False):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.rows: Dict[type, List[dict]] = {model: [] for model in TABLES}
+        self.totals: Dict[str, int] = {model.__tablename__: 0 for model in TABLES}
+
+    async def add(self, model, row: dict):
+        self.rows[model].append(row)
+        if len(self.rows[model]) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self):
+        if self.dry_run:
+            for model, rows in self.rows.items():
+                self.totals[model.__tablename__] += len(rows)
+                rows.clear()
+            return
+        async with self.engine.begin() as conn:
+            for model in TABLES:
+                rows = self.rows[model]
+                for start in range(0, len(rows), self.batch_size):
+                    await conn.execute(insert(model), rows[start:start + self.batch_size])
+                self.totals[model.__tablename__] += len(rows)
+                rows.clear()
+
+
+async def next_ids(engine, dry_run: bool = False) -> Dict[type, int]:
+    if dry_run:
+        return {model: 1 for model in TABLES}
+    async with engine.connect() as conn:
+        return {model: (await conn.scalar(select(func.max(model.id))) or 0) + 1 for model in TABLES}
+
+
+class _Generator:
+    def __init__(self, config: DatagenConfig, writer: BatchWriter, ids: Dict[type, int], password_hash: str):
+        self.config = config
+        self.writer = writer
+        self.ids = ids
+        self.password_hash = password_hash
+        self.rng = random.Random(config.seed)
+        # Todo lo anterior a este instante es historial (tomas registradas, recordatorios hechos)
+        self.now = datetime.combine(config.end + timedelta(days=1), dtime(0), tzinfo=timezone.utc)
+        self.tag = f"{config.seed}-{ids[User]}"  # emails únicos entre corridas sobre la misma base
+        self.first_ids = {model.__tablename__: ids[model] for model in TABLES}
+
+    def next_id(self, model) -> int:
+        value = self.ids[model]
+        self.ids[model] += 1
+        return value
+
+    def person_name(self) -> str:
+        return f"{self.rng.choice(_FIRST_NAMES)} {self.rng.choice(_LAST_NAMES)}"
+
+    async def user(self, role: UserRole, label: str) -> Dict[str, Any]:
+        user_id = self.next_id(User)
+        email = f"{label}{user_id}.{self.tag}@{self.config.email_domain}"
+        await self.writer.add(User, {
+            "id": user_id, "full_name": self.person_name(), "email": email,
+            "password_hash": self.password_hash, "role": role, "is_active": True,
+        })
+        return {"id": user_id, "email": email}
+
+    async def run(self) -> DatagenResult:
+        cfg = self.config
+        doctors = [await self.user(UserRole.DOCTOR, "doctor") for _ in range(max(cfg.doctors, 1))]
+        caregiver_pool = [
+            await self.user(UserRole.CAREGIVER, "caregiver")
+            for _ in range(max(1, -(-cfg.seniors // cfg.seniors_per_caregiver)))
+        ]
+
+        senior_ids, conversation_ids = [], []
+        for n in range(cfg.seniors):
+            senior_id = await self.senior(n, doctors, caregiver_pool, conversation_ids)
+            senior_ids.append(senior_id)
+
+        await self.writer.flush()
+        return DatagenResult(
+            totals=self.writer.totals,
+            first_ids=self.first_ids,
+            caregiver_emails=[c["email"] for c in caregiver_pool],
+            doctor_emails=[d["email"] for d in doctors],
+            senior_ids=(senior_ids[0], senior_ids[-1]) if senior_ids else None,
+            conversation_ids=(conversation_ids[0], conversation_ids[-1]) if conversation_ids else None,
+        )
+
+    async def senior(self, n: int, doctors: Sequence[dict], caregiver_pool: Sequence[dict], conversation_ids: List[int]) -> int:
+        cfg, rng = self.config, self.rng
+        senior_id = self.next_id(SeniorProfile)
+        await self.writer.add(SeniorProfile, {
+            "id": senior_id, "full_name": self.person_name(),
+            "birthdate": date(1930 + rng.randrange(35), rng.randint(1, 12), rng.randint(1, 28)),
+            "conditions": ", ".join(rng.sample(_CONDITIONS, rng.randint(0, 2))) or None,
+            "emergency_contact_name": self.person_name(),
+            "emergency_contact_phone": f"555-{rng.randrange(10000):04d}",
+        })
+
+        # Care team: cuidador principal del pool + cuidadores extra + familiares nuevos + un doctor
+        primary = caregiver_pool[n // cfg.seniors_per_caregiver]
+        caregivers = [primary]
+        extra = min(cfg.caregivers_per_senior.sample_int(rng) - 1, len(caregiver_pool) - 1)
+        while len(caregivers) < extra + 1:
+            candidate = rng.choice(caregiver_pool)
+            if candidate not in caregivers:
+                caregivers.append(candidate)
+        doctor = rng.choice(doctors)
+        members = [(c["id"], MembershipRole.PRIMARY_CAREGIVER if c is primary else MembershipRole.CAREGIVER, True) for c in caregivers]
+        for _ in range(cfg.family_per_senior.sample_int(rng)):
+            family = await self.user(UserRole.FAMILY, "family")
+            members.append((family["id"], MembershipRole.FAMILY, False))
+        members.append((doctor["id"], MembershipRole.DOCTOR, False))
+        for user_id, role, can_edit in members:
+            await self.writer.add(CareTeam, {
+                "id": self.next_id(CareTeam), "senior_id": senior_id, "user_id": user_id,
+                "membership_role": role, "can_view": True, "can_edit": can_edit,
+            })
+        actors = [c["id"] for c in caregivers]
+
+        for _ in range(cfg.meds_per_senior.sample_int(rng)):
+            await self.medication(senior_id, actors)
+        await self.appointments(senior_id, doctor)
+        if rng.random() < cfg.conversation_ratio:
+            conversation_ids.append(await self.conversation(senior_id, actors, doctor))
+        await self.audit_logs(actors)
+        return senior_id
+
+    async def medication(self, senior_id: int, actors: Sequence[int]):
+        cfg, rng = self.config, self.rng
+        med_id = self.next_id(Medication)
+        name = rng.choice(_MED_NAMES)
+        hours = _DOSE_HOURS[max(1, min(4, cfg.doses_per_day.sample_int(rng)))]
+        await self.writer.add(Medication, {
+            "id": med_id, "senior_id": senior_id, "name": name,
+            "dose": str(rng.choice([5, 10, 20, 50, 100, 500, 850])), "unit": rng.choice(_UNITS),
+            "notes": rng.choice([None, None, "Con alimentos", "En ayunas"]),
+        })
+        # Algunos medicamentos empiezan a mitad del período
+        start = cfg.start + timedelta(days=rng.choice([0, 0, 0, rng.randrange(max(cfg.days, 1))]))
+        await self.writer.add(MedicationSchedule, {
+            "id": self.next_id(MedicationSchedule), "medication_id": med_id, "start_date": start,
+            "end_date": None, "hours": hours, "days_of_week": None,
+        })
+
+        day = start
+        last_day = cfg.end + timedelta(days=cfg.future_days)
+        while day <= last_day:
+            for hour in hours:
+                scheduled = datetime.combine(day, dtime(hour=hour), tzinfo=timezone.utc)
+                past = scheduled < self.now
+                actor = rng.choice(actors)
+                if past:
+                    status = IntakeStatus(cfg.adherence.sample(rng))
+                    taken_at = None
+                    if status == IntakeStatus.TAKEN:
+                        taken_at = scheduled + timedelta(minutes=rng.randint(0, 45))
+                    elif status == IntakeStatus.LATE:
+                        taken_at = scheduled + timedelta(minutes=rng.randint(61, 300))
+                    await self.writer.add(IntakeLog, {
+                        "id": self.next_id(IntakeLog), "senior_id": senior_id, "medication_id": med_id,
+                        "scheduled_at": scheduled, "taken_at": taken_at, "status": status, "actor_user_id": actor,
+                    })
+                await self.writer.add(Reminder, {
+                    "id": self.next_id(Reminder), "senior_id": senior_id, "title": f"Tomar {name}",
+                    "description": None, "scheduled_at": scheduled, "repeat_rule": "DAILY",
+                    "status": ReminderStatus.DONE if past else ReminderStatus.PENDING,
+                    "done_at": scheduled + timedelta(minutes=5) if past else None,
+                    "medication_id": med_id, "is_completed": past, "actor_user_id": actor if past else None,
+                })
+            day += timedelta(days=1)
+
+    async def appointments(self, senior_id: int, doctor: dict):
+        cfg, rng = self.config, self.rng
+        span_days = cfg.days + cfg.future_days * 4
+        for _ in range(cfg.appointments_per_senior.sample_int(rng)):
+            starts_at = datetime.combine(
+                cfg.start + timedelta(days=rng.randrange(span_days)), dtime(rng.randint(8, 17)), tzinfo=timezone.utc
+            )
+            await self.writer.add(Appointment, {
+                "id": self.next_id(Appointment), "senior_id": senior_id, "doctor_user_id": doctor["id"],
+                "specialty": rng.choice(_SPECIALTIES), "starts_at": starts_at, "scheduled_at": starts_at,
+                "location": rng.choice(["Consultorio", "Hospital", "Teleconsulta"]), "reason": "Control",
+                "status": "COMPLETED" if starts_at < self.now else "SCHEDULED",
+            })
+
+    async def conversation(self, senior_id: int, actors: Sequence[int], doctor: dict) -> int:
+        cfg, rng = self.config, self.rng
+        conversation_id = self.next_id(Conversation)
+        await self.writer.add(Conversation, {
+            "id": conversation_id, "senior_id": senior_id, "doctor_user_id": doctor["id"], "status": "OPEN",
+        })
+        span_minutes = cfg.days * 24 * 60
+        offsets = sorted(rng.randrange(span_minutes) for _ in range(cfg.messages_per_conversation.sample_int(rng)))
+        for offset in offsets:
+            sent_at = self.now - timedelta(days=cfg.days) + timedelta(minutes=offset)
+            await self.writer.add(Message, {
+                "id": self.next_id(Message), "conversation_id": conversation_id,
+                "sender_user_id": rng.choice([*actors, doctor["id"]]),
+                "content": f"Mensaje {rng.randrange(10 ** 6)}", "sent_at": sent_at,
+                "read_at": sent_at + timedelta(minutes=rng.randint(1, 600)),
+            })
+        return conversation_id
+
+    async def audit_logs(self, actors: Sequence[int]):
+        cfg, rng = self.config, self.rng
+        span_minutes = cfg.days * 24 * 60
+        for _ in range(cfg.audit_logs_per_senior.sample_int(rng)):
+            action, entity = rng.choice(_AUDIT_ACTIONS)
+            created_at = self.now - timedelta(days=cfg.days) + timedelta(minutes=rng.randrange(span_minutes))
+            await self.writer.add(AuditLog, {
+                "id": self.next_id(AuditLog), "actor_user_id": rng.choice(actors), "action": action,
+                "entity": entity, "entity_id": str(rng.randrange(1, 10 ** 6)), "meta": None,
+                "created_at": created_at, "updated_at": created_at,
+            })
+
+
+def check_login_email(config: DatagenConfig):
+    """Falla antes de insertar si los emails generados no podrían usarse en /auth/login."""
+    from pydantic import ValidationError
+    from app.auth.schemas import LoginRequest
+
+    try:
+        LoginRequest(email=f"smoke@{config.email_domain}", password=config.password)
+    except ValidationError as e:
+        raise ValueError(f"--email-domain/--password no pasan la validación de /auth/login: {e}") from e
+
+
+async def generate(engine, config: DatagenConfig, dry_run: bool = False) -> DatagenResult:
+    from app.core.security import hash_password
+    from app.meds.adherence import rebuild_daily_adherence
+
+    check_login_email(config)
+    ids = await next_ids(engine, dry_run)
+    writer = BatchWriter(engine, config.batch_size, dry_run)
+    password_hash = hash_password(config.password)  # un solo bcrypt para todos los usuarios
+    result = await _Generator(config, writer, ids, password_hash).run()
+    if not dry_run and result.senior_ids:
+        # Las tomas se insertan en bloque, sin pasar por record_intake_change
+        result.totals[DailyAdherence.__tablename__] = await rebuild_daily_adherence(engine, *result.senior_ids)
+    return result
+
+
+def build_parser() -> argparse.ArgumentParser:
+    defaults = DatagenConfig()
+    p = argparse.ArgumentParser(description="Genera datos sintéticos a escala")
+    p.add_argument("--seniors", type=int, default=defaults.seniors)
+    p.add_argument("--seniors-per-caregiver", type=int, default=defaults.seniors_per_caregiver)
+    p.add_argument("--caregivers-per-senior", type=Distribution, default=defaults.caregivers_per_senior)
+    p.add_argument("--family-per-senior", type=Distribution, default=defaults.family_per_senior)
+    p.add_argument("--doctors", type=int, default=defaults.doctors)
+    p.add_argument("--meds-per-senior", type=Distribution, default=defaults.meds_per_senior)
+    p.add_argument("--doses-per-day", type=Distribution, default=defaults.doses_per_day, help="1..4 tomas diarias")
+    p.add_argument("--adherence", type=Distribution, default=defaults.adherence, help="pesos por IntakeStatus")
+    p.add_argument("--end", type=date.fromisoformat, default=defaults.end, help="último día de historial (YYYY-MM-DD)")
+    p.add_argument("--days", type=int, default=defaults.days, help="días de historial hasta --end")
+    p.add_argument("--future-days", type=int, default=defaults.future_days, help="días de recordatorios pendientes")
+    p.add_argument("--appointments-per-senior", type=Distribution, default=defaults.appointments_per_senior)
+    p.add_argument("--conversation-ratio", type=float, default=defaults.conversation_ratio)
+    p.add_argument("--messages-per-conversation", type=Distribution, default=defaults.messages_per_conversation)
+    p.add_argument("--audit-logs-per-senior", type=Distribution, default=defaults.audit_logs_per_senior)
+    p.add_argument("--password", default=defaults.password)
+    p.add_argument("--email-domain", default=defaults.email_domain)
+    p.add_argument("--seed", type=int, default=defaults.seed)
+    p.add_argument("--batch-size", type=int, default=defaults.batch_size)
+    p.add_argument("--dry-run", action="store_true", help="no escribe en la base; solo cuenta filas")
+    p.add_argument("--summary-json", help="guarda totales, rangos de ids y emails generados")
+    return p
+
+
+def config_from_args(args: argparse.Namespace) -> DatagenConfig:
+    fields = DatagenConfig.__dataclass_fields__
+    return DatagenConfig(**{name: value for name, value in vars(args).items() if name in fields})
+
+
+async def _cli(args: argparse.Namespace):
+    import app.main  # noqa: F401  (registra todos los modelos)
+    from app.core.database import engine
+    from app.core.logging_config import shutdown_logging
+    from app.core.migrations import run_migrations
+
+    config = config_from_args(args)
+    started = time.perf_counter()
+    try:
+        if not args.dry_run:
+            await run_migrations()
+        result = await generate(engine, config, dry_run=args.dry_run)
+    finally:
+        await engine.dispose()
+
+    verb = "Contadas" if args.dry_run else "Insertadas"
+    print(f"{verb} en {time.perf_counter() - started:.1f}s ({config.start} a {config.end}, seed={config.seed}):")
+    for table, count in result.totals.items():
+        print(f"  {table:<22} {count:>12,}")
+    if args.summary_json:
+        with open(args.summary_json, "w", encoding="utf-8") as f:
+            json.dump({"config": {k: str(v) for k, v in vars(args).items()}, **result.__dict__}, f, indent=2, default=str)
+    shutdown_logging()
+
+
+if __name__ == "__main__":
+    asyncio.run(_cli(build_parser().parse_args()))
@@ -0,0 +1,75 @@
+# tests/test_sqlite_smoke.py
+"""
+Smoke test de la capa de dialectos (app/core/sql_compat.py) contra SQLite real: levanta la
+app con benchmarks.fixtures.sqlite_app() y datos de scripts.datagen.
+
+    pip install -r requirements.txt -r benchmarks/requirements.txt
+    python -m pytest tests
+"""
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+httpx = pytest.importorskip("httpx")
+
+
+def test_sqlite_app_dialect_helpers(tmp_path):
+    asyncio.run(_check_sqlite_app(tmp_path / "smoke.db"))
+
+
+async def _check_sqlite_app(path):
+    # Los imports de app.* van después de use_sqlite() (lo llama sqlite_app)
+    from benchmarks.fixtures import sqlite_app
+    from scripts.datagen import DatagenConfig
+
+    config = DatagenConfig(seniors=4, days=5, doctors=2, seed=3)
+    async with sqlite_app(path, seed_config=config) as (app, result):
+        from sqlalchemy import func, select
+
+        from app.core.database import AsyncSessionLocal
+        from app.core.sql_compat import hour_of
+        from app.core.versions import EntityVersion, bump_version
+        from app.meds.models import DailyAdherence, IntakeLog
+
+        async with AsyncSessionLocal() as db:
+            # hour_of: strftime en SQLite, misma hora que la columna leída
+            rows = (await db.execute(select(IntakeLog.scheduled_at, hour_of(IntakeLog.scheduled_at)))).all()
+            assert rows
+            assert all(hour == scheduled.hour for scheduled, hour in rows)
+
+            # upsert_add (ON CONFLICT): crea en 1 y después suma
+            await bump_version(db, "smoke", 1, 2)
+            await bump_version(db, "smoke", 1)
+            await db.commit()
+            res = await db.execute(
+                select(EntityVersion.entity_id, EntityVersion.version)
+                .where(EntityVersion.scope == "smoke")
+                .order_by(EntityVersion.entity_id)
+            )
+            assert res.all() == [(1, 2), (2, 1)]
+
+            # El rollup reconstruido cubre todas las tomas
+            rollup = (await db.execute(select(func.sum(
+                DailyAdherence.taken + DailyAdherence.late + DailyAdherence.missed + DailyAdherence.skipped
+            )))).scalar()
+            assert rollup == (await db.execute(select(func.count(IntakeLog.id)))).scalar()
+
+        senior_id = result.senior_ids[0]
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://sqlite") as client:
+            # activity_by_hour del reporte usa hour_of agrupado (count_by_bucket)
+            response = await client.get(
+                f"/api/v1/stats/seniors/{senior_id}/health-report",
+                params={"period_start": config.start.isoformat(), "period_end": config.end.isoformat()},
+            )
+            assert response.status_code == 200, response.text
+            activity = response.json()["activity_by_hour"]
+            assert len(activity) == 24
+            assert sum(h["medication_intakes"] for h in activity) > 0
+
+            # Las fechas salen naive, como siempre las emitió la API (el front las toma como hora local)
+            response = await client.get(f"/api/v1/meds/seniors/{senior_id}/intakes")
+            assert response.status_code == 200, response.text
+            scheduled = response.json()[0]["scheduled_at"]
+            assert not scheduled.endswith(("Z", "+00:00")), scheduled